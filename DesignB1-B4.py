@@ -1,75 +1,34 @@
 
 import matplotlib.pyplot as plt
 import matplotlib.patches as patches
-import random
-import pandas as pd
+import numpy as np
+from field_model import DESIGNS, Field
+from field_render import add_cells, add_labels
+from layout_store import write_layout
+from randomization import assign_ab
+from placement_optimizer import optimize_placement
 
-# === Field Setup ===
-field_width = 160
-field_height = 270
-border_thickness = 10
-cols = 4
-rows = 3
-gap_x = 3
-gap_y = 3
-usable_width = field_width - 2 * border_thickness
-usable_height = field_height - 2 * border_thickness
-block_width = (usable_width - (cols - 1) * gap_x) / cols
-block_height = (usable_height - (rows - 1) * gap_y) / rows
-cell_cols = 5
-cell_rows = 8
-cell_width = block_width / cell_cols
-cell_height = block_height / cell_rows
+# === Field Setup (field_model.Field defaults: the Energy Farm 2025 trial) ===
+field = Field()
+field_width, field_height, border_thickness = field.width, field.height, field.border_thickness
+rows, cols, gap_x, gap_y = field.rows, field.cols, field.gap_x, field.gap_y
+cell_rows, cell_cols = field.cell_rows, field.cell_cols
+usable_width, usable_height = field.usable_width, field.usable_height
+block_width, block_height, cell_width, cell_height = field.dimensions()
 
-# === Entry Definitions ===
-designs = {
-    1: {
-        'A': ["AG29XF4", "AG29XF5", "AG34XF6", "AG35XF5", "AG36XF4", "AG38XF6", "AG40XFF5"],
-        'B': ["LG3216"],
-        'A_COLOR': '#c6dbef',
-        'B_COLOR': '#c7e9c0'
-    },
-    2: {
-        'A': [
-            "LD20-4542", "LD20-4988", "LD20-4471", "LD20-5738", "LD22-4283",
-            "LD11-2170", "LD20-5413", "LD21-5253", "LD21-7234"
-        ],
-        'B': ["AG29XF4", "AG29XF5"],
-        'A_COLOR': '#f2f0f7',
-        'B_COLOR': '#deebf7'
-    },
-    3: {
-        'A': [
-            "LD11-2170", "LD20-4471", "LD20-4542", "LD20-4988", "LD20-5738", "LD22-4283",
-            "LD00-2817P", "LD17-10473L", "LD19-10076", "LD19-10244", "LD21-5944", "LD21-5991",
-            "LD07-3395bf", "LD17-10473F", "LD20-11748", "LD20-5413", "LD21-3090", "LD21-5253",
-            "LD21-5665", "LD21-7234"
-        ],
-        'B': ["LG3216"],
-        'A_COLOR': '#fdd0a2',
-        'B_COLOR': '#c7e9c0'
-    },
-    4: {
-        'A': ["AG34XF6", "AG35XF5", "AG36XF4", "AG38XF6", "AG40XFF5"],
-        'B': [
-            "LD21-5253", "LD21-7234", "LD21-5665", "LD21-3090", "LD07-3395bf",
-            "LD17-10473F", "LD20-11748", "LD21-5944"
-        ],
-        'A_COLOR': '#d0d1e6',
-        'B_COLOR': '#ccebc5'
-    }
-}
+# === Cell Geometry (all blocks, one pass) ===
+geom = field.geometry()
+block_x, block_y = field.block_origins()
+cells_per_block = field.cells_per_block
+render_mode = "collection"  # "patches" for the original one-artist-per-cell drawing
+seed = None  # Set an int for a reproducible randomization (each block has its own stream)
+export_csv = True  # The .layout file is always written; CSV is kept for spreadsheets
+balance_placement = False  # Anneal the entries within each block so they neither cluster nor keep the same neighbours
 
-# Recursive sampler
-def recursive_sampler(pool):
-    while True:
-        shuffled = pool.copy()
-        random.shuffle(shuffled)
-        for entry in shuffled:
-            yield entry
+# === Entry Definitions (A/B pools and colours per design) ===
+designs = DESIGNS
 
 # === Drawing Layout ===
-data = []
 fig, ax = plt.subplots(figsize=(14, 12))
 ax.add_patch(patches.Rectangle((0, 0), field_width, field_height,
                                edgecolor='black', facecolor='lightgray', linewidth=1.5))
@@ -79,49 +38,30 @@ ax.add_patch(patches.Rectangle((border_thickness, border_thickness),
 
 design_blocks = {1: 1, 2: 2, 3: 3, 4: 4}  # Block assignments
 
-block_id = 1
-for i in range(rows):
-    for j in range(cols):
-        bl_x = border_thickness + j * (block_width + gap_x)
-        bl_y = border_thickness + i * (block_height + gap_y)
-        ax.add_patch(patches.Rectangle((bl_x, bl_y), block_width, block_height,
-                                       edgecolor='black', facecolor='white', linewidth=1.5))
+# Entry assignment for all blocks at once, each block from its own random stream
+block_designs = {block: designs[d] for d, block in design_blocks.items()}
+labels, is_a = assign_ab(geom['Row'], geom['Col'], geom['Block'], block_designs, seed=seed)
+if balance_placement:
+    labels, _ = optimize_placement(geom['Row'], geom['Col'], geom['Block'], labels, is_a, seed=seed)
+facecolors = np.full(len(labels), 'none', dtype=object)
+for block_id, design in block_designs.items():
+    in_block = geom['Block'] == block_id
+    facecolors[in_block] = np.where(is_a[in_block], design['A_COLOR'], design['B_COLOR'])
 
-        design_idx = [d for d, b in design_blocks.items() if b == block_id]
-        if design_idx:
-            design = designs[design_idx[0]]
-            a_gen = recursive_sampler(design['A'])
-            b_gen = recursive_sampler(design['B'])
+for idx in range(rows * cols):
+    block_id = idx + 1
+    bl_x, bl_y = block_x[idx], block_y[idx]
+    ax.add_patch(patches.Rectangle((bl_x, bl_y), block_width, block_height,
+                                   edgecolor='black', facecolor='white', linewidth=1.5))
 
-        for r in range(cell_rows):
-            for c in range(cell_cols):
-                cell_x = bl_x + c * cell_width
-                cell_y = bl_y + r * cell_height
+    ax.text(bl_x + block_width / 2, bl_y + block_height / 2,
+            f"B{block_id}", ha='center', va='center', fontsize=10, weight='bold')
 
-                if design_idx:
-                    label = next(a_gen) if (r + c) % 2 == 0 else next(b_gen)
-                    color = design['A_COLOR'] if (r + c) % 2 == 0 else design['B_COLOR']
-                    ax.add_patch(patches.Rectangle((cell_x, cell_y), cell_width, cell_height,
-                                                   edgecolor='lightgray', facecolor=color, linewidth=0.8))
-                    ax.text(cell_x + cell_width / 2, cell_y + cell_height / 2, label,
-                            ha='center', va='center', fontsize=5.5, rotation=90)
-                else:
-                    label = ""
-                    ax.add_patch(patches.Rectangle((cell_x, cell_y), cell_width, cell_height,
-                                                   edgecolor='lightgray', facecolor='none', linewidth=0.8))
-
-                data.append({
-                    "Block": f"B{block_id}",
-                    "Row": r,
-                    "Col": c,
-                    "X": round(cell_x + cell_width / 2, 2),
-                    "Y": round(cell_y + cell_height / 2, 2),
-                    "Label": label
-                })
-
-        ax.text(bl_x + block_width / 2, bl_y + block_height / 2,
-                f"B{block_id}", ha='center', va='center', fontsize=10, weight='bold')
-        block_id += 1
+# All cells and cell labels as two batched artists
+add_cells(ax, geom['X_start'], geom['Y_start'], cell_width, cell_height, facecolors,
+          edgecolor='lightgray', linewidth=0.8, mode=render_mode)
+add_labels(ax, geom['X'], geom['Y'], labels, fontsize=5.5, rotation=90, mode=render_mode,
+           cell_size=(cell_width, cell_height))
 
 # Finalize layout
 ax.set_xlim(-5, field_width + 10)
@@ -133,6 +73,8 @@ plt.tight_layout()
 
 # Save figure and data
 plt.savefig("combined_field_designs_1_to_4.png")
-df = pd.DataFrame(data)
-df.to_csv("combined_field_designs_1_to_4.csv", index=False)
+df = field.plots(labels).to_frame()
+write_layout(df, "combined_field_designs_1_to_4.layout")
+if export_csv:
+    df.to_csv("combined_field_designs_1_to_4.csv", index=False)
 plt.show()
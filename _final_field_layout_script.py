@@ -1,10 +1,11 @@
 
 import matplotlib.pyplot as plt
-import matplotlib.patches as patches
 from matplotlib.lines import Line2D
 import numpy as np
-import random
 from itertools import permutations
+from layout_solver import solve_layout
+from field_model import AG, LD, LG, SubBlock
+from field_render import add_cells
 
 # --- Constants ---
 subblock_width = 35
@@ -18,20 +19,11 @@ block_spacing_x = 5
 block_spacing_y = 5
 cols = 4
 rows = 3
+render_mode = "collection"  # "patches" for the original one-artist-per-plot drawing
 
 field_width = cols * subblock_width + (cols - 1) * block_spacing_x
 field_height = rows * subblock_height + (rows - 1) * block_spacing_y
 
-# --- Variety Definitions ---
-AG = ["AG29XF4", "AG29XF5", "AG34XF6", "AG35XF5", "AG36XF4", "AG38XF6", "AG40XFF5"]
-LD = [
-    "LD11-2170", "LD20-4471", "LD20-4542", "LD20-4988", "LD20-5738", "LD22-4283",
-    "LD00-2817P", "LD17-10473L", "LD19-10076", "LD19-10244", "LD21-5944", "LD21-5991",
-    "LD07-3395bf", "LD17-10473F", "LD20-11748", "LD20-5413", "LD21-3090", "LD21-5253",
-    "LD21-5665", "LD21-7234"
-]
-LG = ["LG3216"]
-
 # --- Color Maps ---
 cmap_AG = plt.get_cmap("Oranges", len(AG))
 cmap_LD = plt.get_cmap("Greens", len(LD))
@@ -48,61 +40,21 @@ subblock_defs_row_pattern = [
 ]
 
 # --- Helper Functions ---
-def generate_pairings(source_A, source_B, num_pairs):
-    return [(source_A[i % len(source_A)], source_B[i % len(source_B)]) for i in range(num_pairs)]
-
 def add_subblock(ax, x_offset, y_offset, A_vars, B_vars, colorA, colorB):
-    effective_block_length = subblock_height / new_num_blocks
-    block_length = effective_block_length - spacing_between_blocks
-    total_track_width = num_tracks * track_width
-    remaining_width = subblock_width - total_track_width
-    track_spacing = remaining_width / (num_tracks + 1)
-
-    pairings = generate_pairings(A_vars, B_vars, (new_num_blocks // 2) * num_tracks)
-    pair_index = 0
-
-    for t in range(num_tracks):
-        x_start = x_offset + track_spacing + t * (track_width + track_spacing)
-        order = ("A", "B") if t % 2 == 0 else ("B", "A")
-
-        for b in range(0, new_num_blocks, 2):
-            if pair_index >= len(pairings):
-                break
-            varA, varB = pairings[pair_index]
-            pair_index += 1
-            var_top = varA if order[0] == "A" else varB
-            var_bottom = varB if order[0] == "A" else varA
-
-            y1 = y_offset + b * (subblock_height / new_num_blocks)
-            y2 = y_offset + (b + 1) * (subblock_height / new_num_blocks)
+    subblock = SubBlock(x_offset, y_offset, A_vars, B_vars, subblock_width, subblock_height, num_tracks,
+                        track_width, new_num_blocks, spacing_between_blocks)
+    _, _, plot_x, plot_y, entries = zip(*subblock.layout())
+    plot_colors = [colorA.get(v, colorB.get(v, 'gray')) for v in entries]
 
-            ax.add_patch(patches.Rectangle((x_start, y1), track_width, block_length,
-                                           edgecolor='black', facecolor=colorA.get(var_bottom, colorB.get(var_bottom, 'gray')), linewidth=0.5))
-            ax.add_patch(patches.Rectangle((x_start, y2), track_width, block_length,
-                                           edgecolor='black', facecolor=colorA.get(var_top, colorB.get(var_top, 'gray')), linewidth=0.5))
+    # Whole subblock as one collection
+    add_cells(ax, plot_x, plot_y, track_width, subblock.plot_length, plot_colors,
+              edgecolor='black', linewidth=0.5, mode=render_mode)
 
-def is_valid_grid(grid):
-    for i in range(rows):
-        for j in range(cols):
-            current = grid[i][j]
-            if i > 0 and grid[i-1][j] == current:
-                return False
-            if j > 0 and grid[i][j-1] == current:
-                return False
-    return True
 
-def generate_full_field_layout(seed=None, max_attempts=10000):
-    if seed is not None:
-        random.seed(seed)
-    idx = [0, 1, 2, 3]
-    attempts = 0
-    while attempts < max_attempts:
-        attempts += 1
-        flat = random.choices(idx, k=rows * cols)
-        grid = [flat[i*cols:(i+1)*cols] for i in range(rows)]
-        if is_valid_grid(grid):
-            return grid
-    raise ValueError("Could not find a valid layout without adjacent duplicates after many attempts.")
+def generate_full_field_layout(seed=None, **constraints):
+    # Built cell by cell by the constraint solver instead of rejection sampling;
+    # constraints: diagonal, balance_counts, balance_rows, balance_cols
+    return solve_layout(rows, cols, n_types=len(subblock_defs_row_pattern), seed=seed, **constraints)
 
 # --- Set seed and generate layout ---
 seed_value = 123
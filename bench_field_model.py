@@ -0,0 +1,57 @@
+# Benchmark: memory per plot, one dict per plot vs. field_model.Plots (structured array)
+# Usage: python bench_field_model.py [n_plots]
+
+import sys
+import time
+import tracemalloc
+from field_model import DESIGNS, Field, PLOT_DTYPE
+from randomization import assign_ab
+
+
+def dict_plots(geom, labels):
+    # The per-plot data.append({...}) records the generators used to build
+    data = []
+    for i in range(len(labels)):
+        data.append({
+            "Block": f"B{geom['Block'][i]}",
+            "Row": int(geom['Row'][i]),
+            "Col": int(geom['Col'][i]),
+            "X": round(float(geom['X'][i]), 2),
+            "Y": round(float(geom['Y'][i]), 2),
+            "Label": labels[i],
+        })
+    return data
+
+
+def traced(fn):
+    # (result, seconds, bytes still allocated by fn)
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - t0
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, size
+
+
+if __name__ == "__main__":
+    n_plots = int(float(sys.argv[1])) if len(sys.argv) > 1 else 1_000_000
+    cols = 200
+    rows = -(-n_plots // (40 * cols))
+    field = Field(width=20 + cols * 32.75 + (cols - 1) * 3, height=20 + rows * 81.33 + (rows - 1) * 3,
+                  rows=rows, cols=cols)
+    geom = field.geometry()
+    labels, _ = assign_ab(geom['Row'], geom['Col'], geom['Block'],
+                          {block: DESIGNS[(block - 1) % 4 + 1] for block in range(1, rows * cols + 1)}, seed=0)
+    n = len(labels)
+
+    plots, t_plots, m_plots = traced(lambda: field.plots(labels))
+    frame, t_frame, m_frame = traced(lambda: plots.to_frame())
+    _, t_dicts, m_dicts = traced(lambda: dict_plots(geom, labels))
+    assert len(frame) == n
+
+    print(f"{n:,} plots (PLOT_DTYPE itemsize {PLOT_DTYPE.itemsize} bytes)")
+    print(f"{'':>28} {'MB':>8} {'bytes/plot':>11} {'build (s)':>10}")
+    print(f"{'list of dicts':>28} {m_dicts / 2**20:8.1f} {m_dicts / n:11.1f} {t_dicts:10.2f}")
+    print(f"{'Plots (structured array)':>28} {m_plots / 2**20:8.1f} {m_plots / n:11.1f} {t_plots:10.2f}")
+    print(f"{'DataFrame from Plots':>28} {m_frame / 2**20:8.1f} {m_frame / n:11.1f} {t_frame:10.2f}")
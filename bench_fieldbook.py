@@ -0,0 +1,60 @@
+# Benchmark: fieldbook rendering, serial vs. process pool, and regeneration from the page cache
+# Synthetic trials are built by repeating the blocks of combined_field_designs_1_to_4.csv.
+# Usage: python bench_fieldbook.py [n_blocks ...]   (default: 12 100 500)
+
+import os
+import sys
+import tempfile
+import time
+import pandas as pd
+from fieldbook import add_geometry, render_fieldbook, trial_blocks
+
+
+def synthetic_trial(n_blocks, path="combined_field_designs_1_to_4.csv"):
+    df = pd.read_csv(path)
+    blocks = trial_blocks(df)
+    frames = [df[df['Block'] == 'T0']]
+    for i in range(n_blocks):
+        block = df[df['Block'] == blocks[i % len(blocks)]].copy()
+        block['Block'] = f"B{i + 1}"
+        block['Y'] += 300 * (i // len(blocks))
+        frames.append(block)
+    return add_geometry(pd.concat(frames, ignore_index=True))
+
+
+if __name__ == "__main__":
+    sizes = [int(n) for n in sys.argv[1:]] or [12, 100, 500]
+    cpus = os.cpu_count() or 1
+    print(f"{cpus} CPUs")
+    print(f"{'blocks':>7} {'serial (s)':>11} {'pool (s)':>9} {'speedup':>8} {'pages':>6}")
+    for n_blocks in sizes:
+        df = synthetic_trial(n_blocks)
+
+        t0 = time.perf_counter()
+        serial = render_fieldbook(df, "bench.csv", workers=1, cache_dir=None)
+        t_serial = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        pooled = render_fieldbook(df, "bench.csv", workers=cpus, cache_dir=None)
+        t_pool = time.perf_counter() - t0
+
+        assert len(serial) == len(pooled)
+        print(f"{n_blocks:>7} {t_serial:11.2f} {t_pool:9.2f} {t_serial / t_pool:7.1f}x {2 + 2 * n_blocks:>6}")
+
+    # Edit one block of a 200-block trial and regenerate against a warm page cache
+    df = synthetic_trial(200)
+    with tempfile.TemporaryDirectory() as cache_dir:
+        t0 = time.perf_counter()
+        render_fieldbook(df, "bench.csv", workers=cpus, cache_dir=cache_dir)
+        t_cold = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        render_fieldbook(df, "bench.csv", workers=cpus, cache_dir=cache_dir)
+        t_warm = time.perf_counter() - t0
+
+        df.loc[df['Block'] == 'B7', 'Label'] += "*"
+        t0 = time.perf_counter()
+        render_fieldbook(df, "bench.csv", workers=cpus, cache_dir=cache_dir)
+        t_edit = time.perf_counter() - t0
+    print()
+    print(f"200 blocks: cold cache {t_cold:.2f} s, unchanged {t_warm:.2f} s, one block edited {t_edit:.2f} s")
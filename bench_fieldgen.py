@@ -0,0 +1,40 @@
+# Benchmark: process start-up and run time of the headless fieldgen CLI vs. the plotting scripts
+# Each command runs as a fresh process, as batch jobs start them.
+# Usage: python bench_fieldgen.py [repeats]
+
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO = os.path.dirname(os.path.abspath(__file__))
+COMMANDS = [
+    ("python -c pass", ["-c", "pass"]),
+    ("import matplotlib.pyplot", ["-c", "import matplotlib.pyplot"]),
+    ("import fieldgen", ["-c", "import fieldgen, sys; "
+                                "assert not any(m.split('.')[0] in ('matplotlib', 'scipy') for m in sys.modules)"]),
+    ("fieldgen.py layout (csv)", [os.path.join(REPO, "fieldgen.py"), "layout", "--seed", "1", "--format", "csv"]),
+    ("allField.py", [os.path.join(REPO, "allField.py")]),
+    ("fieldgen.py samples (csv)", [os.path.join(REPO, "fieldgen.py"), "samples", "--seed", "1"]),
+    ("generate_gps_aligned_soil_samples.py", [os.path.join(REPO, "generate_gps_aligned_soil_samples.py")]),
+]
+
+
+def run(args, cwd, repeats):
+    env = {**os.environ, "PYTHONPATH": REPO, "MPLBACKEND": "Agg"}
+    times = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        subprocess.run([sys.executable, *args], cwd=cwd, env=env, check=True, stdout=subprocess.DEVNULL)
+        times.append(time.perf_counter() - t0)
+    return statistics.median(times)
+
+
+if __name__ == "__main__":
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    print(f"{'command':>38} {'median (s)':>11}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, args in COMMANDS:
+            print(f"{name:>38} {run(args, tmp, repeats):11.3f}")
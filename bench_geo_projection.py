@@ -0,0 +1,74 @@
+# Benchmark: batched ENU / UTM projections (throughput, round-trip error, agreement with a reference)
+# The reference is pyproj (PROJ) when it is installed; the flat-earth 364000 / 288200 ft per
+# degree constants the GPS scripts used are scored against the same tangent plane.
+# Usage: python bench_geo_projection.py [n_points]   (default: 1000000)
+
+import sys
+import time
+import numpy as np
+from geo_projection import FOOT, UTM, local_enu
+
+try:
+    from pyproj import Transformer
+except ImportError:
+    Transformer = None
+
+ORIGIN = (48.6208766, 82.09675455)  # Row01_Range01 of data/interpolated_plot_positions.geojson
+
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - t0, result
+
+
+def report(name, elapsed, n, error=None, unit="m"):
+    line = f"{name:>28} {n / elapsed / 1e6:8.1f} M points/s"
+    if error is not None:
+        line += f"   max error {error:.2e} {unit}"
+    print(line)
+
+
+if __name__ == "__main__":
+    n = int(float(sys.argv[1])) if len(sys.argv) > 1 else 1_000_000
+    rng = np.random.default_rng(0)
+    # Points within ~5 km of the field corner, up to 300 m above the ellipsoid
+    lat = ORIGIN[0] + rng.uniform(-0.05, 0.05, n)
+    lon = ORIGIN[1] + rng.uniform(-0.07, 0.07, n)
+    h = rng.uniform(0, 300, n)
+    print(f"{n:,} points around {ORIGIN[0]:.4f}, {ORIGIN[1]:.4f}")
+
+    enu = local_enu(*ORIGIN)
+    elapsed, (e, north, u) = timed(enu.forward, lat, lon, h)
+    report("ENU forward", elapsed, n)
+    elapsed, (lat2, lon2, h2) = timed(enu.inverse, e, north, u)
+    back_e, back_n, back_u = enu.forward(lat2, lon2, h2)
+    report("ENU inverse (round trip)", elapsed, n, np.abs(np.concatenate([back_e - e, back_n - north, back_u - u])).max())
+
+    zone = UTM.for_points(lat, lon)
+    elapsed, (easting, northing) = timed(zone.forward, lat, lon)
+    report(f"UTM {zone.zone}{'S' if zone.south else 'N'} forward", elapsed, n)
+    elapsed, (lat3, lon3) = timed(zone.inverse, easting, northing)
+    back_e, back_n = zone.forward(lat3, lon3)
+    report(f"UTM {zone.zone}{'S' if zone.south else 'N'} inverse (round trip)", elapsed, n,
+           np.abs(np.concatenate([back_e - easting, back_n - northing])).max())
+
+    if Transformer is not None:
+        reference = Transformer.from_crs(4326, zone.epsg, always_xy=True)
+        elapsed, (ref_e, ref_n) = timed(reference.transform, lon, lat)
+        report("pyproj UTM forward", elapsed, n,
+               np.abs(np.concatenate([ref_e - easting, ref_n - northing])).max())
+        topocentric = Transformer.from_pipeline(
+            "+proj=pipeline +step +proj=cart +ellps=WGS84 "
+            f"+step +proj=topocentric +ellps=WGS84 +lat_0={ORIGIN[0]} +lon_0={ORIGIN[1]} +h_0=0")
+        elapsed, (ref_e, ref_n, ref_u) = timed(topocentric.transform, lon, lat, h)
+        report("pyproj ENU forward", elapsed, n, np.abs(np.concatenate([ref_e - e, ref_n - north, ref_u - u])).max())
+    else:
+        print(f"{'pyproj':>28} not installed, reference comparison skipped")
+
+    # The flat-earth constants, on the ground plane (h = 0)
+    e0, n0, _ = enu.forward(lat, lon)
+    flat_e = (lon - ORIGIN[1]) * 288200 * FOOT
+    flat_n = (lat - ORIGIN[0]) * 364000 * FOOT
+    print(f"{'flat 364000/288200 ft/deg':>28} east off by up to {np.abs(flat_e - e0).max():.0f} m, "
+          f"north by {np.abs(flat_n - n0).max():.1f} m (within {np.hypot(e0, n0).max() / 1000:.1f} km)")
@@ -0,0 +1,106 @@
+# Benchmark: streaming GeoJSON write/read vs. building and parsing the whole document with json
+# Peak memory is traced (tracemalloc) in a second, untimed run of each step.
+# Usage: python bench_geojson_stream.py [sizes...]   (default: 100000 400000)
+
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from field_model import DESIGNS, Field
+import numpy as np
+from geojson_stream import iter_features, read_frame, read_frames, write_plots, write_points
+from randomization import assign_ab
+
+
+def synthetic_plots(n_plots):
+    # Many-block checkerboard field (as bench_field_model.py)
+    cols = 100
+    rows = -(-n_plots // (40 * cols))
+    field = Field(width=20 + cols * 32.75 + (cols - 1) * 3, height=20 + rows * 81.33 + (rows - 1) * 3,
+                  rows=rows, cols=cols)
+    geom = field.geometry()
+    labels, _ = assign_ab(geom['Row'], geom['Col'], geom['Block'],
+                          {block: DESIGNS[(block - 1) % 4 + 1] for block in range(1, rows * cols + 1)}, seed=0)
+    return field.plots(labels)
+
+
+def stream_write(plots, path):
+    write_plots(path, plots.column("X_start"), plots.column("Y_start"), plots.column("X_stop"), plots.column("Y_stop"),
+                {name: plots.column(name) for name in ("Block", "Row", "Col", "Label")}, decimals=2)
+
+
+def json_write(plots, path):
+    # One feature dict per plot, then json.dump of the whole FeatureCollection
+    x0, y0 = plots.column("X_start").round(2), plots.column("Y_start").round(2)
+    x1, y1 = plots.column("X_stop").round(2), plots.column("Y_stop").round(2)
+    blocks, labels = plots.column("Block"), plots.column("Label")
+    rows, cols = plots.column("Row"), plots.column("Col")
+    features = [{"type": "Feature",
+                 "geometry": {"type": "Polygon", "coordinates": [[[x0[i], y0[i]], [x1[i], y0[i]], [x1[i], y1[i]],
+                                                                  [x0[i], y1[i]], [x0[i], y0[i]]]]},
+                 "properties": {"Block": blocks[i], "Row": int(rows[i]), "Col": int(cols[i]), "Label": labels[i]}}
+                for i in range(len(plots))]
+    with open(path, "w") as f:
+        json.dump({"type": "FeatureCollection", "features": features}, f)
+
+
+def stream_read(path):
+    return sum(1 for _ in iter_features(path))
+
+
+def frames_read(path):
+    return sum(len(df) for df in read_frames(path))
+
+
+def json_read(path):
+    with open(path) as f:
+        return len(json.load(f)["features"])
+
+
+def measure(fn, *args):
+    t0 = time.perf_counter()
+    fn(*args)
+    elapsed = time.perf_counter() - t0
+    tracemalloc.start()
+    fn(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 2**20
+
+
+def _strict_constant(name):
+    raise ValueError(f"Non-JSON constant {name} in output")
+
+
+def check_round_trip(tmp):
+    # Written files parse with a strict JSON parser; NaN properties come back as null, NaN coordinates are refused
+    path = os.path.join(tmp, "check.geojson")
+    write_points(path, [1.0, 4.0], [2.0, 3.0], {"Value": np.array([0.5, np.nan])})
+    with open(path) as f:
+        json.load(f, parse_constant=_strict_constant)
+    frame = read_frame(path)
+    assert frame["X"].tolist() == [1.0, 4.0] and frame["Value"].isna().tolist() == [False, True]
+    try:
+        write_points(path, [1.0, np.nan], [2.0, 3.0])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("NaN coordinate written")
+
+
+if __name__ == "__main__":
+    sizes = [int(float(s)) for s in sys.argv[1:]] or [100_000, 400_000]
+    print(f"{'plots':>9} {'step':>26} {'time (s)':>9} {'peak (MB)':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        check_round_trip(tmp)
+        for n in sizes:
+            plots = synthetic_plots(n)
+            path = os.path.join(tmp, "plots.geojson")
+            for name, fn, arg in [("write (stream)", stream_write, plots), ("write (json.dump)", json_write, plots),
+                                  ("read features (stream)", stream_read, None),
+                                  ("read DataFrame chunks", frames_read, None), ("read (json.load)", json_read, None)]:
+                elapsed, peak = measure(fn, *((arg, path) if arg is not None else (path,)))
+                print(f"{len(plots):>9,} {name:>26} {elapsed:9.2f} {peak:10.1f}")
+            print(f"{'':>9} {'file size':>26} {os.path.getsize(path) / 2**20:9.1f} MB")
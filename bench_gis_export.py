@@ -0,0 +1,94 @@
+# Benchmark: bulk Shapefile / GeoPackage export vs. packing one record per plot
+# The per-plot baseline packs .shp records and inserts GeoPackage rows (and R-tree entries)
+# one struct.pack / execute call at a time, the way feature-at-a-time writers do.
+# Usage: python bench_gis_export.py [n_plots]
+
+import os
+import sqlite3
+import struct
+import sys
+import tempfile
+import time
+import numpy as np
+from bench_geojson_stream import synthetic_plots
+from gis_export import ATTRIBUTES, write_dbf, write_geopackage, write_shapefile
+
+
+def per_plot_shp(base, x0, y0, x1, y1, attributes):
+    # .shp, .shx and .dbf records packed plot by plot (headers left blank)
+    widths = [max(len(str(v).encode()) for v in values) for values in attributes.values()]
+    rows = zip(*(values.tolist() for values in attributes.values()))
+    with open(base + ".shp", "wb") as shp, open(base + ".shx", "wb") as shx, open(base + ".dbf", "wb") as dbf:
+        shp.write(bytes(100))
+        shx.write(bytes(100))
+        dbf.write(bytes(32 + 32 * len(widths) + 1))
+        for i, (a, b, c, d, row) in enumerate(zip(x0.tolist(), y0.tolist(), x1.tolist(), y1.tolist(), rows)):
+            shp.write(struct.pack(">2i", i + 1, 64))
+            shp.write(struct.pack("<i4d3i10d", 5, a, b, c, d, 1, 5, 0, a, b, a, d, c, d, c, b, a, b))
+            shx.write(struct.pack(">2i", 50 + i * 68, 64))
+            dbf.write(b" " + b"".join(str(v).encode().ljust(w) for v, w in zip(row, widths)))
+
+
+def per_plot_gpkg(path, x0, y0, x1, y1, attributes):
+    con = sqlite3.connect(path)
+    con.execute("CREATE TABLE plots (fid INTEGER PRIMARY KEY, geom BLOB, Block TEXT, Row INTEGER, Col INTEGER, "
+                "Label TEXT)")
+    con.execute("CREATE VIRTUAL TABLE rtree_plots_geom USING rtree(id, minx, maxx, miny, maxy)")
+    rows = zip(*(values.tolist() for values in attributes.values()))
+    for i, (a, b, c, d, row) in enumerate(zip(x0.tolist(), y0.tolist(), x1.tolist(), y1.tolist(), rows)):
+        blob = struct.pack("<2sBBi4dBIII10d", b"GP", 0, 3, -1, a, c, b, d, 1, 3, 1, 5, a, b, c, b, c, d, a, d, a, b)
+        con.execute("INSERT INTO plots VALUES (?, ?, ?, ?, ?, ?)", (i + 1, blob, *row))
+        con.execute("INSERT INTO rtree_plots_geom VALUES (?, ?, ?, ?, ?)", (i + 1, a, c, b, d))
+    con.commit()
+    con.close()
+
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - t0
+
+
+def check_float_fields(tmp):
+    # Float columns keep large, negative and tiny values (no truncation to a fixed 24-byte field);
+    # a value whose integer part cannot fit any dBase field is refused
+    path = os.path.join(tmp, "check.dbf")
+    values = np.array([1e9, -1e8, 1.5, 3e-20, np.nan])
+    write_dbf(path, {"Value": values}, len(values))
+    with open(path, "rb") as f:
+        data = f.read()
+    width, decimals = data[32 + 16], data[32 + 17]
+    header_bytes = int.from_bytes(data[8:10], "little")
+    fields = [data[header_bytes + i * (width + 1) + 1:][:width] for i in range(len(values))]
+    assert all(len(field) == width for field in fields) and decimals > 15
+    parsed = np.array([float(field) if field.strip() else np.nan for field in fields])
+    assert np.allclose(parsed[:4], values[:4], rtol=1e-12, atol=0) and np.isnan(parsed[4])
+    try:
+        write_dbf(path, {"Value": np.array([1e300])}, 1)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("oversized float written")
+
+
+if __name__ == "__main__":
+    n_plots = int(float(sys.argv[1])) if len(sys.argv) > 1 else 1_000_000
+    plots = synthetic_plots(n_plots)
+    extents = [plots.column(name) for name in ("X_start", "Y_start", "X_stop", "Y_stop")]
+    attributes = {name: plots.column(name) for name in ATTRIBUTES}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        check_float_fields(tmp)
+        base = os.path.join(tmp, "plots")
+        results = [
+            ("shapefile (bulk)", timed(write_shapefile, base, *extents, attributes)),
+            ("shapefile, per plot", timed(per_plot_shp, base + "_loop", *extents, attributes)),
+            ("geopackage (bulk)", timed(write_geopackage, base + ".gpkg", *extents, attributes)),
+            ("geopackage, per plot", timed(per_plot_gpkg, base + "_loop.gpkg", *extents, attributes)),
+        ]
+        sizes = {ext: os.path.getsize(base + ext) / 2**20 for ext in (".shp", ".dbf", ".gpkg")}
+
+    print(f"{len(plots):,} plots (.shp {sizes['.shp']:.0f} MB, .dbf {sizes['.dbf']:.0f} MB, "
+          f".gpkg {sizes['.gpkg']:.0f} MB)")
+    for name, elapsed in results:
+        print(f"{name:>22} {elapsed:8.2f} s")
@@ -0,0 +1,59 @@
+# Benchmark: column-wise DMS parsing/formatting vs. the original per-row regex and f-string
+# Usage: python bench_gps_convert.py
+
+import re
+import time
+import numpy as np
+import pandas as pd
+from gps_convert import format_dms, parse_dms
+
+
+def feet_to_gps_dms(feet, feet_per_deg):
+    # As it was in generate_gps_aligned_soil_samples.py
+    decimal_degrees = feet / feet_per_deg
+    degrees = int(decimal_degrees)
+    remainder = (decimal_degrees - degrees) * 60
+    minutes = int(remainder)
+    seconds = (remainder - minutes) * 60
+    return f"{abs(degrees):02d}-{minutes:02d}-{seconds:05.2f}"
+
+
+def regex_to_degrees(gps_str):
+    match = re.match(r'^(\d+)[\s\-:]+(\d+)[\s\-:]+(\d+(\.\d+)?)$', gps_str.strip())
+    if not match:
+        return np.nan
+    degrees, minutes, seconds = map(float, match.groups()[:3])
+    return degrees + minutes / 60 + seconds / 3600
+
+
+if __name__ == "__main__":
+    # Strings that do not parse (non-ASCII ones included) become NaN without touching their neighbours
+    mixed = parse_dms(["40-06-54", "40°06'54\"", "40 06 54.5", "４０-06-54", "", "40:06:54"])
+    assert np.array_equal(np.isnan(mixed), [False, True, False, True, True, False])
+    assert np.allclose(mixed[[0, 2, 5]], [40.115, 40.115138888888889, 40.115], rtol=0, atol=1e-12)
+
+    rng = np.random.default_rng(0)
+    print(f"{'rows':>9} {'format apply (s)':>17} {'format_dms (s)':>15} {'parse regex (s)':>16} {'parse_dms (s)':>14}")
+    for n in [1_000, 100_000, 1_000_000]:
+        # Illinois-like coordinates: positive latitudes and negative longitudes
+        lat = pd.Series(rng.uniform(40.10, 40.12, n))
+        lon = pd.Series(rng.uniform(-88.25, -88.24, n))
+
+        t0 = time.perf_counter()
+        old = pd.concat([lat, lon]).apply(lambda d: feet_to_gps_dms(d, 1))
+        t_apply = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        new = format_dms(np.concatenate([lat.to_numpy(), lon.to_numpy()]))
+        t_format = time.perf_counter() - t0
+        assert (old.to_numpy() == new).all()
+
+        strings = format_dms(lat.to_numpy()).tolist()
+        t0 = time.perf_counter()
+        old = np.array([regex_to_degrees(s) for s in strings])
+        t_regex = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        new = parse_dms(strings)
+        t_parse = time.perf_counter() - t0
+        assert np.allclose(old, new, rtol=0, atol=1e-9)
+
+        print(f"{n:>9} {t_apply:17.3f} {t_format:15.3f} {t_regex:16.3f} {t_parse:14.3f}")
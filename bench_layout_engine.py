@@ -0,0 +1,91 @@
+# Benchmark: vectorized cell geometry vs. the original nested block/row/col loops
+# Usage: python bench_layout_engine.py [max_cells]
+
+import sys
+import time
+import numpy as np
+from layout_engine import block_dimensions, cell_geometry
+
+# === Field Setup (same constants as allField.py) ===
+border_thickness = 10
+gap_x = 3
+gap_y = 3
+cell_cols = 5
+cell_rows = 8
+
+
+def loop_geometry(field_width, field_height, rows, cols):
+    # The per-cell dict construction used by allField.py / DesignB1-B4.py
+    block_width, block_height, cell_width, cell_height = block_dimensions(
+        field_width, field_height, border_thickness, rows, cols, gap_x, gap_y, cell_rows, cell_cols)
+    data = []
+    block_id = 1
+    for i in range(rows):
+        for j in range(cols):
+            bl_x = border_thickness + j * (block_width + gap_x)
+            bl_y = border_thickness + i * (block_height + gap_y)
+            for r in range(cell_rows):
+                for c in range(cell_cols):
+                    cell_x = bl_x + c * cell_width
+                    cell_y = bl_y + r * cell_height
+                    data.append({
+                        "Block": block_id,
+                        "Row": r,
+                        "Col": c,
+                        "X": cell_x + cell_width / 2,
+                        "Y": cell_y + cell_height / 2,
+                    })
+            block_id += 1
+    return data
+
+
+def field_for_blocks(n_blocks):
+    # Square-ish block grid with the standard 160 x 270 ft block footprint per 4 x 3 blocks
+    cols = max(1, int(np.sqrt(n_blocks)))
+    rows = -(-n_blocks // cols)
+    field_width = 2 * border_thickness + cols * 32.75 + (cols - 1) * gap_x
+    field_height = 2 * border_thickness + rows * 81.33 + (rows - 1) * gap_y
+    return field_width, field_height, rows, cols
+
+
+def time_call(fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def check_matches_loop():
+    field_width, field_height, rows, cols = 160, 270, 3, 4
+    data = loop_geometry(field_width, field_height, rows, cols)
+    geom = cell_geometry(field_width, field_height, border_thickness, rows, cols, gap_x, gap_y, cell_rows, cell_cols)
+    assert len(data) == len(geom["X"])
+    assert np.allclose([d["X"] for d in data], geom["X"])
+    assert np.allclose([d["Y"] for d in data], geom["Y"])
+    assert np.array_equal([d["Block"] for d in data], geom["Block"])
+    assert np.array_equal([d["Row"] for d in data], geom["Row"])
+    assert np.array_equal([d["Col"] for d in data], geom["Col"])
+
+
+if __name__ == "__main__":
+    max_cells = int(float(sys.argv[1])) if len(sys.argv) > 1 else 10_000_000
+    check_matches_loop()
+
+    print(f"{'cells':>12} {'loop (s)':>10} {'vector (s)':>11} {'ns/cell':>8} {'speedup':>8}")
+    n_cells = 1_000
+    while n_cells <= max_cells:
+        n_blocks = max(1, n_cells // (cell_rows * cell_cols))
+        field_width, field_height, rows, cols = field_for_blocks(n_blocks)
+        total = rows * cols * cell_rows * cell_cols
+
+        t_vec = time_call(lambda: cell_geometry(field_width, field_height, border_thickness, rows, cols,
+                                                gap_x, gap_y, cell_rows, cell_cols))
+        if total <= 1_000_000:
+            t_loop = time_call(lambda: loop_geometry(field_width, field_height, rows, cols), repeat=1)
+            loop_col, speedup = f"{t_loop:10.4f}", f"{t_loop / t_vec:7.1f}x"
+        else:
+            loop_col, speedup = f"{'-':>10}", f"{'-':>8}"
+        print(f"{total:>12,} {loop_col} {t_vec:11.4f} {t_vec / total * 1e9:8.1f} {speedup}")
+        n_cells *= 10
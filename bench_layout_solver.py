@@ -0,0 +1,59 @@
+# Benchmark: constraint solver vs. the original rejection sampler for subblock-type grids
+# Usage: python bench_layout_solver.py
+
+import random
+import time
+from layout_solver import is_valid_layout, solve_layout
+
+n_types = 4
+
+
+def rejection_sample(rows, cols, seed=None, max_attempts=10000):
+    # generate_full_field_layout as it was in _final_field_layout_script.py
+    if seed is not None:
+        random.seed(seed)
+    idx = list(range(n_types))
+    for attempts in range(1, max_attempts + 1):
+        flat = random.choices(idx, k=rows * cols)
+        grid = [flat[i * cols:(i + 1) * cols] for i in range(rows)]
+        if is_valid_layout(grid, n_types):
+            return grid, attempts
+    return None, max_attempts
+
+
+def time_solver(rows, cols, seeds, **constraints):
+    times = []
+    for seed in seeds:
+        t0 = time.perf_counter()
+        grid = solve_layout(rows, cols, n_types, seed=seed, **constraints)
+        times.append(time.perf_counter() - t0)
+        assert is_valid_layout(grid, n_types, **constraints)
+    return sorted(times)[len(times) // 2]
+
+
+if __name__ == "__main__":
+    seeds = range(5)
+
+    print("Orthogonal neighbours only (the original rule)")
+    print(f"{'grid':>7} {'sampler (ms)':>13} {'accept rate':>12} {'solver (ms)':>12}")
+    for rows, cols in [(3, 4), (4, 4), (5, 5), (6, 6), (10, 10), (50, 50)]:
+        if rows * cols <= 36:
+            t0 = time.perf_counter()
+            results = [rejection_sample(rows, cols, seed) for seed in seeds]
+            t_sampler = (time.perf_counter() - t0) / len(seeds) * 1000
+            found = sum(grid is not None for grid, _ in results)
+            accept = f"{found / sum(a for _, a in results):.2e}"
+            sampler_col = f"{t_sampler:13.1f}" + ("" if found == len(seeds) else f" ({len(seeds) - found} failed)")
+        else:
+            sampler_col, accept = f"{'-':>13}", f"{'-':>12}"
+        print(f"{rows:>3}x{cols:<3} {sampler_col} {accept:>12} {time_solver(rows, cols, seeds) * 1000:12.1f}")
+
+    print()
+    print("50x50 solver, richer constraints (median of 5 seeds)")
+    for constraints in [dict(diagonal=True),
+                        dict(balance_counts=True),
+                        dict(diagonal=True, balance_counts=True),
+                        dict(balance_rows=True, balance_cols=True),
+                        dict(balance_counts=True, balance_rows=True, balance_cols=True)]:
+        label = ", ".join(constraints)
+        print(f"  {label:<45} {time_solver(50, 50, seeds, **constraints) * 1000:8.1f} ms")
@@ -0,0 +1,60 @@
+# Benchmark: .layout columnar files vs. CSV for a large layout
+# Usage: python bench_layout_store.py [n_rows]
+
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from layout_store import LayoutFile, read_layout, write_layout
+
+
+def synthetic_layout(n_rows, cells_per_block=40, seed=0):
+    rng = np.random.default_rng(seed)
+    n_blocks = -(-n_rows // cells_per_block)
+    block = np.repeat(np.arange(1, n_blocks + 1), cells_per_block)[:n_rows]
+    cell = np.arange(n_rows) % cells_per_block
+    varieties = np.array([f"LD{y:02d}-{n}" for y in range(17, 23) for n in range(1000, 1020)])
+    return pd.DataFrame({
+        "Block": [f"B{b}" for b in block],
+        "Row": cell // 5,
+        "Col": cell % 5,
+        "X": rng.uniform(0, 5000, n_rows).round(2),
+        "Y": rng.uniform(0, 5000, n_rows).round(2),
+        "Label": varieties[rng.integers(0, len(varieties), n_rows)],
+    })
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - t0
+
+
+if __name__ == "__main__":
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    df = synthetic_layout(n_rows)
+    block = f"B{n_rows // 80}"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "layout.csv")
+        layout_path = os.path.join(tmp, "layout.layout")
+
+        _, t_csv_write = timed(lambda: df.to_csv(csv_path, index=False))
+        _, t_layout_write = timed(lambda: write_layout(df, layout_path))
+        csv_df, t_csv_read = timed(lambda: pd.read_csv(csv_path))
+        layout_df, t_layout_read = timed(lambda: read_layout(layout_path))
+        _, t_column = timed(lambda: LayoutFile(layout_path).column("X").sum())
+        _, t_csv_block = timed(lambda: (lambda d: d[d["Block"] == block])(pd.read_csv(csv_path)))
+        one_block, t_layout_block = timed(lambda: read_layout(layout_path, block=block))
+        assert csv_df.to_csv(index=False) == layout_df.to_csv(index=False)
+        assert len(one_block) == 40
+
+        print(f"{n_rows} rows")
+        print(f"{'':>22} {'CSV':>9} {'.layout':>9}")
+        print(f"{'file size (MB)':>22} {os.path.getsize(csv_path) / 2**20:9.1f} {os.path.getsize(layout_path) / 2**20:9.1f}")
+        print(f"{'write (s)':>22} {t_csv_write:9.3f} {t_layout_write:9.3f}")
+        print(f"{'read all (s)':>22} {t_csv_read:9.3f} {t_layout_read:9.3f}")
+        print(f"{'sum one column (s)':>22} {'-':>9} {t_column:9.4f}")
+        print(f"{'read one block (s)':>22} {t_csv_block:9.3f} {t_layout_block:9.4f}")
@@ -0,0 +1,58 @@
+# Benchmark: batched neighbour-balance scoring vs. a per-plot loop over each candidate grid
+# Usage: python bench_neighbour_balance.py [n_seeds]
+
+import sys
+import time
+from collections import Counter
+import numpy as np
+from neighbour_balance import candidate_grid, encode, neighbour_stats, score_seeds
+
+
+def loop_stats(grid):
+    # Same metrics counted plot by plot (N/S/E/W neighbours)
+    h, w = grid.shape
+    pairs, open_sides = Counter(), {}
+    for i in range(h):
+        for j in range(w):
+            if grid[i, j] == "":
+                continue
+            sides = 0
+            for di, dj in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+                y, x = i + di, j + dj
+                if 0 <= y < h and 0 <= x < w and grid[y, x] != "":
+                    if (di, dj) in ((1, 0), (0, 1)):
+                        pairs[tuple(sorted((grid[i, j], grid[y, x])))] += 1
+                else:
+                    sides += 1
+            open_sides.setdefault(grid[i, j], []).append(sides)
+    between = [n for (a, b), n in pairs.items() if a != b]
+    exposure = [np.mean(v) for v in open_sides.values()]
+    return {
+        "same_neighbours": sum(n for (a, b), n in pairs.items() if a == b),
+        "repeated_neighbours": sum(n - 1 for n in between),
+        "max_pair": max(between, default=0),
+        "exposure_spread": max(exposure) - min(exposure),
+    }
+
+
+if __name__ == "__main__":
+    n_seeds = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    for design in ["solver", "checkerboard"]:
+        grids = [candidate_grid(design, seed, {}) for seed in range(n_seeds)]
+
+        t0 = time.perf_counter()
+        looped = [loop_stats(grid) for grid in grids]
+        t_loop = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        codes, labels = encode(grids)
+        batched = neighbour_stats(codes, len(labels))
+        t_batch = time.perf_counter() - t0
+        for metric, values in batched.items():
+            assert np.allclose(values, [s[metric] for s in looped]), metric
+
+        t0 = time.perf_counter()
+        score_seeds(design, range(n_seeds))
+        t_total = time.perf_counter() - t0
+        print(f"{design:>12}: {n_seeds} grids of {grids[0].shape[0]}x{grids[0].shape[1]} plots | "
+              f"loop {t_loop:.2f} s, batched {t_batch:.3f} s | score_seeds incl. generation {t_total:.2f} s")
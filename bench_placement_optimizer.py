@@ -0,0 +1,47 @@
+# Benchmark: simulated-annealing entry placement (incremental swap deltas vs. full recompute)
+# Usage: python bench_placement_optimizer.py
+
+import time
+import numpy as np
+from layout_engine import cell_geometry
+from multisite import DESIGNS
+from placement_optimizer import block_energy, block_neighbours, optimize_placement
+from randomization import assign_ab
+
+
+def trial(rows, cols, cell_rows, cell_cols, seed=0):
+    geom = cell_geometry(cols * 40, rows * 90, 10, rows, cols, 3, 3, cell_rows, cell_cols)
+    block_designs = {block: DESIGNS[str((block - 1) % 4 + 1)] for block in range(1, rows * cols + 1)}
+    labels, is_a = assign_ab(geom['Row'], geom['Col'], geom['Block'], block_designs, seed=seed)
+    return geom, labels, is_a
+
+
+def full_recompute_swaps(geom, labels, n_swaps, seed=0):
+    # Cost of scoring swaps by recomputing the whole block objective each time (block 1)
+    in_block = geom['Block'] == 1
+    codes = np.unique(labels[in_block].astype(str), return_inverse=True)[1].tolist()
+    neighbours = block_neighbours(geom['Row'][in_block].tolist(), geom['Col'][in_block].tolist())
+    rng = np.random.default_rng(seed)
+    t0 = time.perf_counter()
+    for p, q in rng.integers(0, len(codes), (n_swaps, 2)).tolist():
+        codes[p], codes[q] = codes[q], codes[p]
+        block_energy(codes, neighbours)
+    return (time.perf_counter() - t0) / n_swaps
+
+
+if __name__ == "__main__":
+    print(f"{'cells':>7} {'blocks':>7} {'time (s)':>9} {'ms/block':>9} {'objective before':>17} {'after':>8}")
+    for rows, cols, cell_rows, cell_cols in [(1, 1, 8, 5), (3, 4, 8, 5), (10, 25, 8, 5), (1, 1, 100, 100)]:
+        geom, labels, is_a = trial(rows, cols, cell_rows, cell_cols)
+        t0 = time.perf_counter()
+        _, report = optimize_placement(geom['Row'], geom['Col'], geom['Block'], labels, is_a, seed=0)
+        elapsed = time.perf_counter() - t0
+        before = sum(b for b, _ in report.values())
+        after = sum(a for _, a in report.values())
+        print(f"{len(labels):>7} {rows * cols:>7} {elapsed:9.3f} {elapsed / (rows * cols) * 1000:9.2f} "
+              f"{before:17.0f} {after:8.0f}")
+
+    geom, labels, is_a = trial(1, 1, 8, 5)
+    per_swap = full_recompute_swaps(geom, labels, 2000)
+    print(f"40-cell block, full recompute per swap: {per_swap * 1e6:.1f} us "
+          f"-> {per_swap * 25 * 40 * 1000:.1f} ms per block at the default 25 swaps per cell")
@@ -0,0 +1,41 @@
+# Benchmark: corner-anchored re-anchoring as one homogeneous matrix multiply vs. a per-plot loop
+# The loop maps each plot through the same fitted 3 x 3 matrix one point at a time, the way
+# a row-by-row interpolation script would.
+# Usage: python bench_plot_interpolation.py [n_plots]
+
+import sys
+import time
+import numpy as np
+from plot_interpolation import DATA_CORNERS, apply_transform, fit_transform, grid_corners
+
+
+def per_plot(matrix, x, y):
+    lat, lon = [], []
+    for px, py in zip(x.tolist(), y.tolist()):
+        u, v, w = matrix @ np.array([px, py, 1.0])
+        lat.append(u / w)
+        lon.append(v / w)
+    return np.array(lat), np.array(lon)
+
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - t0, result
+
+
+if __name__ == "__main__":
+    n_plots = int(float(sys.argv[1])) if len(sys.argv) > 1 else 1_000_000
+    n_ranges = 1000
+    n_rows = -(-n_plots // n_ranges)
+    row, rng = np.divmod(np.arange(n_rows * n_ranges), n_ranges)
+    row, rng = (row + 1).astype(float), (rng + 1).astype(float)
+
+    print(f"{len(row):,} plots")
+    for kind in ("affine", "homography"):
+        matrix = fit_transform(grid_corners(n_rows, n_ranges), DATA_CORNERS, kind)
+        vector_time, vector = timed(apply_transform, matrix, row, rng)
+        loop_time, loop = timed(per_plot, matrix, row, rng)
+        assert np.allclose(vector, loop, rtol=0, atol=1e-9)
+        print(f"{kind:>11}: matrix multiply {vector_time:7.3f} s, per plot {loop_time:7.2f} s "
+              f"({loop_time / vector_time:,.0f}x)")
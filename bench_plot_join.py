@@ -0,0 +1,50 @@
+# Benchmark: KD-tree nearest-plot join, 100k samples against 1M plots
+# Usage: python bench_plot_join.py [n_plots] [n_samples]
+
+import sys
+import tempfile
+import time
+import numpy as np
+from plot_join import PlotIndex
+
+
+def synthetic_plots(n_plots, rng):
+    # Regular plot grid around the Energy Farm data in data/ (~48.62 N), ~3 m x 10 m spacing
+    cols = int(np.sqrt(n_plots))
+    r, c = np.divmod(np.arange(n_plots), cols)
+    lat = 48.62 + r * 9.0e-5 + rng.normal(0, 1e-6, n_plots)
+    lon = 82.09 + c * 4.1e-5 + rng.normal(0, 1e-6, n_plots)
+    plot_ids = np.char.add(np.char.add("Row", r.astype(str)), np.char.add("_Range", c.astype(str)))
+    return plot_ids, lat, lon
+
+
+if __name__ == "__main__":
+    n_plots = int(float(sys.argv[1])) if len(sys.argv) > 1 else 1_000_000
+    n_samples = int(float(sys.argv[2])) if len(sys.argv) > 2 else 100_000
+    rng = np.random.default_rng(0)
+    plot_ids, lat, lon = synthetic_plots(n_plots, rng)
+    s_lat = rng.uniform(lat.min(), lat.max(), n_samples)
+    s_lon = rng.uniform(lon.min(), lon.max(), n_samples)
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for metric in ("haversine", "projected"):
+            t0 = time.perf_counter()
+            index = PlotIndex(plot_ids, lat, lon, metric=metric, cache_dir=cache_dir)
+            t_build = time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            index = PlotIndex(plot_ids, lat, lon, metric=metric, cache_dir=cache_dir)
+            t_cached = time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            dist1, _ = index.query(s_lat, s_lon, k=1)
+            t_k1 = time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            dist4, _ = index.query(s_lat, s_lon, k=4)
+            t_k4 = time.perf_counter() - t0
+            assert np.all(np.diff(dist4, axis=1) >= 0)
+
+            print(f"{metric:>9}: {n_samples:,} samples x {n_plots:,} plots | build {t_build:.2f}s, "
+                  f"cached load {t_cached:.2f}s | query k=1 {t_k1:.2f}s, k=4 {t_k4:.2f}s | "
+                  f"median distance {np.median(dist1):.2f} m")
@@ -0,0 +1,64 @@
+# Benchmark: arithmetic point-to-plot lookup vs. a KD-tree nearest-centre search
+# Field.locate inverts the block/cell grid formulas; plot_interpolation.locate_grid inverts
+# the corner fit of a Row/Range grid. Both are checked against the tree on a sample.
+# Usage: python bench_point_lookup.py [n_points]   (default: 10000000)
+
+import sys
+import time
+import numpy as np
+from scipy.spatial import cKDTree
+from field_model import Field
+from plot_interpolation import DATA_CORNERS, DATA_RANGES, DATA_ROWS, locate_grid, plot_grid
+
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - t0, result
+
+
+def tree_locate(tree, geom, x, y):
+    # Nearest cell centre, then a containment test to tell cells from alleys and border
+    _, idx = tree.query(np.column_stack([x, y]))
+    inside = (x >= geom["X_start"][idx]) & (x < geom["X_stop"][idx]) & (y >= geom["Y_start"][idx]) & (
+        y < geom["Y_stop"][idx])
+    return np.where(inside, geom["Block"][idx], 0)
+
+
+def report(name, elapsed, n):
+    print(f"{name:>34} {elapsed:8.3f} s {n / elapsed / 1e6:8.1f} M points/s")
+
+
+if __name__ == "__main__":
+    n = int(float(sys.argv[1])) if len(sys.argv) > 1 else 10_000_000
+    n_tree = min(n, 1_000_000)
+    rng = np.random.default_rng(0)
+
+    # Block/cell field: 1000 blocks of 8 x 5 cells, points anywhere on it
+    field = Field(width=20 + 40 * 32.75 + 39 * 3, height=20 + 25 * 81.33 + 24 * 3, rows=25, cols=40)
+    geom = field.geometry()
+    x = rng.uniform(0, field.width, n)
+    y = rng.uniform(0, field.height, n)
+    print(f"{n:,} points over {len(geom['Block']):,} cells")
+    elapsed, (block, row, col) = timed(field.locate, x, y)
+    report("Field.locate", elapsed, n)
+    tree = cKDTree(np.column_stack([geom["X"], geom["Y"]]))
+    elapsed, tree_block = timed(tree_locate, tree, geom, x[:n_tree], y[:n_tree])
+    report(f"KD-tree + containment ({n_tree:,})", elapsed, n_tree)
+    assert np.array_equal(np.maximum(block[:n_tree], 0), tree_block)
+    print(f"{'':>34} {np.mean(block > 0):.1%} in cells, {np.mean(block == 0):.1%} alleys, "
+          f"{np.mean(block < 0):.1%} border")
+
+    # Row/Range grid of data/interpolated_plot_positions.geojson, points in latitude/longitude
+    grid = plot_grid(DATA_ROWS, DATA_RANGES, DATA_CORNERS)
+    lat = rng.uniform(grid["Lat"].min(), grid["Lat"].max(), n)
+    lon = rng.uniform(grid["Lon"].min(), grid["Lon"].max(), n)
+    elapsed, (grid_row, grid_range) = timed(locate_grid, lat, lon, DATA_ROWS, DATA_RANGES, DATA_CORNERS)
+    report("locate_grid (Row/Range)", elapsed, n)
+    # Nearest centre in locally scaled degrees (the grid is axis aligned, so per-axis rounding agrees)
+    scale = np.cos(np.radians(grid["Lat"].mean()))
+    tree = cKDTree(np.column_stack([grid["Lat"], grid["Lon"] * scale]))
+    elapsed, (_, idx) = timed(tree.query, np.column_stack([lat[:n_tree], lon[:n_tree] * scale]))
+    report(f"KD-tree nearest plot ({n_tree:,})", elapsed, n_tree)
+    assert np.array_equal(grid_row[:n_tree], grid["Row"].to_numpy()[idx])
+    assert np.array_equal(grid_range[:n_tree], grid["Range"].to_numpy()[idx])
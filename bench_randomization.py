@@ -0,0 +1,50 @@
+# Benchmark: batched per-block randomization vs. the original recursive_sampler loop
+# Usage: python bench_randomization.py
+
+import random
+import time
+from layout_engine import cell_geometry
+from randomization import assign_ab
+
+DESIGN = {'A': ["AG29XF4", "AG29XF5", "AG34XF6", "AG35XF5", "AG36XF4", "AG38XF6", "AG40XFF5"],
+          'B': ["LG3216"]}
+
+
+def recursive_sampler(pool):
+    # As it was in allField.py
+    while True:
+        shuffled = pool.copy()
+        random.shuffle(shuffled)
+        for entry in shuffled:
+            yield entry
+
+
+def sampler_labels(geom, n_blocks, cells_per_block):
+    labels = []
+    for idx in range(n_blocks):
+        a_gen = recursive_sampler(DESIGN['A'])
+        b_gen = recursive_sampler(DESIGN['B'])
+        for k in range(idx * cells_per_block, (idx + 1) * cells_per_block):
+            is_a = (geom['Row'][k] + geom['Col'][k]) % 2 == 0
+            labels.append(next(a_gen) if is_a else next(b_gen))
+    return labels
+
+
+if __name__ == "__main__":
+    print(f"{'cells':>9} {'blocks':>7} {'sampler (s)':>12} {'assign_ab (s)':>14}")
+    for rows, cols, cell_rows, cell_cols in [(3, 4, 8, 5), (25, 40, 8, 5), (50, 50, 20, 20)]:
+        geom = cell_geometry(cols * 40, rows * 90, 10, rows, cols, 3, 3, cell_rows, cell_cols)
+        n_blocks, cells_per_block = rows * cols, cell_rows * cell_cols
+        block_designs = {block: DESIGN for block in range(1, n_blocks + 1)}
+
+        t0 = time.perf_counter()
+        sampler_labels(geom, n_blocks, cells_per_block)
+        t_sampler = time.perf_counter() - t0
+
+        assign_ab(geom['Row'][:1], geom['Col'][:1], geom['Block'][:1], block_designs, seed=0)  # warm-up
+        t0 = time.perf_counter()
+        labels, _ = assign_ab(geom['Row'], geom['Col'], geom['Block'], block_designs, seed=0)
+        t_assign = time.perf_counter() - t0
+        assert (labels != "").all()
+
+        print(f"{len(labels):>9} {n_blocks:>7} {t_sampler:12.3f} {t_assign:14.3f}")
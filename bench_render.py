@@ -0,0 +1,50 @@
+# Benchmark: batched collection rendering vs. one Rectangle + ax.text per cell,
+# and labels culled to the legible ones (cell_size given) vs. all labels drawn
+# Usage: python bench_render.py [sizes...]   (default: 1000 10000 100000)
+
+import io
+import sys
+import time
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import numpy as np
+from field_render import add_cells, add_labels
+
+labels_pool = ["AG29XF4", "AG29XF5", "AG34XF6", "LG3216", "LD20-4542", "LD21-5253", "LD21-7234"]
+colors_pool = ['#c6dbef', '#c7e9c0', '#fdd0a2', '#d0d1e6']
+
+
+def render(n_cells, mode, cull=False):
+    side = int(np.ceil(np.sqrt(n_cells)))
+    idx = np.arange(n_cells)
+    x_start = (idx % side).astype(float)
+    y_start = (idx // side).astype(float)
+    labels = [labels_pool[i % len(labels_pool)] for i in idx]
+    facecolors = [colors_pool[i % len(colors_pool)] for i in idx]
+
+    t0 = time.perf_counter()
+    fig, ax = plt.subplots(figsize=(14, 12))
+    add_cells(ax, x_start, y_start, 1, 1, facecolors, mode=mode)
+    layer = add_labels(ax, x_start + 0.5, y_start + 0.5, labels, fontsize=5.5, rotation=90, mode=mode,
+                       cell_size=(1, 1) if cull else None)
+    ax.set_xlim(0, side)
+    ax.set_ylim(0, side)
+    ax.set_aspect('equal')
+    ax.axis('off')
+    fig.savefig(io.BytesIO(), format="png")
+    plt.close(fig)
+    return time.perf_counter() - t0, (layer.counts if cull else None)
+
+
+if __name__ == "__main__":
+    sizes = [int(float(s)) for s in sys.argv[1:]] or [1_000, 10_000, 100_000]
+    render(100, "collection")  # warm up font cache
+
+    print(f"{'cells':>10} {'patches (s)':>12} {'collection (s)':>15} {'speedup':>8} {'culled (s)':>11}  labels drawn")
+    for n_cells in sizes:
+        t_patch, _ = render(n_cells, "patches")
+        t_coll, _ = render(n_cells, "collection")
+        t_cull, counts = render(n_cells, "collection", cull=True)
+        print(f"{n_cells:>10,} {t_patch:12.3f} {t_coll:15.3f} {t_patch / t_coll:7.1f}x {t_cull:11.3f}  "
+              f"{counts['full']:,} full, {counts['abbreviated']:,} abbreviated, {counts['dropped']:,} dropped")
@@ -0,0 +1,109 @@
+# Benchmark: grid-indexed Poisson-disk sampler vs. the original cdist dart-throwing,
+# and stratified sampling of many strata at once vs. one stratum at a time
+# Usage: python bench_soil_sampling.py
+
+import time
+import numpy as np
+from scipy.spatial.distance import cdist
+from field_model import Field
+from soil_sampling import allocate, poisson_disk_samples, stratified_samples
+
+ACRE_FT2 = 43560
+
+
+def dart_throwing(width, height, n_samples, min_distance, max_attempts=10000, seed=None):
+    # Rejection sampling as it was in generate_gps_aligned_soil_samples.py
+    rng = np.random.default_rng(seed)
+    accepted_points = []
+    attempts = 0
+    while len(accepted_points) < n_samples and attempts < max_attempts:
+        point = np.array([[rng.uniform(0, width), rng.uniform(0, height)]])
+        if not accepted_points or cdist(point, np.array(accepted_points)).min() >= min_distance:
+            accepted_points.append(point[0])
+        attempts += 1
+    return np.array(accepted_points)
+
+
+def per_stratum_jitter(x0, y0, x1, y1, n_samples, seed=None):
+    # Jittered grid looped stratum by stratum, as a per-block sampler would do it
+    rng = np.random.default_rng(seed)
+    points = []
+    for a, b, c, d, k in zip(x0, y0, x1, y1, allocate((x1 - x0) * (y1 - y0), n_samples)):
+        nx = int(min(max(round(np.sqrt(k * (c - a) / (d - b))), 1), k))
+        ny = -(-k // nx)
+        for cell in rng.choice(nx * ny, size=k, replace=False):
+            row, col = divmod(cell, nx)
+            points.append((a + (col + rng.random()) / nx * (c - a), b + (row + rng.random()) / ny * (d - b)))
+    return np.array(points)
+
+
+def strata_grid(n_strata):
+    # n_strata square 10 ft strata in rows of 100
+    index = np.arange(n_strata)
+    x0, y0 = (index % 100) * 10.0, (index // 100) * 10.0
+    return x0, y0, x0 + 10, y0 + 10
+
+
+def min_spacing(points):
+    d = cdist(points, points) if len(points) <= 5000 else None
+    if d is None:
+        return float("nan")
+    np.fill_diagonal(d, np.inf)
+    return d.min()
+
+
+if __name__ == "__main__":
+    print(f"{'field':>16} {'min_dist':>8} {'dart n':>8} {'dart (s)':>9} {'poisson n':>10} {'poisson (s)':>12}")
+    for acres, min_distance in [(1, 15), (10, 15), (100, 50), (100, 15)]:
+        side = float(np.sqrt(acres * ACRE_FT2))
+
+        t0 = time.perf_counter()
+        poisson = poisson_disk_samples(side, side, min_distance, seed=0)
+        t_poisson = time.perf_counter() - t0
+
+        if len(poisson) <= 3000:
+            t0 = time.perf_counter()
+            darts = dart_throwing(side, side, len(poisson), min_distance, seed=0)
+            t_dart = time.perf_counter() - t0
+            dart_cols = f"{len(darts):>8} {t_dart:9.3f}"
+        else:
+            dart_cols = f"{'-':>8} {'-':>9}"
+
+        spacing = min_spacing(poisson)
+        assert np.isnan(spacing) or spacing >= min_distance
+        print(f"{acres:>10} acres {min_distance:>8} {dart_cols} {len(poisson):>10} {t_poisson:12.3f}")
+
+    # Exactly-n requests are reproducible for a given seed
+    a = poisson_disk_samples(160, 270, 15, n_samples=100, seed=42)
+    b = poisson_disk_samples(160, 270, 15, n_samples=100, seed=42)
+    assert len(a) == 100 and np.array_equal(a, b)
+
+    # Blocks left without a sample: uniform Poisson-disk over the whole field vs. stratified by block
+    field = Field()
+    blocks = field.blocks()
+    x0, y0 = np.array([b.x for b in blocks]), np.array([b.y for b in blocks])
+    x1, y1 = x0 + blocks[0].width, y0 + blocks[0].height
+    n_seeds, n_small = 200, 24
+    empty = 0
+    for seed in range(n_seeds):
+        p = poisson_disk_samples(field.width, field.height, 15, n_samples=n_small, seed=seed)
+        inside = (p[:, None, 0] >= x0) & (p[:, None, 0] < x1) & (p[:, None, 1] >= y0) & (p[:, None, 1] < y1)
+        empty += (~inside.any(axis=0)).sum()
+    print(f"\n{n_small} samples, {len(blocks)} blocks: {empty / n_seeds:.2f} empty blocks per plan (Poisson-disk), "
+          f"0 by construction (stratified)")
+
+    print(f"\n{'strata':>8} {'samples':>9} {'method':>7} {'vectorized (s)':>15} {'per stratum (s)':>16}")
+    for n_strata in (12, 1000, 10000):
+        extents = strata_grid(n_strata)
+        n = 10 * n_strata
+        for method in ("jitter", "lhs"):
+            t0 = time.perf_counter()
+            points, stratum = stratified_samples(*extents, n, method, seed=0)
+            t_vector = time.perf_counter() - t0
+            assert len(points) == n and np.all(np.bincount(stratum, minlength=n_strata) >= 1)
+            t_loop = "-"
+            if method == "jitter":
+                t0 = time.perf_counter()
+                per_stratum_jitter(*extents, n, seed=0)
+                t_loop = f"{time.perf_counter() - t0:.3f}"
+            print(f"{n_strata:>8} {n:>9} {method:>7} {t_vector:15.3f} {t_loop:>16}")
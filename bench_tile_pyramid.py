@@ -0,0 +1,89 @@
+# Benchmark: tile pyramid build time and peak memory on a large synthetic field
+# Compares peak RSS with the size of the single full-resolution image the deepest zoom
+# level would otherwise be.
+# Usage: python bench_tile_pyramid.py [n_plots] [workers]
+
+import os
+import resource
+import sys
+import tempfile
+import time
+import numpy as np
+from field_model import DESIGNS, Field
+from layout_store import write_layout
+from randomization import assign_ab
+from tile_pyramid import TILE_SIZE, _open_index, build_index, build_pyramid, query
+
+COLUMNS = ["Block", "Row", "Col", "X_start", "X_stop", "Y_start", "Y_stop", "Label"]
+
+
+def synthetic_layout(n_plots, path):
+    # Many-block checkerboard field (as bench_field_model.py) saved as a .layout file
+    cols = 100
+    rows = -(-n_plots // (40 * cols))
+    field = Field(width=20 + cols * 32.75 + (cols - 1) * 3, height=20 + rows * 81.33 + (rows - 1) * 3,
+                  rows=rows, cols=cols)
+    geom = field.geometry()
+    labels, _ = assign_ab(geom['Row'], geom['Col'], geom['Block'],
+                          {block: DESIGNS[(block - 1) % 4 + 1] for block in range(1, rows * cols + 1)}, seed=0)
+    write_layout(field.plots(labels).to_frame(COLUMNS), path)
+    return len(labels)
+
+
+def peak_rss_mb():
+    # (this process, largest worker) in MB; ru_maxrss is in kB on Linux
+    return (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+            resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024)
+
+
+def check_index(tmp):
+    # One oversized plot leaves the buckets small and is still found; all-zero plots are refused
+    rng = np.random.default_rng(0)
+    x0, y0 = rng.uniform(0, 1000, 2000), rng.uniform(0, 1000, 2000)
+    x0[0], y0[0] = 0.0, 0.0
+    plots = {"x0": x0, "y0": y0, "x1": x0 + 3, "y1": y0 + 4, "label": np.zeros(2000, dtype=np.int32)}
+    plots["x1"][0], plots["y1"][0] = 900.0, 900.0
+    meta = build_index(plots, ["A"], os.path.join(tmp, "index"))
+    assert meta["bucket"] == 8 and meta["n_large"] == 1
+    index = _open_index(os.path.join(tmp, "index"))
+    for bounds in rng.uniform(0, 1000, (200, 2)).repeat(2, axis=1)[:, [0, 2, 1, 3]] + [0, 0, 50, 50]:
+        x0, y0, x1, y1 = bounds
+        want = np.nonzero((index["x0"] < x1) & (index["x1"] > x0) & (index["y0"] < y1) & (index["y1"] > y0))[0]
+        assert np.array_equal(np.sort(query(index, bounds)), want)
+    zeros = {name: np.zeros(3) for name in ("x0", "y0", "x1", "y1")}
+    try:
+        build_index(zeros, [], os.path.join(tmp, "zeros"))
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("zero-size plots indexed")
+
+
+if __name__ == "__main__":
+    n_plots = int(float(sys.argv[1])) if len(sys.argv) > 1 else 50_000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count()
+    with tempfile.TemporaryDirectory() as tmp:
+        check_index(tmp)
+        path = os.path.join(tmp, "field.layout")
+        n = synthetic_layout(n_plots, path)
+        base_rss, _ = peak_rss_mb()
+
+        t0 = time.perf_counter()
+        max_zoom, written = build_pyramid(path, os.path.join(tmp, "tiles"), workers=workers)
+        elapsed = time.perf_counter() - t0
+        self_rss, worker_rss = peak_rss_mb()
+
+        levels = []
+        for z in range(max_zoom + 1):
+            level = os.path.join(tmp, "tiles", str(z))
+            levels.append(sum(len(files) for _, _, files in os.walk(level)))
+        size_mb = sum(os.path.getsize(os.path.join(d, f)) for d, _, files in os.walk(os.path.join(tmp, "tiles"))
+                      for f in files) / 2**20
+
+    side = 2 ** max_zoom * TILE_SIZE
+    print(f"{n:,} plots, {workers} worker(s): {written:,} tiles (zoom 0-{max_zoom}), {size_mb:.1f} MB on disk")
+    print(f"build: {elapsed:.2f} s ({written / elapsed:.0f} tiles/s)")
+    print("tiles per zoom: " + ", ".join(f"z{z}={count}" for z, count in enumerate(levels)))
+    print(f"peak RSS: {self_rss:.0f} MB (before build {base_rss:.0f} MB)"
+          + (f", workers {worker_rss:.0f} MB" if workers > 1 else ""))
+    print(f"single {side:,} x {side:,} px RGB image at zoom {max_zoom}: {side * side * 3 / 2**20:,.0f} MB")
@@ -3,27 +3,26 @@
 
 import matplotlib.pyplot as plt
 import matplotlib.patches as patches
+import numpy as np
+from field_model import Field
+from field_render import add_cells, add_labels
 
-# === Field Setup ===
-field_width = 160
-field_height = 270
-border_thickness = 10
-cols = 4
-rows = 3
-gap_x = 3
-gap_y = 3
+# === Field Setup (field_model.Field defaults) ===
+field = Field()
+field_width, field_height, border_thickness = field.width, field.height, field.border_thickness
+rows, cols, gap_x, gap_y = field.rows, field.cols, field.gap_x, field.gap_y
 
 # Usable area
-usable_width = field_width - 2 * border_thickness
-usable_height = field_height - 2 * border_thickness
+usable_width, usable_height = field.usable_width, field.usable_height
 
 # Block and cell dimensions
-block_width = (usable_width - (cols - 1) * gap_x) / cols
-block_height = (usable_height - (rows - 1) * gap_y) / rows
-cell_cols = 5
-cell_rows = 8
-cell_width = block_width / cell_cols
-cell_height = block_height / cell_rows
+cell_rows, cell_cols = field.cell_rows, field.cell_cols
+block_width, block_height, cell_width, cell_height = field.dimensions()
+
+# Cell geometry for all blocks
+geom = field.geometry()
+block_x, block_y = field.block_origins()
+render_mode = "collection"  # "patches" for the original one-artist-per-cell drawing
 
 # Create figure
 fig, ax = plt.subplots(figsize=(14, 12))
@@ -43,35 +42,28 @@ ax.text(1, field_height - 1, f"(0, {field_height})", ha='left', va='top', fontsi
 ax.text(field_width - 1, field_height - 1, f"({field_width}, {field_height})", ha='right', va='top', fontsize=8, rotation=90)
 
 # Draw blocks with alternating checkerboard pattern
-block_id = 1
-for i in range(rows):
-    for j in range(cols):
-        bl_x = border_thickness + j * (block_width + gap_x)
-        bl_y = border_thickness + i * (block_height + gap_y)
+for idx in range(rows * cols):
+    block_id = idx + 1
+    bl_x, bl_y = block_x[idx], block_y[idx]
 
-        # Draw block
-        ax.add_patch(patches.Rectangle((bl_x, bl_y), block_width, block_height,
-                                       edgecolor='black', facecolor='white', linewidth=1.5))
+    # Draw block
+    ax.add_patch(patches.Rectangle((bl_x, bl_y), block_width, block_height,
+                                   edgecolor='black', facecolor='white', linewidth=1.5))
 
-        # Checkerboard pattern starting label
-        base_label = 'A' if block_id % 2 == 1 else 'B'
-        alt_label = 'B' if base_label == 'A' else 'A'
+    # Block ID label
+    ax.text(bl_x + block_width / 2, bl_y + block_height / 2,
+            f"B{block_id}", ha='center', va='center', fontsize=10, weight='bold')
 
-        # Draw internal cells
-        for r in range(cell_rows):
-            for c in range(cell_cols):
-                cell_x = bl_x + c * cell_width
-                cell_y = bl_y + r * cell_height
-                label = base_label if (r + c) % 2 == 0 else alt_label
-                ax.add_patch(patches.Rectangle((cell_x, cell_y), cell_width, cell_height,
-                                               edgecolor='lightgray', facecolor='none', linewidth=0.8))
-                ax.text(cell_x + cell_width / 2, cell_y + cell_height / 2, label,
-                        ha='center', va='center', fontsize=6)
+# Checkerboard labels: odd blocks start with A, even blocks with B
+block_starts_a = geom['Block'] % 2 == 1
+cell_is_base = (geom['Row'] + geom['Col']) % 2 == 0
+labels = np.where(block_starts_a == cell_is_base, 'A', 'B')
 
-        # Block ID label
-        ax.text(bl_x + block_width / 2, bl_y + block_height / 2,
-                f"B{block_id}", ha='center', va='center', fontsize=10, weight='bold')
-        block_id += 1
+# Draw internal cells
+add_cells(ax, geom['X_start'], geom['Y_start'], cell_width, cell_height, ['none'] * len(labels),
+          edgecolor='lightgray', linewidth=0.8, mode=render_mode)
+add_labels(ax, geom['X'], geom['Y'], labels, fontsize=6, mode=render_mode,
+           cell_size=(cell_width, cell_height))
 
 # Final layout
 ax.set_xlim(-5, field_width + 10)
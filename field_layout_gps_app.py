@@ -1,53 +1,97 @@
-
+import os
 import streamlit as st
+import numpy as np
 import pandas as pd
-import re
+from field_model import PLANTED_CELL_HEIGHT, PLANTED_CELL_WIDTH
+from gps_convert import dms_to_feet
+from layout_store import read_layout
+from plot_interpolation import reanchor
+
+# Planted plot size from the shared field model
+cell_height = PLANTED_CELL_HEIGHT
+cell_width = PLANTED_CELL_WIDTH
+Y_COLUMNS = ['Y_start', 'Y_stop', 'Y']
+LAYOUT_PATH = "combined_field_designs_1_to_4.layout"  # Used when present, else the CSV
+MAX_ANCHORS = 32  # Aligned layouts kept per server, least recently used dropped first
 
-# Load pre-generated CSV
-@st.cache_data
+# Load pre-generated layout with its cell geometry, once per server rather than once per rerun.
+# Cached resources are shared between sessions and must be treated as read-only.
+@st.cache_resource
 def load_data():
-    return pd.read_csv("combined_field_designs_1_to_4.csv")
+    if os.path.exists(LAYOUT_PATH):
+        df = read_layout(LAYOUT_PATH)
+    else:
+        df = pd.read_csv("combined_field_designs_1_to_4.csv")
+    df['X_start'] = df['X'] - cell_width / 2
+    df['X_stop'] = df['X'] + cell_width / 2
+    df['Y_start'] = df['Y'] - cell_height / 2
+    df['Y_stop'] = df['Y'] + cell_height / 2
+    # Everything but the Y columns is final here; those are rounded after the GPS offset
+    rounded = df.round(2)
+    rounded[Y_COLUMNS] = df[Y_COLUMNS]
+    return rounded
 
 def gps_to_feet(gps_str):
-    match = re.match(r'^(\d+)[\s\-:]+(\d+)[\s\-:]+(\d+)$', gps_str.strip())
-    if not match:
+    feet = dms_to_feet(gps_str)
+    if np.isnan(feet):
+        return None
+    return float(feet)
+
+def parse_corners(text):
+    # Four "lat,lon" lines (lower left, lower right, upper right, upper left) -> tuple of pairs, None if malformed
+    try:
+        corners = tuple(tuple(float(v) for v in line.split(",")) for line in text.strip().splitlines() if line.strip())
+    except ValueError:
+        return None
+    if len(corners) != 4 or any(len(c) != 2 for c in corners):
         return None
-    degrees, minutes, seconds = map(int, match.groups())
-    decimal_deg = degrees + minutes / 60 + seconds / 3600
-    feet = decimal_deg * 364000
-    return feet
+    return corners
 
 def update_coordinates(df, gps_y_feet):
     min_y_start = df[df['Block'] == 'T0']['Y_start'].min()
     offset = gps_y_feet - min_y_start
-    df['Y_start'] += offset
-    df['Y_stop'] += offset
-    df['Y'] += offset
-    return df.round(2)
+    # Only the Y columns change; the rest of the table is shared, not copied
+    shifted = {col: (df[col] + offset).round(2) for col in Y_COLUMNS}
+    return df.assign(**shifted)
 
-st.set_page_config(page_title="Field Layout GPS Aligner", layout="centered")
-st.title("🌱 Field Layout GPS Coordinate Aligner")
+@st.cache_resource(max_entries=MAX_ANCHORS)
+def aligned_layout(gps_input, corners=None):
+    # Memoized per anchor string and surveyed corners; None for an anchor that does not parse.
+    # With corners, every plot also gets Lat/Lon from one affine fit of the layout's extents.
+    gps_y = gps_to_feet(gps_input)
+    if gps_y is None:
+        return None
+    df = update_coordinates(load_data(), gps_y)
+    return reanchor(df, corners) if corners is not None else df
 
-df = load_data()
-# Constants from the original layout
-cell_height = 10  # or whatever your planted row length was
-cell_width = 3.3  # estimate if unknown
+@st.cache_data(max_entries=MAX_ANCHORS)
+def layout_csv(gps_input, corners=None):
+    return aligned_layout(gps_input, corners).to_csv(index=False).encode('utf-8')
 
-# Recalculate coordinates
-df['X_start'] = df['X'] - cell_width / 2
-df['X_stop'] = df['X'] + cell_width / 2
-df['Y_start'] = df['Y'] - cell_height / 2
-df['Y_stop'] = df['Y'] + cell_height / 2
+st.set_page_config(page_title="Field Layout GPS Aligner", layout="centered")
+st.title("🌱 Field Layout GPS Coordinate Aligner")
 
 gps_input = st.text_input("Enter GPS for T0 lower-left corner (format: XX-YY-ZZ)", "40-06-54")
+corners_input = st.text_area("Optional: surveyed field corners, one lat,lon per line "
+                             "(lower left, lower right, upper right, upper left)", "")
 
+# The applied anchor lives in the session, so later reruns (typing, the download) keep showing it
 if st.button("Update Coordinates"):
-    gps_y = gps_to_feet(gps_input)
-    if gps_y is None:
+    st.session_state['anchor'] = gps_input.strip()
+    st.session_state['corners'] = parse_corners(corners_input) if corners_input.strip() else None
+    st.session_state['corners_invalid'] = bool(corners_input.strip()) and st.session_state['corners'] is None
+
+anchor = st.session_state.get('anchor')
+corners = st.session_state.get('corners')
+if anchor is not None:
+    updated_df = aligned_layout(anchor, corners)
+    if updated_df is None:
         st.error("Invalid GPS format. Use XX-YY-ZZ.")
+    elif st.session_state.get('corners_invalid'):
+        st.error("Invalid corners. Enter four lat,lon lines.")
     else:
-        updated_df = update_coordinates(df.copy(), gps_y)
-        st.success("Coordinates updated.")
+        st.success(f"Coordinates updated for {anchor}.")
         st.dataframe(updated_df.head(10), use_container_width=True)
-        csv = updated_df.to_csv(index=False).encode('utf-8')
-        st.download_button("Download Updated CSV", csv, "updated_field_design.csv", "text/csv")
+        # The CSV is only written when asked for, then cached per anchor
+        if st.checkbox("Prepare CSV download"):
+            st.download_button("Download Updated CSV", layout_csv(anchor, corners), "updated_field_design.csv", "text/csv")
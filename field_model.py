@@ -0,0 +1,276 @@
+# Shared field model
+# One definition of the trial that every generator and app builds on: field, block and
+# subblock dimensions, the entry pools and designs, and the plots themselves as one
+# structured NumPy array (28 bytes per plot) instead of one dict per plot.
+
+import numpy as np
+import pandas as pd
+from layout_engine import block_dimensions, block_labels, block_origins, cell_geometry, locate_cells
+
+# === Entries ===
+AG = ["AG29XF4", "AG29XF5", "AG34XF6", "AG35XF5", "AG36XF4", "AG38XF6", "AG40XFF5"]
+LD = [
+    "LD11-2170", "LD20-4471", "LD20-4542", "LD20-4988", "LD20-5738", "LD22-4283",
+    "LD00-2817P", "LD17-10473L", "LD19-10076", "LD19-10244", "LD21-5944", "LD21-5991",
+    "LD07-3395bf", "LD17-10473F", "LD20-11748", "LD20-5413", "LD21-3090", "LD21-5253",
+    "LD21-5665", "LD21-7234"
+]
+LG = ["LG3216"]
+
+# Checkerboard designs (allField.py): A/B entry pools and fill colours
+DESIGNS = {
+    1: {
+        'A': ["AG29XF4", "AG29XF5", "AG34XF6", "AG35XF5", "AG36XF4", "AG38XF6", "AG40XFF5"],
+        'B': ["LG3216"],
+        'A_COLOR': '#c6dbef',
+        'B_COLOR': '#c7e9c0'
+    },
+    2: {
+        'A': [
+            "LD20-4542", "LD20-4988", "LD20-4471", "LD20-5738", "LD22-4283",
+            "LD11-2170", "LD20-5413", "LD21-5253", "LD21-7234"
+        ],
+        'B': ["AG29XF4", "AG29XF5"],
+        'A_COLOR': '#f2f0f7',
+        'B_COLOR': '#deebf7'
+    },
+    3: {
+        'A': [
+            "LD11-2170", "LD20-4471", "LD20-4542", "LD20-4988", "LD20-5738", "LD22-4283",
+            "LD00-2817P", "LD17-10473L", "LD19-10076", "LD19-10244", "LD21-5944", "LD21-5991",
+            "LD07-3395bf", "LD17-10473F", "LD20-11748", "LD20-5413", "LD21-3090", "LD21-5253",
+            "LD21-5665", "LD21-7234"
+        ],
+        'B': ["LG3216"],
+        'A_COLOR': '#fdd0a2',
+        'B_COLOR': '#c7e9c0'
+    },
+    4: {
+        'A': ["AG34XF6", "AG35XF5", "AG36XF4", "AG38XF6", "AG40XFF5"],
+        'B': [
+            "LD21-5253", "LD21-7234", "LD21-5665", "LD21-3090", "LD07-3395bf",
+            "LD17-10473F", "LD20-11748", "LD21-5944"
+        ],
+        'A_COLOR': '#d0d1e6',
+        'B_COLOR': '#ccebc5'
+    }
+}
+DESIGN_BLOCKS = {1: [1, 6, 11], 2: [2, 7, 12], 3: [3, 8, 9], 4: [4, 5, 10]}  # Design -> block ids
+
+# Subblock types of the full-field track layout (_full_field.py): (A pool, B pool)
+SUBBLOCK_TYPES = [(AG, LD), (AG, LD), (AG, LG), (LD, LG)]
+
+# Planted plot size used by the fieldbook and the GPS aligner (ft)
+PLANTED_CELL_WIDTH = 3.3
+PLANTED_CELL_HEIGHT = 10
+
+# One plot: block id, row/col within its block, lower-left corner, entry index into Plots.labels.
+# Centres and upper-right corners follow from the (shared) plot size.
+PLOT_DTYPE = np.dtype([("block", "<i4"), ("row", "<i2"), ("col", "<i2"),
+                       ("x_start", "<f8"), ("y_start", "<f8"), ("label", "<i4")])
+FRAME_COLUMNS = ["Block", "Row", "Col", "X", "Y", "Label"]
+
+
+# === Plots ===
+class Plots:
+    """Equal-sized plots as one PLOT_DTYPE array plus the entry names it indexes.
+
+    Columns are derived on request exactly as layout_engine.cell_geometry
+    computes them, so frames built here match the old per-plot output.
+    """
+    __slots__ = ("data", "labels", "width", "height")
+
+    def __init__(self, data, labels, width, height):
+        self.data = data
+        self.labels = np.asarray(labels, dtype=object)
+        self.width = width
+        self.height = height
+
+    @classmethod
+    def from_columns(cls, block, row, col, x_start, y_start, width, height, labels=None):
+        data = np.empty(len(block), dtype=PLOT_DTYPE)
+        data["block"], data["row"], data["col"] = block, row, col
+        data["x_start"], data["y_start"] = x_start, y_start
+        if labels is None:
+            data["label"], names = -1, []
+        else:
+            data["label"], names = pd.factorize(np.asarray(labels, dtype=object))
+        return cls(data, names, width, height)
+
+    def __len__(self):
+        return len(self.data)
+
+    @property
+    def nbytes(self):
+        return self.data.nbytes
+
+    def column(self, name):
+        # Frame column by its CSV name
+        d = self.data
+        if name == "Block":
+            return block_labels(d["block"])
+        if name == "Label":
+            return np.append(self.labels, "")[d["label"]]
+        return {
+            "Row": lambda: d["row"].astype(np.int32),
+            "Col": lambda: d["col"].astype(np.int32),
+            "X": lambda: d["x_start"] + self.width / 2,
+            "Y": lambda: d["y_start"] + self.height / 2,
+            "X_start": lambda: d["x_start"],
+            "X_stop": lambda: d["x_start"] + self.width,
+            "Y_start": lambda: d["y_start"],
+            "Y_stop": lambda: d["y_start"] + self.height,
+        }[name]()
+
+    def to_frame(self, columns=FRAME_COLUMNS, decimals=2):
+        # DataFrame in the layout CSV format; coordinates rounded to decimals
+        frame = {}
+        for name in columns:
+            values = self.column(name)
+            frame[name] = values.round(decimals) if values.dtype.kind == "f" else values
+        return pd.DataFrame(frame)
+
+
+# === Field ===
+class Block:
+    __slots__ = ("id", "x", "y", "width", "height", "design")
+
+    def __init__(self, id, x, y, width, height, design=None):
+        self.id, self.x, self.y, self.width, self.height, self.design = id, x, y, width, height, design
+
+    @property
+    def name(self):
+        return f"B{self.id}"
+
+    def __repr__(self):
+        return f"Block({self.name}, x={self.x:g}, y={self.y:g}, design={self.design})"
+
+
+class Field:
+    """Checkerboard trial field: rows x cols blocks of cell_rows x cell_cols cells.
+
+    Defaults are the Energy Farm 2025 trial (allField.py).
+    """
+    __slots__ = ("width", "height", "border_thickness", "rows", "cols", "gap_x", "gap_y", "cell_rows", "cell_cols")
+
+    def __init__(self, width=160, height=270, border_thickness=10, rows=3, cols=4, gap_x=3, gap_y=3,
+                 cell_rows=8, cell_cols=5):
+        self.width, self.height, self.border_thickness = width, height, border_thickness
+        self.rows, self.cols, self.gap_x, self.gap_y = rows, cols, gap_x, gap_y
+        self.cell_rows, self.cell_cols = cell_rows, cell_cols
+
+    @property
+    def usable_width(self):
+        return self.width - 2 * self.border_thickness
+
+    @property
+    def usable_height(self):
+        return self.height - 2 * self.border_thickness
+
+    @property
+    def cells_per_block(self):
+        return self.cell_rows * self.cell_cols
+
+    def dimensions(self):
+        # (block_width, block_height, cell_width, cell_height)
+        return block_dimensions(self.width, self.height, self.border_thickness, self.rows, self.cols,
+                                self.gap_x, self.gap_y, self.cell_rows, self.cell_cols)
+
+    def block_origins(self):
+        block_width, block_height, _, _ = self.dimensions()
+        return block_origins(self.rows, self.cols, block_width, block_height, self.border_thickness,
+                             self.gap_x, self.gap_y)
+
+    def blocks(self, design_blocks=None):
+        # Block objects in block-id order; design_blocks maps design -> block ids
+        design_of = {b: d for d, ids in (design_blocks or {}).items() for b in ids}
+        block_width, block_height, _, _ = self.dimensions()
+        xs, ys = self.block_origins()
+        return [Block(i + 1, float(x), float(y), block_width, block_height, design_of.get(i + 1))
+                for i, (x, y) in enumerate(zip(xs, ys))]
+
+    def geometry(self, dtype=np.float64):
+        # Per-cell column arrays (layout_engine.cell_geometry)
+        return cell_geometry(self.width, self.height, self.border_thickness, self.rows, self.cols,
+                             self.gap_x, self.gap_y, self.cell_rows, self.cell_cols, dtype)
+
+    def locate(self, x, y):
+        # (Block, Row, Col) of the cell under each point; Block 0 in alleys, -1 in the border (layout_engine.locate_cells)
+        return locate_cells(x, y, self.width, self.height, self.border_thickness, self.rows, self.cols,
+                            self.gap_x, self.gap_y, self.cell_rows, self.cell_cols)
+
+    def plots(self, labels=None):
+        # Every cell of the field as Plots, optionally with per-cell labels
+        geom = self.geometry()
+        _, _, cell_width, cell_height = self.dimensions()
+        return Plots.from_columns(geom["Block"], geom["Row"], geom["Col"], geom["X_start"], geom["Y_start"],
+                                  cell_width, cell_height, labels)
+
+
+# === Track Subblocks (_full_field.py) ===
+class SubBlock:
+    """One subblock of the full-field track layout: num_tracks tracks of num_plots plots.
+
+    Plots are paired bottom/top; even tracks put the A entry on top, odd tracks
+    the B entry, and pairings cycle through both pools.
+    """
+    __slots__ = ("x", "y", "a_entries", "b_entries", "width", "height", "num_tracks", "track_width",
+                 "num_plots", "plot_gap")
+
+    def __init__(self, x, y, a_entries, b_entries, width=35, height=94, num_tracks=5, track_width=5,
+                 num_plots=12, plot_gap=1):
+        self.x, self.y, self.a_entries, self.b_entries = x, y, a_entries, b_entries
+        self.width, self.height, self.num_tracks, self.track_width = width, height, num_tracks, track_width
+        self.num_plots, self.plot_gap = num_plots, plot_gap
+
+    @property
+    def plot_length(self):
+        return self.height / self.num_plots - self.plot_gap
+
+    def track_extents(self):
+        # (x_start, y_start, x_stop, y_stop) arrays, one entry per track
+        track_spacing = (self.width - self.num_tracks * self.track_width) / (self.num_tracks + 1)
+        x_start = self.x + track_spacing + np.arange(self.num_tracks) * (self.track_width + track_spacing)
+        y_start = np.full(self.num_tracks, float(self.y))
+        return x_start, y_start, x_start + self.track_width, y_start + self.height
+
+    def locate(self, x, y):
+        """(track, plot index) of the plot under each point, -1 for both between tracks or plots.
+
+        The track_extents / layout formulas inverted with a floor per axis; matches
+        plots()'s Col and Row.
+        """
+        x, y = np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64)
+        track_spacing = (self.width - self.num_tracks * self.track_width) / (self.num_tracks + 1)
+        pitch = self.track_width + track_spacing
+        step = self.height / self.num_plots
+        track = np.floor((x - self.x - track_spacing) / pitch).astype(np.int64)
+        index = np.floor((y - self.y) / step).astype(np.int64)
+        inside = ((track >= 0) & (track < self.num_tracks) & (index >= 0) & (index < self.num_plots)
+                  & (x - (self.x + track_spacing + track * pitch) < self.track_width)
+                  & (y - (self.y + index * step) < self.plot_length))
+        return np.where(inside, track, -1), np.where(inside, index, -1)
+
+    def pairings(self):
+        n = (self.num_plots // 2) * self.num_tracks
+        return [(self.a_entries[i % len(self.a_entries)], self.b_entries[i % len(self.b_entries)]) for i in range(n)]
+
+    def layout(self):
+        # (track, plot index, x_start, y_start, entry) per plot, in drawing order
+        track_spacing = (self.width - self.num_tracks * self.track_width) / (self.num_tracks + 1)
+        step = self.height / self.num_plots
+        pairings = iter(self.pairings())
+        plots = []
+        for t in range(self.num_tracks):
+            x_start = self.x + track_spacing + t * (self.track_width + track_spacing)
+            for b in range(0, self.num_plots, 2):
+                var_a, var_b = next(pairings)
+                var_top, var_bottom = (var_a, var_b) if t % 2 == 0 else (var_b, var_a)
+                plots.append((t, b, x_start, self.y + b * step, var_bottom))
+                plots.append((t, b + 1, x_start, self.y + (b + 1) * step, var_top))
+        return plots
+
+    def plots(self, block=0):
+        track, index, x_start, y_start, entries = zip(*self.layout())
+        return Plots.from_columns(np.full(len(track), block), index, track, x_start, y_start,
+                                  self.track_width, self.plot_length, entries)
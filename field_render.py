@@ -0,0 +1,204 @@
+# Batched rendering helpers for the field maps
+# One PolyCollection for all cells and one PathCollection for all labels,
+# instead of one Rectangle + one ax.text per cell. Given the cell size, labels are
+# culled at draw time: shrunk to fit their cell, abbreviated or dropped once they
+# would be too small to read, and skipped outside the axes.
+
+import numpy as np
+import matplotlib.patches as patches
+from matplotlib.collections import PathCollection, PolyCollection
+from matplotlib.font_manager import FontProperties
+from matplotlib.path import Path
+from matplotlib.textpath import TextPath
+from matplotlib.transforms import Affine2D
+
+# "collection" draws the whole grid as batched artists,
+# "patches" keeps the original one-artist-per-cell path (slow, kept for comparison)
+RENDER_MODES = ("collection", "patches")
+
+MIN_FONTSIZE = 3.5  # smallest label (pt on the page) still drawn
+LABEL_FILL = 0.9  # labels may use this much of their cell's width and height
+
+
+# === Cells ===
+def cell_vertices(x_start, y_start, width, height):
+    # (N, 4, 2) rectangle corners, counter-clockwise from the lower left
+    x0 = np.asarray(x_start, dtype=float)
+    y0 = np.asarray(y_start, dtype=float)
+    x1 = x0 + width
+    y1 = y0 + height
+    return np.stack([
+        np.stack([x0, y0], axis=-1),
+        np.stack([x1, y0], axis=-1),
+        np.stack([x1, y1], axis=-1),
+        np.stack([x0, y1], axis=-1),
+    ], axis=1)
+
+
+def add_cells(ax, x_start, y_start, width, height, facecolors, edgecolor='lightgray', linewidth=0.8,
+              mode="collection"):
+    if mode not in RENDER_MODES:
+        raise ValueError(f"Unknown render mode {mode!r}, expected one of {RENDER_MODES}")
+
+    if mode == "patches":
+        widths = np.broadcast_to(width, np.shape(x_start))
+        heights = np.broadcast_to(height, np.shape(x_start))
+        for x, y, w, h, fc in zip(x_start, y_start, widths, heights, facecolors):
+            ax.add_patch(patches.Rectangle((x, y), w, h, edgecolor=edgecolor, facecolor=fc, linewidth=linewidth))
+        return None
+
+    collection = PolyCollection(cell_vertices(x_start, y_start, width, height),
+                                facecolors=list(facecolors), edgecolors=edgecolor, linewidths=linewidth)
+    ax.add_collection(collection, autolim=False)
+    return collection
+
+
+# === Labels ===
+_label_path_cache = {}
+
+
+def label_path(label, fontsize, rotation=0, weight='normal'):
+    # Glyph outline of a label in points, centred on (0, 0) and rotated; cached per unique label
+    key = (label, fontsize, rotation, weight)
+    path = _label_path_cache.get(key)
+    if path is None:
+        text_path = TextPath((0, 0), label, size=fontsize, prop=FontProperties(weight=weight))
+        vertices = text_path.vertices
+        if len(vertices):
+            center = (vertices.min(axis=0) + vertices.max(axis=0)) / 2
+            vertices = Affine2D().translate(*-center).rotate_deg(rotation).transform(vertices)
+        path = Path(vertices, text_path.codes)
+        _label_path_cache[key] = path
+    return path
+
+
+_label_extent_cache = {}
+
+
+def label_extent(label, rotation=0, weight='normal'):
+    # (width, height) of a label at fontsize 1 in points, after rotation; cached per (label, font, rotation)
+    key = (label, rotation, weight)
+    extent = _label_extent_cache.get(key)
+    if extent is None:
+        text_path = TextPath((0, 0), label, size=1, prop=FontProperties(weight=weight))
+        vertices = Affine2D().rotate_deg(rotation).transform(text_path.vertices)
+        extent = np.ptp(vertices, axis=0) if len(vertices) else np.zeros(2)
+        _label_extent_cache[key] = extent
+    return extent
+
+
+def short_labels(labels):
+    # Shortest suffix of each (distinct) label that no other label shares, e.g. LD20-4542 -> 542
+    labels = list(labels)
+    short = list(labels)
+    unresolved = set(range(len(labels)))
+    for k in range(1, max(map(len, labels), default=0) + 1):
+        suffixes = [label[-k:] for label in labels]
+        counts = {}
+        for suffix in suffixes:
+            counts[suffix] = counts.get(suffix, 0) + 1
+        for i in [i for i in unresolved if counts[suffixes[i]] == 1]:
+            short[i] = suffixes[i]
+            unresolved.discard(i)
+    return short
+
+
+class LabelLayer(PathCollection):
+    """Cell labels as one artist, culled to what is legible when the figure is drawn.
+
+    At draw time each distinct label is fitted to the cell's on-page size: kept at
+    fontsize if it fits, shrunk to fit, replaced by its short_labels abbreviation, or
+    dropped below min_fontsize. Labels outside the axes are skipped, so the cost of a
+    draw follows the labels that can actually be read. counts holds the last draw's
+    full/abbreviated/dropped numbers.
+    """
+
+    def __init__(self, ax, x, y, labels, cell_size, fontsize=5.5, rotation=0, weight='normal',
+                 min_fontsize=MIN_FONTSIZE, abbreviate=True, **kwargs):
+        self._xy = np.column_stack([x, y]).astype(float)
+        self._unique, self._inverse = np.unique(np.asarray(labels).astype(str), return_inverse=True)
+        self._short = short_labels(self._unique) if abbreviate else list(self._unique)
+        self._extents = np.array([label_extent(u, rotation, weight) for u in self._unique]).reshape(-1, 2)
+        self._short_extents = np.array([label_extent(u, rotation, weight) for u in self._short]).reshape(-1, 2)
+        self._cell_size = cell_size
+        self._font = (fontsize, rotation, weight, min_fontsize)
+        self.counts = {"full": 0, "abbreviated": 0, "dropped": 0}
+        # Paths are in points; scale them to display units and place them at the data offsets
+        super().__init__([], offsets=np.empty((0, 2)), offset_transform=ax.transData,
+                         transform=Affine2D().scale(1 / 72) + ax.figure.dpi_scale_trans, **kwargs)
+
+    def _fitted_sizes(self, extents, cell_pt):
+        # Largest fontsize (<= fontsize, in 0.25 pt steps) at which each label fits its cell
+        fontsize = self._font[0]
+        with np.errstate(divide="ignore"):
+            fit = np.min(LABEL_FILL * cell_pt / extents, axis=1)
+        return np.floor(np.minimum(fit, fontsize) * 4) / 4
+
+    def draw(self, renderer):
+        if not self.get_visible() or not len(self._xy):
+            return
+        fontsize, rotation, weight, min_fontsize = self._font
+        trans = self.axes.transData
+        corners = trans.transform([(0, 0), self._cell_size])
+        cell_pt = np.abs(corners[1] - corners[0]) / renderer.points_to_pixels(1.0)
+
+        full_size = self._fitted_sizes(self._extents, cell_pt)
+        short_size = self._fitted_sizes(self._short_extents, cell_pt)
+        unique_paths = []
+        for label, short, size, size_short in zip(self._unique, self._short, full_size, short_size):
+            if size >= min_fontsize:
+                unique_paths.append(label_path(label, float(size), rotation, weight))
+            elif size_short >= min_fontsize:
+                unique_paths.append(label_path(short, float(size_short), rotation, weight))
+            else:
+                unique_paths.append(None)
+        legible = np.array([path is not None for path in unique_paths], dtype=bool)
+        keep = legible[self._inverse]
+        if self.get_clip_on():
+            # Within the axes (with a cell of margin for labels centred just outside)
+            display = trans.transform(self._xy)
+            bbox = self.axes.bbox
+            margin = np.abs(corners[1] - corners[0])
+            keep &= ((display[:, 0] >= bbox.x0 - margin[0]) & (display[:, 0] <= bbox.x1 + margin[0])
+                     & (display[:, 1] >= bbox.y0 - margin[1]) & (display[:, 1] <= bbox.y1 + margin[1]))
+
+        shortened = (full_size < min_fontsize)[self._inverse]
+        self.counts = {"full": int((keep & ~shortened).sum()), "abbreviated": int((keep & shortened).sum()),
+                       "dropped": int(len(keep) - keep.sum())}
+        self.set_paths([unique_paths[i] for i in self._inverse[keep]])
+        self.set_offsets(self._xy[keep])
+        super().draw(renderer)
+
+
+def add_labels(ax, x, y, labels, fontsize=5.5, rotation=0, color='black', weight='normal', mode="collection",
+               cell_size=None, min_fontsize=MIN_FONTSIZE):
+    # cell_size (width, height) in data units turns on draw-time culling (LabelLayer)
+    if mode not in RENDER_MODES:
+        raise ValueError(f"Unknown render mode {mode!r}, expected one of {RENDER_MODES}")
+
+    labels = np.asarray(labels, dtype=object)
+    keep = labels != ""
+    x, y, labels = np.asarray(x)[keep], np.asarray(y)[keep], labels[keep]
+
+    if mode == "patches":
+        for lx, ly, label in zip(x, y, labels):
+            ax.text(lx, ly, label, ha='center', va='center', fontsize=fontsize, rotation=rotation,
+                    color=color, weight=weight)
+        return None
+
+    if not len(labels):
+        return None
+    if cell_size is not None:
+        layer = LabelLayer(ax, x, y, labels, cell_size, fontsize, rotation, weight, min_fontsize,
+                           facecolors=color, edgecolors='none', linewidths=0, zorder=3)
+        ax.add_collection(layer, autolim=False)
+        return layer
+    unique, inverse = np.unique(labels.astype(str), return_inverse=True)
+    unique_paths = [label_path(label, fontsize, rotation, weight) for label in unique]
+    # Paths are in points; scale them to display units and place them at the data offsets
+    collection = PathCollection([unique_paths[i] for i in inverse],
+                                offsets=np.column_stack([x, y]), offset_transform=ax.transData,
+                                transform=Affine2D().scale(1 / 72) + ax.figure.dpi_scale_trans,
+                                facecolors=color, edgecolors='none', linewidths=0, zorder=3)
+    ax.add_collection(collection, autolim=False)
+    return collection
@@ -0,0 +1,171 @@
+# Fieldbook page rendering
+# Each block's layout and coordinate pages are drawn into their own small PDF, in a
+# process pool, and the documents are concatenated in block order by fieldbook_pdf.
+# Matplotlib only draws the block layouts; text and tables are written as native PDF.
+# Rendered block pages are cached on disk under a hash of the block's rows and the
+# render settings, so regenerating after a small edit only redraws changed blocks.
+
+import hashlib
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_pdf import PdfPages
+from field_model import PLANTED_CELL_HEIGHT, PLANTED_CELL_WIDTH
+from field_render import add_cells, add_labels
+from fieldbook_pdf import merge_pdfs, table_pdf, text_pdf
+
+A5_INCHES = (5.8, 8.3)
+CELL_WIDTH = PLANTED_CELL_WIDTH
+CELL_HEIGHT = PLANTED_CELL_HEIGHT  # planted row length
+PAGE_CACHE_DIR = ".fieldbook_page_cache"
+PAGE_CACHE_BYTES = 512 * 2**20
+PAGE_FORMAT_VERSION = 2  # Bump when block_pages draws differently, to drop stale cached pages
+BLOCK_COLUMNS = ['Row', 'Col', 'Label', 'X', 'Y', 'X_start', 'Y_start', 'X_stop', 'Y_stop']
+
+
+def add_geometry(df, cell_width=CELL_WIDTH, cell_height=CELL_HEIGHT):
+    # Recalculate start/stop coordinates from the cell centres
+    df['X_start'] = df['X'] - cell_width / 2
+    df['X_stop'] = df['X'] + cell_width / 2
+    df['Y_start'] = df['Y'] - cell_height / 2
+    df['Y_stop'] = df['Y'] + cell_height / 2
+    return df
+
+
+def trial_blocks(df):
+    # Block names in field order, without the T0 border
+    return sorted(df[df['Block'] != 'T0']['Block'].unique(), key=lambda x: int(x[1:]))
+
+
+def _pdf_bytes(draw_pages):
+    buffer = io.BytesIO()
+    with PdfPages(buffer) as pdf:
+        draw_pages(pdf)
+    return buffer.getvalue()
+
+
+# === Front Matter ===
+def front_pages(df, source_name):
+    # Summary page and entry list as one PDF
+    summary = text_pdf([
+        ("Fieldbook with GPS-Aligned Coordinates", 12, True),
+        ("Each block includes updated start/stop coordinates based on the GPS-aligned T0 anchor.", 9, False),
+        (f"Uploaded File: {source_name}", 8, False),
+    ])
+    entry_list = df.loc[df['Block'] != 'T0', 'Label'].drop_duplicates()
+    entries = table_pdf("Entry List", ["Entry#", "Label"], enumerate(entry_list, start=1),
+                        col_widths=[0.2, 0.75], font_size=6)
+    return merge_pdfs([summary, entries])
+
+
+# === Block Pages ===
+def block_pages(block, block_df, cell_width=CELL_WIDTH, cell_height=CELL_HEIGHT):
+    # Layout page (matplotlib) and coordinate table pages for one block, as PDF bytes
+    def draw(pdf):
+        fig = Figure(figsize=A5_INCHES)
+        ax = fig.subplots()
+        add_cells(ax, block_df['X_start'], block_df['Y_start'], cell_width, cell_height,
+                  ["#d9d9d9"] * len(block_df), edgecolor='black', linewidth=0.3)
+        add_labels(ax, block_df['X'], block_df['Y'], block_df['Label'].astype(str), fontsize=4, rotation=90,
+                   cell_size=(cell_width, cell_height))
+        ax.set_xlim(block_df['X_start'].min() - 1, block_df['X_stop'].max() + 1)
+        ax.set_ylim(block_df['Y_start'].min() - 1, block_df['Y_stop'].max() + 1)
+        ax.set_aspect('equal')
+        ax.axis('off')
+        ax.set_title(f"Block {block} Layout", fontsize=10, pad=5)
+        fig.subplots_adjust(left=0.01, right=0.99, top=0.95, bottom=0.01)
+        pdf.savefig(fig, bbox_inches='tight')
+
+    coords_data = block_df[['Row', 'Col', 'Label', 'X_start', 'Y_start', 'X_stop', 'Y_stop']]
+    coords_data = coords_data.sort_values(by=['Row', 'Col']).round(2)
+    table = table_pdf(f"Block {block} Plot Coordinates", list(coords_data.columns), coords_data.values.tolist(),
+                      col_widths=[0.08, 0.08, 0.3, 0.14, 0.14, 0.14, 0.14], font_size=5.5)
+    return merge_pdfs([_pdf_bytes(draw), table])
+
+
+# === Page Cache ===
+def block_key(block, block_df, cell_width=CELL_WIDTH, cell_height=CELL_HEIGHT):
+    # Everything block_pages draws from: the block's rows, its name and the render settings
+    key = hashlib.sha1(f"{PAGE_FORMAT_VERSION}|{block}|{cell_width}|{cell_height}".encode())
+    key.update(pd.util.hash_pandas_object(block_df[BLOCK_COLUMNS], index=False).to_numpy().tobytes())
+    return key.hexdigest()
+
+
+def _cache_get(cache_dir, key):
+    path = os.path.join(cache_dir, f"{key}.pdf")
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return None
+    os.utime(path)  # Recently used pages are evicted last
+    return data
+
+
+def _cache_put(cache_dir, key, data):
+    os.makedirs(cache_dir, exist_ok=True)
+    path = os.path.join(cache_dir, f"{key}.pdf")
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def prune_page_cache(cache_dir=PAGE_CACHE_DIR, max_bytes=PAGE_CACHE_BYTES):
+    # Drop least recently used pages until the cache fits in max_bytes
+    entries = []
+    for entry in os.scandir(cache_dir):
+        if entry.name.endswith(".pdf"):
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass  # Another session pruned it first
+        total -= size
+
+
+# === Whole Fieldbook ===
+def render_fieldbook(df, source_name, workers=None, cache_dir=PAGE_CACHE_DIR, cache_bytes=PAGE_CACHE_BYTES):
+    """Render the fieldbook for a GPS-aligned layout (with start/stop columns) to PDF bytes.
+
+    Block pages are rendered in a pool of `workers` processes (default: one per
+    CPU); workers=1 renders everything in this process. Blocks whose rows and
+    settings are unchanged come from the page cache in cache_dir (None disables
+    it), which is kept under cache_bytes.
+    """
+    blocks = trial_blocks(df)
+    frames = dict(tuple(df.groupby('Block', sort=False, observed=True)))
+    block_frames = [frames[block] for block in blocks]
+    workers = workers or os.cpu_count() or 1
+
+    pages = [None] * len(blocks)
+    if cache_dir is not None:
+        keys = [block_key(block, frame) for block, frame in zip(blocks, block_frames)]
+        pages = [_cache_get(cache_dir, key) for key in keys]
+    todo = [i for i, page in enumerate(pages) if page is None]
+    todo_blocks = [blocks[i] for i in todo]
+    todo_frames = [block_frames[i] for i in todo]
+
+    if workers == 1 or len(todo) < 2:
+        rendered = list(map(block_pages, todo_blocks, todo_frames))
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(todo))) as pool:
+            # map keeps block order; chunks cut the per-task pickling overhead
+            chunksize = max(1, len(todo) // (4 * workers))
+            rendered = list(pool.map(block_pages, todo_blocks, todo_frames, chunksize=chunksize))
+
+    for i, page in zip(todo, rendered):
+        pages[i] = page
+        if cache_dir is not None:
+            _cache_put(cache_dir, keys[i], page)
+    if cache_dir is not None and todo:
+        prune_page_cache(cache_dir, cache_bytes)
+
+    return merge_pdfs([front_pages(df, source_name)] + pages)
@@ -0,0 +1,212 @@
+# Low-level PDF helpers for the fieldbook
+# Pages are rendered to separate PDF documents (in worker processes) and stitched
+# together here, without a PDF library: objects are copied byte for byte and only
+# their numbers and the page tree are rewritten.
+# Text and table pages are written directly as PDF content streams in the standard
+# Helvetica fonts, which keeps their text selectable and skips matplotlib entirely.
+
+import re
+import textwrap
+
+A5_POINTS = (419.53, 595.28)  # 148 x 210 mm
+MARGIN = 28
+FONTS = {"F1": b"Helvetica", "F2": b"Helvetica-Bold"}
+
+_OBJ_HEADER = re.compile(rb"(\d+)\s+(\d+)\s+obj\b")
+_REF = re.compile(rb"(\d+)\s+0\s+R\b")
+_STREAM = re.compile(rb"\bstream\r?\n")
+
+
+# === Reading ===
+def _xref_offsets(data):
+    # {object number: byte offset} from the classic cross-reference table(s)
+    start = int(data[data.rindex(b"startxref") + 9:].split()[0])
+    offsets = {}
+    while start is not None:
+        if not data.startswith(b"xref", start):
+            raise ValueError("Only PDFs with a classic xref table can be merged")
+        lines = iter(data[start + 4:data.index(b"trailer", start)].split(b"\n"))
+        for line in lines:
+            fields = line.split()
+            if len(fields) != 2:
+                continue
+            first, count = int(fields[0]), int(fields[1])
+            for num in range(first, first + count):
+                offset, _, kind = next(lines).split()[:3]
+                if kind == b"n":
+                    offsets.setdefault(num, int(offset))
+        trailer = data[data.index(b"trailer", start):]
+        prev = re.search(rb"/Prev\s+(\d+)", trailer[:trailer.index(b">>") + 2])
+        start = int(prev.group(1)) if prev else None
+    return offsets
+
+
+def _objects(data):
+    # {object number: body between "N 0 obj" and "endobj"} for every live object
+    offsets = _xref_offsets(data)
+    ordered = sorted(offsets.values()) + [data.rindex(b"startxref")]
+    next_offset = dict(zip(ordered, ordered[1:]))
+    objects = {}
+    for num, offset in offsets.items():
+        chunk = data[offset:next_offset[offset]]
+        header = _OBJ_HEADER.match(chunk)
+        if header is None or int(header.group(1)) != num:
+            raise ValueError(f"Object {num} is not where the xref table says")
+        objects[num] = chunk[header.end():chunk.rindex(b"endobj")].strip()
+    return objects
+
+
+def _renumber(body, shift):
+    # Shift every "N 0 R" reference outside the stream data
+    match = _STREAM.search(body)
+    head, tail = (body, b"") if match is None else (body[:match.start()], body[match.start():])
+    return _REF.sub(lambda m: b"%d 0 R" % (int(m.group(1)) + shift), head) + tail
+
+
+def _ref(body, key):
+    match = re.search(rb"/" + key + rb"\s+(\d+)\s+0\s+R", body)
+    if match is None:
+        raise ValueError(f"No /{key.decode()} reference")
+    return int(match.group(1))
+
+
+# === Merging ===
+def merge_pdfs(documents):
+    """Concatenate PDF documents (bytes) into one, pages in the given order.
+
+    Each document's page tree is hung under a new root /Pages node, so pages,
+    resources and fonts are copied untouched. Only single-revision or
+    incrementally updated PDFs with classic xref tables are supported
+    (what matplotlib's PDF backend and this module write).
+    """
+    objects = {}  # new number -> body
+    page_roots = []
+    page_count = 0
+    next_num = 1
+    for data in documents:
+        source = _objects(data)
+        shift = next_num - min(source)
+        trailer = data[data.rindex(b"trailer"):]
+        catalog = _ref(trailer, b"Root")
+        pages = _ref(source[catalog], b"Pages")
+        for num, body in source.items():
+            if num != catalog:
+                objects[num + shift] = _renumber(body, shift)
+        page_roots.append(pages + shift)
+        page_count += int(re.search(rb"/Count\s+(\d+)", source[pages]).group(1))
+        next_num = max(source) + shift + 1
+
+    root_pages, catalog = next_num, next_num + 1
+    for num in page_roots:
+        objects[num] = objects[num].replace(b"<<", b"<< /Parent %d 0 R" % root_pages, 1)
+    kids = b" ".join(b"%d 0 R" % num for num in page_roots)
+    objects[root_pages] = b"<< /Type /Pages /Kids [ %s ] /Count %d >>" % (kids, page_count)
+    objects[catalog] = b"<< /Type /Catalog /Pages %d 0 R >>" % root_pages
+    return write_pdf(objects, catalog)
+
+
+# === Writing ===
+def write_pdf(objects, root):
+    # Serialize {number: body} with a classic xref table; missing numbers are marked free
+    out = bytearray(b"%PDF-1.4\n%\xac\xdc \xab\xba\n")
+    size = max(objects) + 1
+    offsets = [0] * size
+    for num in sorted(objects):
+        offsets[num] = len(out)
+        out += b"%d 0 obj\n%s\nendobj\n" % (num, objects[num])
+    xref = len(out)
+    out += b"xref\n0 %d\n" % size
+    out += b"".join(b"%010d 00000 n \n" % off if off else b"0000000000 65535 f \n" for off in offsets)
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (size, root, xref)
+    return bytes(out)
+
+
+# === Text and Table Pages ===
+def _pdf_string(text):
+    # Literal string in WinAnsi (cp1252); characters outside it become "?"
+    raw = str(text).encode("cp1252", errors="replace")
+    return b"(" + raw.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)") + b")"
+
+
+def _text(x, y, text, size, bold=False):
+    return b"BT /%s %.2f Tf %.2f %.2f Td %s Tj ET\n" % (b"F2" if bold else b"F1", size, x, y, _pdf_string(text))
+
+
+def _document(contents):
+    # One A5 page per content stream, sharing the two standard fonts
+    objects = {
+        1: b"<< /Type /Catalog /Pages 2 0 R >>",
+        3: b"<< /Type /Font /Subtype /Type1 /BaseFont /%s /Encoding /WinAnsiEncoding >>" % FONTS["F1"],
+        4: b"<< /Type /Font /Subtype /Type1 /BaseFont /%s /Encoding /WinAnsiEncoding >>" % FONTS["F2"],
+    }
+    kids = []
+    for i, content in enumerate(contents):
+        page, stream = 5 + 2 * i, 6 + 2 * i
+        objects[page] = (b"<< /Type /Page /Parent 2 0 R /MediaBox [ 0 0 %.2f %.2f ] "
+                         b"/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> /Contents %d 0 R >>"
+                         % (*A5_POINTS, stream))
+        objects[stream] = b"<< /Length %d >>\nstream\n%s\nendstream" % (len(content), content)
+        kids.append(b"%d 0 R" % page)
+    objects[2] = b"<< /Type /Pages /Kids [ %s ] /Count %d >>" % (b" ".join(kids), len(kids))
+    return write_pdf(objects, 1)
+
+
+def text_pdf(lines, top=0.2):
+    """Single A5 page of text lines (text, font_size, bold), wrapped to the page width.
+
+    top is the distance of the first line from the top edge, as a fraction of the page.
+    """
+    width, height = A5_POINTS
+    content = bytearray()
+    y = height * (1 - top)
+    for text, size, bold in lines:
+        # Helvetica averages about half an em per character
+        for line in textwrap.wrap(text, int((width - 2 * MARGIN) / (0.5 * size))) or [""]:
+            content += _text(MARGIN, y, line, size, bold)
+            y -= 1.4 * size
+        y -= 2 * size
+    return _document([bytes(content)])
+
+
+def table_pdf(title, headers, rows, col_widths, font_size=6, title_size=10, row_height=None):
+    """Bordered table on as many A5 pages as it needs, headers repeated on every page.
+
+    col_widths are fractions of the usable page width; cell text is clipped to its
+    column. Continuation pages are titled "<title> (cont.)".
+    """
+    width, height = A5_POINTS
+    row_height = row_height or 2 * font_size
+    table_width = width - 2 * MARGIN
+    edges = [MARGIN]
+    for frac in col_widths:
+        edges.append(edges[-1] + frac * table_width)
+    table_top = height - MARGIN - title_size * 1.8
+    per_page = max(1, int((table_top - MARGIN) // row_height) - 1)
+    rows = [[str(v) for v in row] for row in rows]
+
+    contents = []
+    for start in range(0, max(len(rows), 1), per_page):
+        page_rows = [list(map(str, headers))] + rows[start:start + per_page]
+        bottom = table_top - len(page_rows) * row_height
+        page_title = title if start == 0 else f"{title} (cont.)"
+        content = bytearray(_text(MARGIN, height - MARGIN - title_size, page_title, title_size, bold=True))
+
+        # Grid: one path for every border of the page
+        content += b"0.4 w 0 G\n"
+        for r in range(len(page_rows) + 1):
+            content += b"%.2f %.2f m %.2f %.2f l\n" % (edges[0], table_top - r * row_height, edges[-1], table_top - r * row_height)
+        for x in edges:
+            content += b"%.2f %.2f m %.2f %.2f l\n" % (x, table_top, x, bottom)
+        content += b"S\n"
+
+        # Cell text, one clipping rectangle per column
+        baseline = (row_height - 0.7 * font_size) / 2
+        for c, (left, right) in enumerate(zip(edges, edges[1:])):
+            content += b"q %.2f %.2f %.2f %.2f re W n\n" % (left, bottom, right - left, table_top - bottom)
+            for r, row in enumerate(page_rows):
+                if c < len(row) and row[c]:
+                    y = table_top - (r + 1) * row_height + baseline
+                    content += _text(left + 2, y, row[c], font_size, bold=(r == 0))
+            content += b"Q\n"
+        contents.append(bytes(content))
+    return _document(contents)
@@ -0,0 +1,202 @@
+# Headless generation of layout and soil-sample data files
+# Builds the same tables as allField.py and generate_gps_aligned_soil_samples.py, but only
+# NumPy/pandas are imported up front: matplotlib is imported when --render asks for a map,
+# so short batch processes do not pay for it.
+# Usage: python fieldgen.py layout [--seed N] [--balance] [--format layout csv geojson shp gpkg] [--render]
+#        python fieldgen.py samples [--seed N] [--anchor 40-06-54] [--stratify jitter|lhs] [--format csv geojson] [--render]
+
+import argparse
+import numpy as np
+import pandas as pd
+from field_model import DESIGN_BLOCKS, DESIGNS, Field
+from geojson_stream import write_plots, write_points
+from gis_export import ATTRIBUTES, write_geopackage, write_shapefile
+from geo_projection import FOOT, local_enu
+from gps_convert import dms_to_feet, format_dms, parse_dms
+from layout_store import write_layout
+from placement_optimizer import optimize_placement
+from randomization import assign_ab
+from soil_sampling import STRATIFIED_METHODS, poisson_disk_samples, stratified_samples
+
+LAYOUT_NAME = "combined_field_designs_1_to_4"
+SAMPLES_NAME = "optimized_soil_samples_gps_aligned_dms_decimal"
+
+# GPS reference of the soil-sample plan: longitude of the field's west edge (the anchor gives the latitude)
+ORIGIN_LON = -(88 + 14/60 + 50/3600)   # 88°14'50" W
+
+
+# === Layout ===
+def trial_layout(field=None, seed=None, balance=False, design_blocks=DESIGN_BLOCKS, designs=DESIGNS):
+    # (Plots, is_a) for the checkerboard trial, as allField.py builds it
+    field = field or Field()
+    geom = field.geometry()
+    block_designs = {block: designs[d] for d, blocks in design_blocks.items() for block in blocks}
+    labels, is_a = assign_ab(geom['Row'], geom['Col'], geom['Block'], block_designs, seed=seed)
+    if balance:
+        labels, _ = optimize_placement(geom['Row'], geom['Col'], geom['Block'], labels, is_a, seed=seed)
+    return field.plots(labels), is_a
+
+
+def render_layout(field, plots, is_a, path, design_blocks=DESIGN_BLOCKS, designs=DESIGNS):
+    # allField.py's map; matplotlib is only imported here
+    from matplotlib.figure import Figure
+    import matplotlib.patches as patches
+    from field_render import add_cells, add_labels
+
+    facecolors = np.full(len(plots), 'none', dtype=object)
+    for d, blocks in design_blocks.items():
+        in_design = np.isin(plots.data["block"], blocks)
+        facecolors[in_design] = np.where(is_a[in_design], designs[d]['A_COLOR'], designs[d]['B_COLOR'])
+
+    fig = Figure(figsize=(14, 12))
+    ax = fig.subplots()
+    ax.add_patch(patches.Rectangle((0, 0), field.width, field.height,
+                                   edgecolor='black', facecolor='lightgray', linewidth=1.5))
+    ax.add_patch(patches.Rectangle((field.border_thickness, field.border_thickness),
+                                   field.usable_width, field.usable_height, edgecolor='none', facecolor='white'))
+    for block in field.blocks():
+        ax.add_patch(patches.Rectangle((block.x, block.y), block.width, block.height,
+                                       edgecolor='black', facecolor='white', linewidth=1.5))
+        ax.text(block.x + block.width / 2, block.y + block.height / 2, block.name,
+                ha='center', va='center', fontsize=10, weight='bold')
+    add_cells(ax, plots.column("X_start"), plots.column("Y_start"), plots.width, plots.height, facecolors,
+              edgecolor='lightgray', linewidth=0.8)
+    add_labels(ax, plots.column("X"), plots.column("Y"), plots.column("Label"), fontsize=5.5, rotation=90,
+               cell_size=(plots.width, plots.height))
+    ax.set_xlim(-5, field.width + 10)
+    ax.set_ylim(0, field.height + 40)
+    ax.set_aspect('equal')
+    ax.set_title("Field Layout: Designs 1–4 Applied to Blocks B1–B4")
+    ax.axis('off')
+    fig.tight_layout()
+    fig.savefig(path)
+
+
+# === Soil Samples ===
+def gps_to_feet(gps_str):
+    feet = dms_to_feet(gps_str)
+    if np.isnan(feet):
+        raise ValueError("GPS input must be in 'xx-yy-zz' format")
+    return float(feet)
+
+
+def soil_samples(field=None, n_samples=100, min_distance=15, seed=None, anchor="40-06-54", stratify=None):
+    """Poisson-disk soil samples with GPS columns, as generate_gps_aligned_soil_samples.py writes them.
+
+    anchor is the DMS latitude of the field's lower-left corner (T0), at
+    ORIGIN_LON. Latitude/longitude come from the WGS84 tangent plane at that
+    corner; Y_ft is then shifted to the anchor's feet north of the equator.
+    stratify ("jitter" or "lhs") samples block by block instead, every block
+    getting its share by area, and adds a Block column (min_distance unused).
+    """
+    field = field or Field()
+    anchor_lat = float(parse_dms(anchor))
+    if np.isnan(anchor_lat):
+        raise ValueError("GPS input must be in 'xx-yy-zz' format")
+    if stratify is None:
+        points = poisson_disk_samples(field.width, field.height, min_distance, n_samples=n_samples, seed=seed)
+    else:
+        blocks = field.blocks()
+        x0, y0 = np.array([b.x for b in blocks]), np.array([b.y for b in blocks])
+        x1, y1 = x0 + np.array([b.width for b in blocks]), y0 + np.array([b.height for b in blocks])
+        points, stratum = stratified_samples(x0, y0, x1, y1, n_samples, stratify, seed)
+    df = pd.DataFrame({
+        "SampleID": [f"S{i+1:03}" for i in range(len(points))],
+        "X_ft": points[:, 0].round(2),
+        "Y_ft": points[:, 1].round(2)
+    })
+    if stratify is not None:
+        df.insert(1, "Block", [blocks[i].name for i in stratum])
+    decimal_lat, decimal_lon, _ = local_enu(anchor_lat, ORIGIN_LON).inverse(df["X_ft"].to_numpy() * FOOT,
+                                                                            df["Y_ft"].to_numpy() * FOOT)
+    df["Y_ft"] += gps_to_feet(anchor)
+    df["GPS_Latitude"] = format_dms(decimal_lat)
+    df["GPS_Longitude"] = format_dms(decimal_lon)
+    df["Decimal_Latitude"] = decimal_lat.round(6)
+    df["Decimal_Longitude"] = decimal_lon.round(6)
+    return df
+
+
+def render_samples(field, df, path):
+    # Sample map as in generate_gps_aligned_soil_samples.py; matplotlib is only imported here
+    from matplotlib.figure import Figure
+    import matplotlib.patches as patches
+
+    y0 = df['Y_ft'].min()
+    fig = Figure(figsize=(8, 12))
+    ax = fig.subplots()
+    ax.add_patch(patches.Rectangle((0, y0), field.width, field.height,
+                                   edgecolor='black', facecolor='lightgrey', lw=1))
+    ax.scatter(df['X_ft'], df['Y_ft'], c='red', s=30, edgecolors='black', label='Soil Samples')
+    for _, row in df.sample(min(10, len(df)), random_state=7).iterrows():
+        ax.text(row['X_ft'], row['Y_ft'], row['SampleID'], fontsize=6, ha='left', va='bottom')
+    ax.set_xlim(0, field.width)
+    ax.set_ylim(y0, y0 + field.height)
+    ax.set_title("Optimized Soil Sampling Map (GPS-Aligned)")
+    ax.set_xlabel("X (ft)")
+    ax.set_ylabel("Y (ft)")
+    ax.legend()
+    ax.grid(True)
+    fig.tight_layout()
+    fig.savefig(path, dpi=150)
+
+
+# === Output ===
+def write_layout_geojson(plots, path):
+    # One polygon per plot in field feet (not WGS84), streamed from the plot arrays
+    return write_plots(path, plots.column("X_start"), plots.column("Y_start"), plots.column("X_stop"),
+                       plots.column("Y_stop"), {name: plots.column(name) for name in ("Block", "Row", "Col", "Label")},
+                       decimals=2)
+
+
+def write_samples_geojson(df, path):
+    # One point per sample at (X_ft, Y_ft), every column as a property
+    return write_points(path, df["X_ft"], df["Y_ft"], {name: df[name].to_numpy() for name in df.columns})
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write layout or soil-sample data files without plotting.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_layout = sub.add_parser("layout", help="checkerboard trial layout (allField.py)")
+    p_layout.add_argument("--balance", action="store_true", help="anneal entry placement within blocks")
+    p_layout.add_argument("--format", nargs="+", default=["layout", "csv"], choices=["layout", "csv", "geojson", "shp", "gpkg"])
+    p_layout.add_argument("--out", default=LAYOUT_NAME, help=f"output path without extension (default: {LAYOUT_NAME})")
+    p_samples = sub.add_parser("samples", help="GPS-aligned soil samples (generate_gps_aligned_soil_samples.py)")
+    p_samples.add_argument("--anchor", default="40-06-54", help="DMS latitude of the T0 lower-left corner")
+    p_samples.add_argument("--n", type=int, default=100, help="number of samples (default: 100)")
+    p_samples.add_argument("--min-distance", type=float, default=15, help="minimum spacing in feet (default: 15)")
+    p_samples.add_argument("--stratify", choices=STRATIFIED_METHODS, default=None,
+                           help="sample each block in proportion to its area (jittered grid or Latin hypercube)")
+    p_samples.add_argument("--format", nargs="+", default=["csv"], choices=["csv", "geojson"])
+    p_samples.add_argument("--out", default=SAMPLES_NAME, help=f"output path without extension (default: {SAMPLES_NAME})")
+    for p in (p_layout, p_samples):
+        p.add_argument("--seed", type=int, default=None, help="seed for a reproducible result")
+        p.add_argument("--render", action="store_true", help="also save a PNG map (imports matplotlib)")
+    args = parser.parse_args()
+
+    field = Field()
+    if args.command == "layout":
+        plots, is_a = trial_layout(field, args.seed, args.balance)
+        if "layout" in args.format:
+            write_layout(plots.to_frame(), f"{args.out}.layout")
+        if "csv" in args.format:
+            plots.to_frame().to_csv(f"{args.out}.csv", index=False)
+        if "geojson" in args.format:
+            write_layout_geojson(plots, f"{args.out}.geojson")
+        extents = [plots.column(name) for name in ("X_start", "Y_start", "X_stop", "Y_stop")]
+        if "shp" in args.format:
+            write_shapefile(args.out, *extents, {name: plots.column(name) for name in ATTRIBUTES})
+        if "gpkg" in args.format:
+            write_geopackage(f"{args.out}.gpkg", *extents, {name: plots.column(name) for name in ATTRIBUTES})
+        if args.render:
+            render_layout(field, plots, is_a, f"{args.out}.png")
+    else:
+        df = soil_samples(field, args.n, args.min_distance, args.seed, args.anchor, args.stratify)
+        if "csv" in args.format:
+            df.to_csv(f"{args.out}.csv", index=False)
+        if "geojson" in args.format:
+            write_samples_geojson(df, f"{args.out}.geojson")
+        if args.render:
+            render_samples(field, df, f"{args.out}.png")
+    written = [f"{args.out}.{ext}" for ext in args.format] + ([f"{args.out}.png"] if args.render else [])
+    print(f"✅ Saved: {', '.join(written)}")
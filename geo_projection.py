@@ -0,0 +1,238 @@
+# Local map projections for field coordinates on the WGS84 ellipsoid
+# Geodetic latitude/longitude <-> a local east/north/up tangent plane (ENU) anchored at a
+# field corner, and <-> UTM (Krüger series to sixth order, zone picked from the points).
+# Transform parameters (the origin's ECEF position and rotation, the series coefficients
+# of a zone) are computed once and cached, so each call is a few NumPy passes over the
+# coordinate arrays, millions of points at a time, in either direction. Distances are in
+# metres; FOOT converts (feet * FOOT = metres).
+
+from functools import lru_cache
+import numpy as np
+
+A = 6378137.0  # WGS84 semi-major axis (m)
+F = 1 / 298.257223563  # WGS84 flattening
+B = A * (1 - F)
+E2 = F * (2 - F)  # first eccentricity squared
+EP2 = E2 / (1 - E2)  # second eccentricity squared
+FOOT = 0.3048  # metres per international foot
+
+UTM_K0 = 0.9996
+UTM_FALSE_EASTING = 500000.0
+UTM_FALSE_NORTHING_SOUTH = 10000000.0
+
+
+# === Geodetic <-> ECEF ===
+def geodetic_to_ecef(lat, lon, h=0.0):
+    # Earth-centred, earth-fixed X/Y/Z (m) of latitude/longitude (degrees) and ellipsoidal height (m)
+    phi, lam = np.radians(lat), np.radians(lon)
+    sin_phi, cos_phi = np.sin(phi), np.cos(phi)
+    n = A / np.sqrt(1 - E2 * sin_phi ** 2)
+    return (n + h) * cos_phi * np.cos(lam), (n + h) * cos_phi * np.sin(lam), (n * (1 - E2) + h) * sin_phi
+
+
+def ecef_to_geodetic(x, y, z):
+    """Latitude/longitude (degrees) and height (m) of ECEF X/Y/Z, closed form (Heikkinen).
+
+    Exact to well under a millimetre anywhere outside the earth's central 40 km.
+    """
+    x, y, z = (np.asarray(v, dtype=np.float64) for v in (x, y, z))
+    p2 = x * x + y * y
+    p = np.sqrt(p2)
+    zz = z * z
+    f = 54 * B * B * zz
+    g = p2 + (1 - E2) * zz - E2 * (A * A - B * B)
+    c = E2 * E2 * f * p2 / g ** 3
+    s = np.cbrt(1 + c + np.sqrt(c * c + 2 * c))
+    k = s + 1 + 1 / s
+    pp = f / (3 * k * k * g * g)
+    q = np.sqrt(1 + 2 * E2 * E2 * pp)
+    r0 = -pp * E2 * p / (1 + q) + np.sqrt(
+        np.maximum(A * A / 2 * (1 + 1 / q) - pp * (1 - E2) * zz / (q * (1 + q)) - pp * p2 / 2, 0))
+    u = np.sqrt((p - E2 * r0) ** 2 + zz)
+    v = np.sqrt((p - E2 * r0) ** 2 + (1 - E2) * zz)
+    z0 = B * B * z / (A * v)
+    h = u * (1 - B * B / (A * v))
+    lat = np.degrees(np.arctan((z + EP2 * z0) / p))
+    return lat, np.degrees(np.arctan2(y, x)), h
+
+
+# === Local Tangent Plane (ENU) ===
+class LocalENU:
+    """East/north/up (m) tangent plane at a WGS84 origin; forward() and inverse() take arrays.
+
+    The origin's ECEF position and the ECEF -> ENU rotation are computed once
+    per instance (see local_enu() for a cached instance per origin).
+    """
+
+    __slots__ = ("lat0", "lon0", "h0", "origin", "rotation")
+
+    def __init__(self, lat0, lon0, h0=0.0):
+        self.lat0, self.lon0, self.h0 = float(lat0), float(lon0), float(h0)
+        self.origin = np.array(geodetic_to_ecef(self.lat0, self.lon0, self.h0))
+        phi, lam = np.radians(self.lat0), np.radians(self.lon0)
+        sp, cp, sl, cl = np.sin(phi), np.cos(phi), np.sin(lam), np.cos(lam)
+        # Rows: east, north, up unit vectors in ECEF
+        self.rotation = np.array([[-sl, cl, 0.0], [-sp * cl, -sp * sl, cp], [cp * cl, cp * sl, sp]])
+
+    def forward(self, lat, lon, h=0.0):
+        # Latitude/longitude (degrees), height (m) -> east, north, up (m)
+        x, y, z = geodetic_to_ecef(lat, lon, h)
+        r = self.rotation
+        dx, dy, dz = x - self.origin[0], y - self.origin[1], z - self.origin[2]
+        return (r[0, 0] * dx + r[0, 1] * dy,
+                r[1, 0] * dx + r[1, 1] * dy + r[1, 2] * dz,
+                r[2, 0] * dx + r[2, 1] * dy + r[2, 2] * dz)
+
+    def inverse(self, east, north, up=0.0):
+        # East, north, up (m) -> latitude/longitude (degrees), height (m)
+        r = self.rotation
+        x = self.origin[0] + r[0, 0] * east + r[1, 0] * north + r[2, 0] * up
+        y = self.origin[1] + r[0, 1] * east + r[1, 1] * north + r[2, 1] * up
+        z = self.origin[2] + r[1, 2] * north + r[2, 2] * up
+        return ecef_to_geodetic(x, y, z)
+
+
+@lru_cache(maxsize=64)
+def local_enu(lat0, lon0, h0=0.0):
+    # LocalENU per origin, built once
+    return LocalENU(lat0, lon0, h0)
+
+
+# === UTM ===
+def utm_zone(lat, lon):
+    """UTM zone numbers (1-60) of latitude/longitude arrays, with the Norway and Svalbard exceptions."""
+    lat, lon = np.asarray(lat, dtype=np.float64), np.asarray(lon, dtype=np.float64)
+    lon = (lon + 180) % 360 - 180
+    zone = np.floor((lon + 180) / 6).astype(np.int64) % 60 + 1
+    zone = np.where((lat >= 56) & (lat < 64) & (lon >= 3) & (lon < 12), 32, zone)
+    svalbard = (lat >= 72) & (lat < 84) & (lon >= 0) & (lon < 42)
+    return np.where(svalbard, np.clip((np.floor((lon + 3) / 12) * 2 + 31).astype(np.int64), 31, 37), zone)
+
+
+def _series(n):
+    # Krüger series coefficients (Karney 2011, to n^6): rectifying radius, alpha, beta, delta
+    n2, n3, n4, n5, n6 = n ** 2, n ** 3, n ** 4, n ** 5, n ** 6
+    radius = A / (1 + n) * (1 + n2 / 4 + n4 / 64 + n6 / 256)
+    alpha = np.array([
+        n / 2 - 2 * n2 / 3 + 5 * n3 / 16 + 41 * n4 / 180 - 127 * n5 / 288 + 7891 * n6 / 37800,
+        13 * n2 / 48 - 3 * n3 / 5 + 557 * n4 / 1440 + 281 * n5 / 630 - 1983433 * n6 / 1935360,
+        61 * n3 / 240 - 103 * n4 / 140 + 15061 * n5 / 26880 + 167603 * n6 / 181440,
+        49561 * n4 / 161280 - 179 * n5 / 168 + 6601661 * n6 / 7257600,
+        34729 * n5 / 80640 - 3418889 * n6 / 1995840,
+        212378941 * n6 / 319334400])
+    beta = np.array([
+        n / 2 - 2 * n2 / 3 + 37 * n3 / 96 - n4 / 360 - 81 * n5 / 512 + 96199 * n6 / 604800,
+        n2 / 48 + n3 / 15 - 437 * n4 / 1440 + 46 * n5 / 105 - 1118711 * n6 / 3870720,
+        17 * n3 / 480 - 37 * n4 / 840 - 209 * n5 / 4480 + 5569 * n6 / 90720,
+        4397 * n4 / 161280 - 11 * n5 / 504 - 830251 * n6 / 7257600,
+        4583 * n5 / 161280 - 108847 * n6 / 3991680,
+        20648693 * n6 / 638668800])
+    delta = np.array([
+        2 * n - 2 * n2 / 3 - 2 * n3 + 116 * n4 / 45 + 26 * n5 / 45 - 2854 * n6 / 675,
+        7 * n2 / 3 - 8 * n3 / 5 - 227 * n4 / 45 + 2704 * n5 / 315 + 2323 * n6 / 945,
+        56 * n3 / 15 - 136 * n4 / 35 - 1262 * n5 / 105 + 73814 * n6 / 2835,
+        4279 * n4 / 630 - 332 * n5 / 35 - 399572 * n6 / 14175,
+        4174 * n5 / 315 - 144838 * n6 / 6237,
+        601676 * n6 / 22275])
+    return radius, alpha, beta, delta
+
+
+_N = F / (2 - F)  # third flattening
+_RADIUS, _ALPHA, _BETA, _DELTA = _series(_N)
+_CONFORMAL = 2 * np.sqrt(_N) / (1 + _N)
+
+
+def _harmonics(xi, eta, coefficients):
+    # sum_j c_j sin(2j xi) cosh(2j eta) and sum_j c_j cos(2j xi) sinh(2j eta), by angle-addition recurrences
+    s2, c2 = np.sin(2 * xi), np.cos(2 * xi)
+    sh2, ch2 = np.sinh(2 * eta), np.cosh(2 * eta)
+    s, c, sh, ch = s2, c2, sh2, ch2
+    d_xi = np.zeros_like(s2)
+    d_eta = np.zeros_like(s2)
+    for j, coefficient in enumerate(coefficients):
+        if j:
+            s, c = s * c2 + c * s2, c * c2 - s * s2
+            sh, ch = sh * ch2 + ch * sh2, ch * ch2 + sh * sh2
+        d_xi += coefficient * s * ch
+        d_eta += coefficient * c * sh
+    return d_xi, d_eta
+
+
+class UTM:
+    """Transverse Mercator for one UTM zone; forward() and inverse() take arrays of any size.
+
+    The sixth-order series is accurate to nanometres within the zone and stays
+    sub-millimetre far beyond it. See utm() for a cached instance per zone.
+    """
+
+    __slots__ = ("zone", "south", "lon0", "false_northing")
+
+    def __init__(self, zone, south=False):
+        if not 1 <= int(zone) <= 60:
+            raise ValueError(f"UTM zone must be between 1 and 60, got {zone}")
+        self.zone, self.south = int(zone), bool(south)
+        self.lon0 = 6.0 * self.zone - 183.0
+        self.false_northing = UTM_FALSE_NORTHING_SOUTH if self.south else 0.0
+
+    @classmethod
+    def for_points(cls, lat, lon):
+        # Zone and hemisphere of the points' centroid (a field, a site)
+        lat_c, lon_c = float(np.mean(lat)), float(np.mean(lon))
+        return utm(int(utm_zone(lat_c, lon_c)), lat_c < 0)
+
+    @property
+    def epsg(self):
+        return (32700 if self.south else 32600) + self.zone
+
+    def forward(self, lat, lon):
+        # Latitude/longitude (degrees) -> easting, northing (m)
+        phi = np.radians(lat)
+        lam = np.radians((np.asarray(lon, dtype=np.float64) - self.lon0 + 180) % 360 - 180)
+        sin_phi = np.sin(phi)
+        t = np.sinh(np.arctanh(sin_phi) - _CONFORMAL * np.arctanh(_CONFORMAL * sin_phi))
+        xi = np.arctan2(t, np.cos(lam))
+        eta = np.arctanh(np.sin(lam) / np.sqrt(1 + t * t))
+        d_xi, d_eta = _harmonics(xi, eta, _ALPHA)
+        scale = UTM_K0 * _RADIUS
+        return UTM_FALSE_EASTING + scale * (eta + d_eta), self.false_northing + scale * (xi + d_xi)
+
+    def inverse(self, easting, northing):
+        # Easting, northing (m) -> latitude/longitude (degrees)
+        scale = UTM_K0 * _RADIUS
+        xi = (np.asarray(northing, dtype=np.float64) - self.false_northing) / scale
+        eta = (np.asarray(easting, dtype=np.float64) - UTM_FALSE_EASTING) / scale
+        d_xi, d_eta = _harmonics(xi, eta, _BETA)
+        xi, eta = xi - d_xi, eta - d_eta
+        chi = np.arcsin(np.sin(xi) / np.cosh(eta))
+        d_chi, _ = _harmonics(chi, np.zeros_like(chi), _DELTA)  # conformal -> geodetic latitude
+        lat = np.degrees(chi + d_chi)
+        lon = self.lon0 + np.degrees(np.arctan2(np.sinh(eta), np.cos(xi)))
+        return lat, lon
+
+
+@lru_cache(maxsize=120)
+def utm(zone, south=False):
+    # UTM per zone and hemisphere, built once
+    return UTM(zone, south)
+
+
+# === Local Scale ===
+def meridian_distance(lat):
+    # Distance (m) along the meridian from the equator to latitude lat (degrees): UTM northing / k0
+    sin_phi = np.sin(np.radians(lat))
+    xi = np.arctan(np.sinh(np.arctanh(sin_phi) - _CONFORMAL * np.arctanh(_CONFORMAL * sin_phi)))
+    d_xi, _ = _harmonics(xi, np.zeros_like(xi), _ALPHA)
+    return _RADIUS * (xi + d_xi)
+
+
+def feet_per_degree(lat):
+    """Feet per degree of latitude and of longitude at latitude lat (degrees), on WGS84.
+
+    A flat 288200 ft per degree of longitude is 3% long at 40 deg N and 19% at
+    48.6 deg N; these follow the ellipsoid's meridian and parallel radii.
+    """
+    phi = np.radians(lat)
+    w2 = 1 - E2 * np.sin(phi) ** 2
+    meridian = A * (1 - E2) / w2 ** 1.5  # meridian radius of curvature
+    parallel = A / np.sqrt(w2) * np.cos(phi)  # radius of the parallel
+    return np.radians(1) * meridian / FOOT, np.radians(1) * parallel / FOOT
@@ -0,0 +1,258 @@
+# Streaming GeoJSON FeatureCollections
+# Reads features one at a time from a buffered text stream (or as DataFrame chunks), and
+# writes plot polygons and sample points straight from column arrays, a chunk at a
+# time, so memory stays flat however many features a file holds. Pretty-printed files
+# (GDAL/QGIS exports such as data/interpolated_plot_positions.geojson) read the same
+# as compact ones.
+
+import json
+import math
+import numpy as np
+import pandas as pd
+
+READ_SIZE = 1 << 20  # characters per read
+CHUNK_SIZE = 65536  # features per write batch
+FRAME_ROWS = 16384  # features per DataFrame chunk
+_WHITESPACE = " \t\n\r"
+
+
+# === Reading ===
+class _Stream:
+    # Text buffer over a file that refills on demand and drops what has been consumed
+    def __init__(self, f, read_size=READ_SIZE):
+        self.f, self.read_size = f, read_size
+        self.text, self.pos, self.eof = "", 0, False
+
+    def _fill(self):
+        data = self.f.read(self.read_size)
+        if not data:
+            self.eof = True
+            return False
+        self.text = self.text[self.pos:] + data
+        self.pos = 0
+        return True
+
+    def peek(self):
+        # Next non-whitespace character ("" at end of file)
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.text) or not self._fill():
+                return self.text[self.pos:self.pos + 1]
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f"Expected {char!r} at {self.text[self.pos:self.pos + 20]!r}")
+        self.pos += 1
+
+    def value(self, decoder=json.JSONDecoder()):
+        # Next JSON value; read more until it is complete (a value cut off by the buffer end does not count)
+        self.peek()
+        while True:
+            try:
+                value, end = decoder.raw_decode(self.text, self.pos)
+                if end < len(self.text) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self._fill()  # at end of file: decode once more, raising if the file is truncated
+
+
+def iter_features(path, read_size=READ_SIZE):
+    """Features of a FeatureCollection file as dicts, one at a time.
+
+    Only the current read buffer and feature are held in memory; other
+    top-level members (crs, name, ...) are skipped.
+    """
+    with open(path, encoding="utf-8") as f:
+        stream = _Stream(f, read_size)
+        stream.expect("{")
+        while stream.peek() != "}":
+            key = stream.value()
+            stream.expect(":")
+            if key != "features":
+                stream.value()
+            else:
+                stream.expect("[")
+                while stream.peek() != "]":
+                    yield stream.value()
+                    if stream.peek() == ",":
+                        stream.pos += 1
+                stream.expect("]")
+            if stream.peek() == ",":
+                stream.pos += 1
+
+
+def _geometry_columns(geometries):
+    # X/Y for points; X_start/X_stop/Y_start/Y_stop bounding boxes (the layout CSV columns) otherwise
+    if all(g is not None and g["type"] == "Point" for g in geometries):
+        xy = np.array([g["coordinates"][:2] for g in geometries], dtype=float).reshape(-1, 2)
+        return {"X": xy[:, 0], "Y": xy[:, 1]}
+    bounds = []
+    for g in geometries:
+        if g is None:
+            bounds.append((np.nan,) * 4)
+            continue
+        if g["type"] == "Polygon":
+            # The exterior ring bounds a polygon
+            ring = g["coordinates"][0]
+            xs, ys = [p[0] for p in ring], [p[1] for p in ring]
+        else:
+            flat = _flatten(g["coordinates"])
+            xs, ys = flat[0::2], flat[1::2]
+        bounds.append((min(xs), max(xs), min(ys), max(ys)))
+    return dict(zip(["X_start", "X_stop", "Y_start", "Y_stop"], np.array(bounds, dtype=float).reshape(-1, 4).T))
+
+
+def _flatten(coordinates):
+    # Nested coordinate arrays -> flat [x, y, x, y, ...] (drops z)
+    if coordinates and isinstance(coordinates[0], (int, float)):
+        return coordinates[:2]
+    return [v for part in coordinates for v in _flatten(part)]
+
+
+def read_frames(path, chunk_size=FRAME_ROWS, properties=None):
+    """DataFrame chunks of up to chunk_size features: geometry columns, then properties.
+
+    properties limits the property columns read (default: all). Points give X/Y,
+    other geometries their bounding box as X_start/X_stop/Y_start/Y_stop.
+    """
+    records, geometries = [], []
+    for feature in iter_features(path):
+        props = feature.get("properties") or {}
+        records.append(props if properties is None else {k: props.get(k) for k in properties})
+        geometries.append(feature.get("geometry"))
+        if len(records) == chunk_size:
+            yield _frame(records, geometries)
+            records, geometries = [], []
+    if records:
+        yield _frame(records, geometries)
+
+
+def _frame(records, geometries):
+    df = pd.DataFrame.from_records(records)
+    for i, (name, values) in enumerate(_geometry_columns(geometries).items()):
+        df.insert(i, name, values)
+    return df
+
+
+def read_frame(path, properties=None):
+    # Whole file as one DataFrame, built chunk by chunk
+    return pd.concat(read_frames(path, properties=properties), ignore_index=True)
+
+
+# === Writing ===
+def _encoder(values):
+    # Column -> list of JSON texts; repeated strings (labels, block names) are encoded once
+    values = np.asarray(values)
+    if values.dtype.kind in "iub":
+        return lambda chunk: [str(v).lower() if isinstance(v, bool) else str(v) for v in chunk.tolist()]
+    if values.dtype.kind == "f":
+        return lambda chunk: [repr(v) if math.isfinite(v) else "null" for v in chunk.tolist()]
+    cache = {}
+
+    def encode(chunk):
+        out = []
+        for v in chunk.tolist():
+            text = cache.get(v)
+            if text is None:
+                text = cache[v] = "null" if isinstance(v, float) and not math.isfinite(v) else json.dumps(v)
+            out.append(text)
+        return out
+    return encode
+
+
+def _coordinate(values, decimals):
+    # JSON has no NaN/Infinity, so a coordinate that is not finite cannot be written
+    values = np.asarray(values, dtype=float)
+    bad = np.flatnonzero(~np.isfinite(values))
+    if len(bad):
+        raise ValueError(f"Coordinates must be finite: {len(bad)} are not (first at row {bad[0]})")
+    if decimals is not None:
+        values = values.round(decimals)
+    return values
+
+
+class FeatureWriter:
+    """Incremental FeatureCollection writer: open, write feature text in batches, close.
+
+    Used as a context manager; write_plots/write_points below cover the usual cases.
+    """
+
+    def __init__(self, path, crs=None, name=None):
+        self.f = open(path, "w", encoding="utf-8")
+        self.count = 0
+        header = {"type": "FeatureCollection"}
+        if name is not None:
+            header["name"] = name
+        if crs is not None:
+            header["crs"] = {"type": "name", "properties": {"name": crs}}
+        self.f.write(json.dumps(header)[:-1] + ', "features": [\n')
+
+    def write(self, features):
+        # Feature dicts (or pre-encoded feature JSON strings)
+        texts = [f if isinstance(f, str) else json.dumps(f) for f in features]
+        if texts:
+            self.f.write((",\n" if self.count else "") + ",\n".join(texts))
+            self.count += len(texts)
+
+    def close(self):
+        self.f.write("\n]}\n")
+        self.f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _properties(properties, start, stop):
+    # '"name": value, ...' texts of rows start:stop
+    columns = [[key + t for t in encode(values[start:stop])] for key, (values, encode) in properties.items()]
+    return [", ".join(row) for row in zip(*columns)] if columns else [""] * (stop - start)
+
+
+def _prepare(properties):
+    return {json.dumps(str(name)) + ": ": (np.asarray(values), _encoder(values))
+            for name, values in (properties or {}).items()}
+
+
+def write_plots(path, x_start, y_start, x_stop, y_stop, properties=None, crs=None, decimals=None,
+                chunk_size=CHUNK_SIZE):
+    """Rectangle polygons (counter-clockwise rings) with per-plot properties columns; returns the count.
+
+    Raises ValueError if any extent is NaN or infinite.
+    """
+    x0, y0, x1, y1 = (_coordinate(v, decimals) for v in (x_start, y_start, x_stop, y_stop))
+    properties = _prepare(properties)
+    with FeatureWriter(path, crs) as writer:
+        for start in range(0, len(x0), chunk_size):
+            stop = min(start + chunk_size, len(x0))
+            a, b, c, d = (v[start:stop].tolist() for v in (x0, y0, x1, y1))
+            writer.write([
+                '{"type": "Feature", "geometry": {"type": "Polygon", "coordinates": '
+                f'[[[{xa!r}, {ya!r}], [{xb!r}, {ya!r}], [{xb!r}, {yb!r}], [{xa!r}, {yb!r}], [{xa!r}, {ya!r}]]]}}, '
+                f'"properties": {{{props}}}}}'
+                for xa, ya, xb, yb, props in zip(a, b, c, d, _properties(properties, start, stop))])
+        return writer.count
+
+
+def write_points(path, x, y, properties=None, crs=None, decimals=None, chunk_size=CHUNK_SIZE):
+    """Point features with per-point properties columns; returns the count.
+
+    Raises ValueError if any x or y is NaN or infinite.
+    """
+    x, y = _coordinate(x, decimals), _coordinate(y, decimals)
+    properties = _prepare(properties)
+    with FeatureWriter(path, crs) as writer:
+        for start in range(0, len(x), chunk_size):
+            stop = min(start + chunk_size, len(x))
+            writer.write([
+                f'{{"type": "Feature", "geometry": {{"type": "Point", "coordinates": [{px!r}, {py!r}]}}, '
+                f'"properties": {{{props}}}}}'
+                for px, py, props in zip(x[start:stop].tolist(), y[start:stop].tolist(),
+                                         _properties(properties, start, stop))])
+        return writer.count
@@ -0,0 +1,400 @@
+# Bulk Shapefile and GeoPackage export of plot rectangles
+# Every plot becomes a rectangle polygon built from its X_start/X_stop/Y_start/Y_stop
+# extents. Records are packed for all plots at once as NumPy structured arrays (the
+# fixed-size binary layouts of .shp/.shx/.dbf and GeoPackage geometry blobs) instead
+# of one GIS-library feature object per plot. The GeoPackage gets the standard R-tree
+# spatial index, packed in one pass and written straight into SQLite's R-tree tables.
+# Usage: python gis_export.py combined_field_designs_1_to_4.layout plots [--format shp gpkg] [--cell-size W H]
+
+import argparse
+import datetime
+import os
+import sqlite3
+import time
+import numpy as np
+from layout_engine import centre_spacing
+from layout_store import read_any
+
+FORMATS = ("shp", "gpkg")
+ATTRIBUTES = ["Block", "Row", "Col", "Label"]
+
+# WGS84 as in data/corrected_merged_soil_plots.prj (for layouts in decimal degrees)
+WGS84_WKT = ('GEOGCS["GCS_WGS_1984",DATUM["D_WGS_1984",SPHEROID["WGS_1984",6378137.0,298.257223563]],'
+             'PRIMEM["Greenwich",0.0],UNIT["Degree",0.0174532925199433]]')
+
+
+def _rings(x0, y0, x1, y1, clockwise):
+    # (N, 5, 2) closed rectangle rings from the lower left corner
+    if clockwise:
+        xs, ys = (x0, x0, x1, x1, x0), (y0, y1, y1, y0, y0)
+    else:
+        xs, ys = (x0, x1, x1, x0, x0), (y0, y0, y1, y1, y0)
+    return np.stack([np.stack(xs, axis=1), np.stack(ys, axis=1)], axis=2)
+
+
+def _extents(x_start, y_start, x_stop, y_stop):
+    x0, y0, x1, y1 = (np.asarray(v, dtype=np.float64) for v in (x_start, y_start, x_stop, y_stop))
+    return np.minimum(x0, x1), np.minimum(y0, y1), np.maximum(x0, x1), np.maximum(y0, y1)
+
+
+# === Shapefile ===
+SHP_POLYGON = 5
+SHP_RECORD = np.dtype([("number", ">i4"), ("length", ">i4"), ("shape_type", "<i4"), ("box", "<f8", (4,)),
+                       ("num_parts", "<i4"), ("num_points", "<i4"), ("part", "<i4"), ("points", "<f8", (5, 2))])
+SHX_RECORD = np.dtype([("offset", ">i4"), ("length", ">i4")])
+SHP_HEADER_BYTES = 100
+DBF_MAX_WIDTH = 254
+
+
+def _shp_header(file_bytes, bbox):
+    header = np.zeros(1, dtype=[("code", ">i4"), ("unused", ">i4", (5,)), ("length", ">i4"), ("version", "<i4"),
+                                ("shape_type", "<i4"), ("box", "<f8", (8,))])
+    header["code"], header["length"], header["version"] = 9994, file_bytes // 2, 1000
+    header["shape_type"] = SHP_POLYGON
+    header["box"][0, :4] = bbox
+    return header.tobytes()
+
+
+def _dbf_field_names(names):
+    # dBase names: at most 10 bytes, unique (truncated clashes get _1, _2, ... as GDAL does)
+    out = []
+    for name in names:
+        short = str(name)[:10]
+        n = 1
+        while short in out:
+            suffix = f"_{n}"
+            short = str(name)[:10 - len(suffix)] + suffix
+            n += 1
+        out.append(short)
+    return out
+
+
+def _dbf_decimals(values):
+    # 15 decimals, more for tiny values (15 significant digits) and fewer if the integer part needs
+    # the room, so every value fits a DBF_MAX_WIDTH field; ValueError if an integer part alone cannot
+    finite = np.abs(values[np.isfinite(values)])
+    if not finite.size:
+        return 0
+    integer_width = len(b"%.0f" % finite.max()) + bool((values < 0).any())
+    if integer_width + 2 > DBF_MAX_WIDTH:
+        raise ValueError(f"Float attribute {finite.max():g} is too large for a {DBF_MAX_WIDTH}-byte dBase field")
+    smallest = finite[finite > 0].min(initial=1.0)
+    wanted = max(15, 14 - int(np.floor(np.log10(smallest))))
+    return min(wanted, DBF_MAX_WIDTH - integer_width - 1)
+
+
+def _dbf_column(values):
+    # (type, width, decimals, fixed-width bytes array) of one attribute column
+    values = np.asarray(values)
+    if values.dtype.kind in "iub":
+        text = values.astype(np.int64).astype("S")
+        width = max(int(np.char.str_len(text).max(initial=1)), 1)
+        return "N", width, 0, np.char.rjust(text, width)
+    if values.dtype.kind == "f":
+        decimals = _dbf_decimals(values)
+        text = np.char.mod(f"%.{decimals}f".encode(), values)
+        text[~np.isfinite(values)] = b""
+        width = max(int(np.char.str_len(text).max(initial=1)), 1)
+        return "N", width, decimals, np.char.rjust(text, width)
+    # Text: encode each distinct value once, pad to the longest (dBase C fields hold <= DBF_MAX_WIDTH bytes)
+    unique, inverse = np.unique(values.astype(str), return_inverse=True)
+    encoded = [u.encode("utf-8")[:DBF_MAX_WIDTH] for u in unique]
+    width = max(max(map(len, encoded), default=1), 1)
+    return "C", width, 0, np.array([e.ljust(width) for e in encoded], dtype=f"S{width}")[inverse]
+
+
+def write_dbf(path, attributes, n_records):
+    columns = [(name, *_dbf_column(values)) for name, values in zip(_dbf_field_names(attributes),
+                                                                     attributes.values())]
+    record = np.dtype([("deleted", "S1")] + [(f"f{i}", f"S{c[2]}") for i, c in enumerate(columns)])
+    header_bytes = 32 + 32 * len(columns) + 1
+    today = datetime.date.today()
+
+    header = bytearray(32)
+    header[0] = 3
+    header[1:4] = bytes([today.year - 1900, today.month, today.day])
+    header[4:8] = n_records.to_bytes(4, "little")
+    header[8:10] = header_bytes.to_bytes(2, "little")
+    header[10:12] = record.itemsize.to_bytes(2, "little")
+    for name, kind, width, decimals, _ in columns:
+        field = bytearray(32)
+        field[:len(name.encode()[:10])] = name.encode()[:10]
+        field[11] = ord(kind)
+        field[16], field[17] = width, decimals
+        header += field
+    header += b"\r"
+
+    records = np.empty(n_records, dtype=record)
+    records["deleted"] = b" "
+    for i, column in enumerate(columns):
+        records[f"f{i}"] = column[4]
+    with open(path, "wb") as f:
+        f.write(header)
+        f.write(records.tobytes())
+        f.write(b"\x1a")
+
+
+def write_shapefile(path, x_start, y_start, x_stop, y_stop, attributes=None, prj=None):
+    """Plot rectangles as a Polygon shapefile: path.shp/.shx/.dbf/.cpg (+ .prj with WKT prj).
+
+    attributes maps column names to per-plot arrays (ints/floats as N fields,
+    anything else as UTF-8 C fields). Returns the list of files written.
+    """
+    base = os.path.splitext(path)[0]
+    x0, y0, x1, y1 = _extents(x_start, y_start, x_stop, y_stop)
+    n = len(x0)
+    bbox = (x0.min(), y0.min(), x1.max(), y1.max()) if n else (0.0, 0.0, 0.0, 0.0)
+    content_bytes = SHP_RECORD.itemsize - 8
+
+    records = np.empty(n, dtype=SHP_RECORD)
+    records["number"] = np.arange(1, n + 1)
+    records["length"] = content_bytes // 2
+    records["shape_type"] = SHP_POLYGON
+    records["box"] = np.column_stack([x0, y0, x1, y1])
+    records["num_parts"], records["num_points"], records["part"] = 1, 5, 0
+    records["points"] = _rings(x0, y0, x1, y1, clockwise=True)  # outer rings run clockwise in shapefiles
+    with open(base + ".shp", "wb") as f:
+        f.write(_shp_header(SHP_HEADER_BYTES + records.nbytes, bbox))
+        f.write(records.tobytes())
+
+    index = np.empty(n, dtype=SHX_RECORD)
+    index["offset"] = (SHP_HEADER_BYTES + np.arange(n) * SHP_RECORD.itemsize) // 2
+    index["length"] = content_bytes // 2
+    with open(base + ".shx", "wb") as f:
+        f.write(_shp_header(SHP_HEADER_BYTES + index.nbytes, bbox))
+        f.write(index.tobytes())
+
+    write_dbf(base + ".dbf", attributes or {}, n)
+    with open(base + ".cpg", "w") as f:
+        f.write("UTF-8")
+    written = [base + ext for ext in (".shp", ".shx", ".dbf", ".cpg")]
+    if prj:
+        with open(base + ".prj", "w") as f:
+            f.write(prj)
+        written.append(base + ".prj")
+    return written
+
+
+# === GeoPackage ===
+# Geometry blob: GeoPackage header (magic, version, flags, srs_id, xy envelope) + little-endian WKB polygon
+GPKG_GEOMETRY = np.dtype([("magic", "S2"), ("version", "u1"), ("flags", "u1"), ("srs_id", "<i4"),
+                          ("envelope", "<f8", (4,)), ("byte_order", "u1"), ("wkb_type", "<u4"),
+                          ("num_rings", "<u4"), ("num_points", "<u4"), ("points", "<f8", (5, 2))])
+GPKG_FLAGS = 0b0000_0011  # little endian, envelope [minx, maxx, miny, maxy]
+WKB_POLYGON = 3
+SPATIAL_REF_SYS = [
+    ("Undefined cartesian SRS", -1, "NONE", -1, "undefined", "undefined cartesian coordinate reference system"),
+    ("Undefined geographic SRS", 0, "NONE", 0, "undefined", "undefined geographic coordinate reference system"),
+    ("WGS 84 geodetic", 4326, "EPSG", 4326, WGS84_WKT, "longitude/latitude coordinates in decimal degrees on the WGS 84 spheroid"),
+]
+SQL_TYPES = {"i": "INTEGER", "u": "INTEGER", "b": "BOOLEAN", "f": "DOUBLE"}
+
+RTREE_TRIGGERS = """
+CREATE TRIGGER "rtree_{t}_geom_insert" AFTER INSERT ON "{t}" WHEN (new.geom NOT NULL AND NOT ST_IsEmpty(NEW.geom))
+BEGIN INSERT OR REPLACE INTO "rtree_{t}_geom" VALUES (NEW.fid, ST_MinX(NEW.geom), ST_MaxX(NEW.geom), ST_MinY(NEW.geom), ST_MaxY(NEW.geom)); END;
+CREATE TRIGGER "rtree_{t}_geom_update1" AFTER UPDATE OF geom ON "{t}" WHEN OLD.fid = NEW.fid AND (NEW.geom NOTNULL AND NOT ST_IsEmpty(NEW.geom))
+BEGIN INSERT OR REPLACE INTO "rtree_{t}_geom" VALUES (NEW.fid, ST_MinX(NEW.geom), ST_MaxX(NEW.geom), ST_MinY(NEW.geom), ST_MaxY(NEW.geom)); END;
+CREATE TRIGGER "rtree_{t}_geom_update2" AFTER UPDATE OF geom ON "{t}" WHEN OLD.fid = NEW.fid AND (NEW.geom ISNULL OR ST_IsEmpty(NEW.geom))
+BEGIN DELETE FROM "rtree_{t}_geom" WHERE id = OLD.fid; END;
+CREATE TRIGGER "rtree_{t}_geom_update3" AFTER UPDATE ON "{t}" WHEN OLD.fid != NEW.fid AND (NEW.geom NOTNULL AND NOT ST_IsEmpty(NEW.geom))
+BEGIN DELETE FROM "rtree_{t}_geom" WHERE id = OLD.fid; INSERT OR REPLACE INTO "rtree_{t}_geom" VALUES (NEW.fid, ST_MinX(NEW.geom), ST_MaxX(NEW.geom), ST_MinY(NEW.geom), ST_MaxY(NEW.geom)); END;
+CREATE TRIGGER "rtree_{t}_geom_update4" AFTER UPDATE ON "{t}" WHEN OLD.fid != NEW.fid AND (NEW.geom ISNULL OR ST_IsEmpty(NEW.geom))
+BEGIN DELETE FROM "rtree_{t}_geom" WHERE id IN (OLD.fid, NEW.fid); END;
+CREATE TRIGGER "rtree_{t}_geom_delete" AFTER DELETE ON "{t}" WHEN old.geom NOT NULL
+BEGIN DELETE FROM "rtree_{t}_geom" WHERE id = OLD.fid; END;
+"""
+
+
+# SQLite R-tree node cell: rowid (feature id or child node), then the box as float32, all big-endian
+RTREE_CELL = np.dtype([("id", ">i8"), ("box", ">f4", (4,))])
+
+
+def _float32(values, direction):
+    # float32 box coordinates rounded outwards (as SQLite stores them), so boxes still contain their plots
+    rounded = values.astype(np.float32)
+    outside = rounded > values if direction < 0 else rounded < values
+    rounded[outside] = np.nextafter(rounded[outside], np.float32(direction * np.inf))
+    return rounded
+
+
+def _str_order(cx, cy, per_node):
+    # Sort-Tile-Recursive: vertical slices by x centre, each sorted by y centre, cut into nodes of per_node
+    n = len(cx)
+    slices = int(np.ceil(np.sqrt(-(-n // per_node))))
+    slice_of = np.empty(n, dtype=np.int64)
+    slice_of[np.argsort(cx, kind="stable")] = np.arange(n) // (slices * per_node)
+    return np.lexsort((cy, slice_of))
+
+
+def bulk_load_rtree(con, name, ids, x0, x1, y0, y1):
+    """Fill an empty SQLite R-tree (id, minx, maxx, miny, maxy) by writing its shadow tables directly.
+
+    The tree is packed bottom-up (Sort-Tile-Recursive) from all boxes at once
+    instead of being grown one insert and node split at a time; queries and later
+    edits see an ordinary R-tree (SELECT rtreecheck(name) verifies it).
+    """
+    node_size = con.execute(f'SELECT length(data) FROM "{name}_node" WHERE nodeno = 1').fetchone()[0]
+    per_node = (node_size - 4) // RTREE_CELL.itemsize
+    boxes = np.column_stack([_float32(x0, -1), _float32(x1, 1), _float32(y0, -1), _float32(y1, 1)])
+    child = np.asarray(ids, dtype=np.int64)
+
+    # Levels bottom-up: (cell rowids or child indices, cell boxes) in node order
+    levels = []
+    while True:
+        order = _str_order(boxes[:, 0] + boxes[:, 1], boxes[:, 2] + boxes[:, 3], per_node)
+        child, boxes = child[order], boxes[order]
+        levels.append((child, boxes))
+        starts = np.arange(0, len(child), per_node)
+        if len(starts) == 1:
+            break
+        boxes = np.column_stack([np.minimum.reduceat(boxes[:, 0], starts), np.maximum.reduceat(boxes[:, 1], starts),
+                                 np.minimum.reduceat(boxes[:, 2], starts), np.maximum.reduceat(boxes[:, 3], starts)])
+        child = np.arange(len(starts))
+
+    # Node numbers top-down from the root (node 1)
+    n_nodes = [-(-len(cells) // per_node) for cells, _ in levels]
+    first = np.cumsum([0] + n_nodes[::-1])[:-1][::-1] + 1  # first node number of each level
+    nodes, parents, rowids = [], [], None
+    for level, (cells, boxes) in enumerate(levels):
+        count = n_nodes[level]
+        packed = np.zeros(count * per_node, dtype=RTREE_CELL)
+        packed["id"][:len(cells)] = cells if level == 0 else cells + first[level - 1]
+        packed["box"][:len(cells)] = boxes
+        data = np.zeros((count, node_size), dtype=np.uint8)
+        data[:, 4:4 + per_node * RTREE_CELL.itemsize] = packed.view(np.uint8).reshape(count, -1)
+        data[:, 2:4] = np.diff(np.minimum(np.arange(count + 1) * per_node, len(cells))).astype(">u2") \
+            .view(np.uint8).reshape(count, 2)
+        if level == len(levels) - 1:
+            data[0, 0:2] = np.array([level], dtype=">u2").view(np.uint8)  # tree depth, kept in the root
+        node_numbers = first[level] + np.arange(count)
+        owner = node_numbers[np.arange(len(cells)) // per_node]
+        if level == 0:
+            rowids = zip(cells.tolist(), owner.tolist())
+        else:
+            parents.append(zip((cells + first[level - 1]).tolist(), owner.tolist()))
+        buffer = memoryview(data.tobytes())
+        nodes.append(list(zip(node_numbers.tolist(), [buffer[i * node_size:(i + 1) * node_size] for i in range(count)])))
+
+    con.execute(f'DELETE FROM "{name}_node"')
+    for level_nodes in nodes:
+        con.executemany(f'INSERT INTO "{name}_node" (nodeno, data) VALUES (?, ?)', level_nodes)
+    for level_parents in parents:
+        con.executemany(f'INSERT INTO "{name}_parent" (nodeno, parentnode) VALUES (?, ?)', level_parents)
+    con.executemany(f'INSERT INTO "{name}_rowid" (rowid, nodeno) VALUES (?, ?)', rowids)
+
+
+def geometry_blobs(x0, y0, x1, y1, srs_id):
+    # One buffer of fixed-size GeoPackage polygon blobs (counter-clockwise rings, as WKB expects)
+    blobs = np.empty(len(x0), dtype=GPKG_GEOMETRY)
+    blobs["magic"], blobs["version"], blobs["flags"], blobs["srs_id"] = b"GP", 0, GPKG_FLAGS, srs_id
+    blobs["envelope"] = np.column_stack([x0, x1, y0, y1])
+    blobs["byte_order"], blobs["wkb_type"], blobs["num_rings"], blobs["num_points"] = 1, WKB_POLYGON, 1, 5
+    blobs["points"] = _rings(x0, y0, x1, y1, clockwise=False)
+    return memoryview(blobs.tobytes())
+
+
+def write_geopackage(path, x_start, y_start, x_stop, y_stop, attributes=None, table="plots", srs_id=-1):
+    """Plot rectangles as a GeoPackage POLYGON feature table with an R-tree index.
+
+    srs_id is -1 (undefined cartesian, e.g. field feet), 0 or 4326. An existing
+    file at path is replaced. Returns the number of features.
+    """
+    x0, y0, x1, y1 = _extents(x_start, y_start, x_stop, y_stop)
+    attributes = {name: np.asarray(values) for name, values in (attributes or {}).items()}
+    n = len(x0)
+    size = GPKG_GEOMETRY.itemsize
+    blobs = geometry_blobs(x0, y0, x1, y1, srs_id)
+
+    if os.path.exists(path):
+        os.remove(path)
+    con = sqlite3.connect(path)
+    try:
+        con.executescript("PRAGMA application_id = 1196444487; PRAGMA user_version = 10400; "
+                          "PRAGMA journal_mode = OFF; PRAGMA synchronous = OFF;")
+        con.executescript("""
+            CREATE TABLE gpkg_spatial_ref_sys (srs_name TEXT NOT NULL, srs_id INTEGER PRIMARY KEY,
+                organization TEXT NOT NULL, organization_coordsys_id INTEGER NOT NULL, definition TEXT NOT NULL,
+                description TEXT);
+            CREATE TABLE gpkg_contents (table_name TEXT NOT NULL PRIMARY KEY, data_type TEXT NOT NULL,
+                identifier TEXT UNIQUE, description TEXT DEFAULT '',
+                last_change DATETIME NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ','now')),
+                min_x DOUBLE, min_y DOUBLE, max_x DOUBLE, max_y DOUBLE, srs_id INTEGER,
+                CONSTRAINT fk_gc_r_srs_id FOREIGN KEY (srs_id) REFERENCES gpkg_spatial_ref_sys(srs_id));
+            CREATE TABLE gpkg_geometry_columns (table_name TEXT NOT NULL, column_name TEXT NOT NULL,
+                geometry_type_name TEXT NOT NULL, srs_id INTEGER NOT NULL, z TINYINT NOT NULL, m TINYINT NOT NULL,
+                CONSTRAINT pk_geom_cols PRIMARY KEY (table_name, column_name),
+                CONSTRAINT fk_gc_tn FOREIGN KEY (table_name) REFERENCES gpkg_contents(table_name),
+                CONSTRAINT fk_gc_srs FOREIGN KEY (srs_id) REFERENCES gpkg_spatial_ref_sys (srs_id));
+            CREATE TABLE gpkg_extensions (table_name TEXT, column_name TEXT, extension_name TEXT NOT NULL,
+                definition TEXT NOT NULL, scope TEXT NOT NULL,
+                CONSTRAINT ge_tce UNIQUE (table_name, column_name, extension_name));
+        """)
+        con.executemany("INSERT INTO gpkg_spatial_ref_sys VALUES (?, ?, ?, ?, ?, ?)", SPATIAL_REF_SYS)
+
+        columns = "".join(f', "{name}" {SQL_TYPES.get(values.dtype.kind, "TEXT")}'
+                          for name, values in attributes.items())
+        con.execute(f'CREATE TABLE "{table}" (fid INTEGER PRIMARY KEY AUTOINCREMENT, geom POLYGON{columns})')
+        bounds = (float(x0.min()), float(y0.min()), float(x1.max()), float(y1.max())) if n else (None,) * 4
+        con.execute("INSERT INTO gpkg_contents (table_name, data_type, identifier, min_x, min_y, max_x, max_y, "
+                    "srs_id) VALUES (?, 'features', ?, ?, ?, ?, ?, ?)", (table, table, *bounds, srs_id))
+        con.execute("INSERT INTO gpkg_geometry_columns VALUES (?, 'geom', 'POLYGON', ?, 0, 0)", (table, srs_id))
+
+        # Rows: fid, geometry blob slice, attributes as Python values
+        values = [np.arange(1, n + 1).tolist(), [blobs[i * size:(i + 1) * size] for i in range(n)]]
+        for column in attributes.values():
+            values.append(column.tolist() if column.dtype.kind in "iubf" else column.astype(str).tolist())
+        placeholders = ", ".join("?" * len(values))
+        con.executemany(f'INSERT INTO "{table}" VALUES ({placeholders})', zip(*values))
+
+        # Spatial index, packed from the extents, then the spec's triggers to keep it current on edits
+        con.execute(f'CREATE VIRTUAL TABLE "rtree_{table}_geom" USING rtree(id, minx, maxx, miny, maxy)')
+        if n:
+            bulk_load_rtree(con, f"rtree_{table}_geom", np.arange(1, n + 1), x0, x1, y0, y1)
+        con.execute("INSERT INTO gpkg_extensions VALUES (?, 'geom', 'gpkg_rtree_index', "
+                    "'http://www.geopackage.org/spec120/#extension_rtree', 'write-only')", (table,))
+        con.executescript(RTREE_TRIGGERS.format(t=table))
+        con.commit()
+    finally:
+        con.close()
+    return n
+
+
+# === Input ===
+def plot_table(source, cell_size=None):
+    # Layout DataFrame with X_start/X_stop/Y_start/Y_stop; derived from X/Y and cell_size
+    # (default: the median centre spacing) when missing
+    df = read_any(source)
+    if not {"X_start", "X_stop", "Y_start", "Y_stop"} <= set(df.columns):
+        cell_size = cell_size or centre_spacing(df["X"], df["Y"])
+        df["X_start"], df["X_stop"] = df["X"] - cell_size[0] / 2, df["X"] + cell_size[0] / 2
+        df["Y_start"], df["Y_stop"] = df["Y"] - cell_size[1] / 2, df["Y"] + cell_size[1] / 2
+    return df
+
+
+def export_plots(df, base, formats=FORMATS, srs_id=-1, attributes=ATTRIBUTES):
+    # Write the requested formats for a layout DataFrame; returns the paths written
+    extents = [df[name].to_numpy() for name in ("X_start", "Y_start", "X_stop", "Y_stop")]
+    columns = {name: np.asarray(df[name]) for name in attributes if name in df.columns}
+    written = []
+    if "shp" in formats:
+        written += write_shapefile(base, *extents, columns, prj=WGS84_WKT if srs_id == 4326 else None)
+    if "gpkg" in formats:
+        write_geopackage(base + ".gpkg", *extents, columns, srs_id=srs_id)
+        written.append(base + ".gpkg")
+    return written
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export plot rectangles as Shapefile and/or GeoPackage.")
+    parser.add_argument("layout", help=".layout or CSV file with X_start/X_stop/Y_start/Y_stop (or X/Y) columns")
+    parser.add_argument("out", help="output path without extension")
+    parser.add_argument("--format", nargs="+", default=list(FORMATS), choices=FORMATS)
+    parser.add_argument("--cell-size", type=float, nargs=2, default=None, metavar=("W", "H"),
+                        help="plot size when the file only has centres (default: median centre spacing)")
+    parser.add_argument("--wgs84", action="store_true", help="coordinates are WGS84 longitude/latitude")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    df = plot_table(args.layout, args.cell_size)
+    written = export_plots(df, args.out, args.format, srs_id=4326 if args.wgs84 else -1)
+    print(f"✅ {len(df):,} plots in {time.perf_counter() - t0:.2f} s — saved: {', '.join(written)}")
@@ -0,0 +1,133 @@
+# Array-in/array-out GPS conversions shared by the soil sampler and the GPS aligner
+# DMS strings ("40-06-54", "40 06 54.25", "40:06:54") are parsed and formatted as
+# byte matrices with NumPy column operations instead of one regex / f-string per row.
+
+import numpy as np
+from geo_projection import FOOT, meridian_distance
+
+_FIELD_WEIGHT = np.array([1, 1 / 60, 1 / 3600])  # degrees, minutes, seconds
+
+
+# === DMS -> Decimal Degrees ===
+def _ascii(values):
+    # Byte strings of values; non-ASCII characters (a degree sign, curly quotes) become "?", which does not parse
+    values = np.asarray(values)
+    if values.dtype.kind == "S":
+        return values
+    values = values.astype(str)
+    width = values.dtype.itemsize // 4
+    if not values.size or not width:
+        return values.astype("S1")
+    codes = np.ascontiguousarray(values).reshape(-1).view(np.uint32).reshape(-1, width)
+    chars = np.where(codes < 128, codes, ord("?")).astype(np.uint8)
+    return chars.view(f"S{width}").reshape(values.shape)
+
+
+def parse_dms(values):
+    """Parse DMS strings to decimal degrees; entries that do not parse become NaN.
+
+    Accepts three unsigned numbers separated by runs of spaces, '-' or ':'
+    (surrounding whitespace ignored); only the seconds may have a fraction.
+    """
+    text = np.char.strip(_ascii(values))
+    n = text.size
+    width = text.dtype.itemsize
+    if not n or not width:
+        return np.full(text.shape, np.nan)
+    # Character matrix stored column-major (width x n) so each character position is contiguous
+    chars = np.ascontiguousarray(text.reshape(-1).view(np.uint8).reshape(n, width).T)
+
+    is_digit = (chars >= ord("0")) & (chars <= ord("9"))
+    is_dot = chars == ord(".")
+    is_sep = (chars == ord(" ")) | (chars == ord("\t")) | (chars == ord("-")) | (chars == ord(":"))
+    is_token = is_digit | is_dot
+    valid = ~(~is_token & ~is_sep & (chars != 0)).any(axis=0)
+
+    # Field number (0, 1, 2) of every character; separators belong to the field before them
+    starts = is_token.copy()
+    starts[1:] &= ~is_token[:-1]
+    field = np.cumsum(starts, axis=0, dtype=np.int16) - 1
+    length = (chars != 0).sum(axis=0)
+    valid &= (field[-1] == 2) & is_token[0]
+    valid &= is_token[np.maximum(length - 1, 0), np.arange(n)]  # no trailing separator
+
+    # Only the seconds may have a dot: one, with digits on both sides
+    valid &= ~(is_dot & (field < 2)).any(axis=0) & (is_dot.sum(axis=0) <= 1)
+    valid &= ~(starts & is_dot).any(axis=0) & ~is_dot[-1]
+    valid &= ~(is_dot[:-1] & ~is_digit[1:]).any(axis=0)
+
+    # Horner accumulation one character position at a time (few positions, many rows);
+    # a field's value is added to the total, scaled 1, 1/60 or 1/3600, where it ends
+    ends = is_token.copy()
+    ends[:-1] &= ~is_token[1:]
+    degrees = np.zeros(n)
+    value = np.zeros(n)
+    frac_scale = np.ones(n)
+    for j in range(width):
+        d = chars[j] - np.uint8(ord("0"))
+        in_frac = frac_scale < 1
+        value = np.where(is_digit[j] & ~in_frac, value * 10 + d, value)
+        frac_scale = np.where(is_dot[j] | (is_digit[j] & in_frac), frac_scale / 10, frac_scale)
+        value = np.where(is_digit[j] & in_frac, value + d * frac_scale * 10, value)
+        degrees += np.where(ends[j], value * _FIELD_WEIGHT[np.clip(field[j], 0, 2)], 0)
+        value = np.where(ends[j], 0, value)
+    return np.where(valid, degrees, np.nan).reshape(text.shape)
+
+
+def dms_to_feet(values):
+    # Feet north of the equator along the WGS84 meridian of a DMS latitude (NaN where it does not parse)
+    return meridian_distance(parse_dms(values)) / FOOT
+
+
+# === Decimal Degrees -> DMS ===
+def format_dms(decimal_degrees):
+    """Format decimal degrees as "DD-MM-SS.ss" strings (same output as feet_to_gps_dms).
+
+    Degrees and minutes are truncated toward zero like int() and the sign of the
+    degrees is dropped, so west/south values keep their signed minutes and
+    seconds exactly as feet_to_gps_dms wrote them ("88--14--50.00").
+    NaN becomes ""; 1000 degrees or more fall back to per-value formatting.
+    Returns a str array of the same shape.
+    """
+    dd = np.asarray(decimal_degrees, dtype=np.float64)
+    flat = dd.reshape(-1)
+    degrees = np.trunc(flat) + 0.0  # int() has no -0.0, so (x - int(x)) keeps the sign of x
+    remainder = (flat - degrees) * 60
+    minutes = np.trunc(remainder) + 0.0
+    seconds = (remainder - minutes) * 60
+    abs_deg = np.abs(degrees)
+
+    fast = np.isfinite(flat) & (abs_deg < 1000)
+    deg_i = np.where(fast, abs_deg, 0).astype(np.int64)
+    min_i = np.where(fast, np.abs(minutes), 0).astype(np.int64)
+    cen_i = np.where(fast, np.rint(np.abs(seconds) * 100), 0).astype(np.int64)
+    min_neg = minutes < 0
+    sec_neg = np.signbit(seconds)
+
+    # Fixed slots "DDD-sMM-sSS.ss"; NUL marks unused slots and is squeezed out below
+    digit = lambda v, p: (v // p % 10 + ord("0")).astype(np.uint8)
+    out = np.zeros((flat.size, 14), dtype=np.uint8)
+    out[:, 0] = np.where(deg_i >= 100, digit(deg_i, 100), 0)
+    out[:, 1], out[:, 2] = digit(deg_i, 10), digit(deg_i, 1)
+    out[:, [3, 7]] = ord("-")
+    # f"{m:02d}" pads to two characters including the sign: -5 -> "-5", -14 -> "-14"
+    out[:, 4] = np.where(min_neg & (min_i >= 10), ord("-"), 0)
+    out[:, 5] = np.where(min_neg & (min_i < 10), ord("-"), digit(min_i, 10))
+    out[:, 6] = digit(min_i, 1)
+    # f"{s:05.2f}" pads to five: 4.5 -> "04.50", -4.5 -> "-4.50", -14.5 -> "-14.50"
+    out[:, 8] = np.where(sec_neg & (cen_i >= 1000), ord("-"), 0)
+    out[:, 9] = np.where(sec_neg & (cen_i < 1000), ord("-"), digit(cen_i, 1000))
+    out[:, 10] = digit(cen_i, 100)
+    out[:, 11] = ord(".")
+    out[:, 12], out[:, 13] = digit(cen_i, 10), digit(cen_i, 1)
+    used = out != 0
+    packed = np.zeros_like(out)
+    packed[np.nonzero(used)[0], (np.cumsum(used, axis=1) - 1)[used]] = out[used]
+    result = packed.view("S14").reshape(-1).astype("U24")
+
+    for i in np.flatnonzero(~fast):
+        if np.isfinite(flat[i]):
+            result[i] = f"{int(abs_deg[i]):02d}-{int(minutes[i]):02d}-{seconds[i]:05.2f}"
+        else:
+            result[i] = ""
+    return result.reshape(dd.shape)
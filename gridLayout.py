@@ -1,40 +1,32 @@
 import matplotlib.pyplot as plt
 import matplotlib.patches as patches
+from field_model import Field
 
-# Field dimensions
-field_width = 160
-field_height = 270
-border_thickness = 10
-cols = 4
-rows = 3
-gap_x = 3
-gap_y = 3
+# Field dimensions (field_model.Field defaults)
+field = Field()
+field_width, field_height, border_thickness = field.width, field.height, field.border_thickness
+rows, cols, gap_x, gap_y = field.rows, field.cols, field.gap_x, field.gap_y
 
 # Usable area
-usable_width = field_width - 2 * border_thickness
-usable_height = field_height - 2 * border_thickness
-
-# Block dimensions
-block_width = (usable_width - (cols - 1) * gap_x) / cols
-block_height = (usable_height - (rows - 1) * gap_y) / rows
+usable_width, usable_height = field.usable_width, field.usable_height
 
 # Cell layout
-cell_cols = 5  # E/W
-cell_rows = 8  # N/S
-cell_width = block_width / cell_cols
-cell_height = block_height / cell_rows
+cell_cols = field.cell_cols  # E/W
+cell_rows = field.cell_rows  # N/S
+
+# Block and cell dimensions
+block_width, block_height, cell_width, cell_height = field.dimensions()
+
+# Precompute block and cell coordinates
+geom = field.geometry()
+block_x, block_y = field.block_origins()
+cells_per_block = field.cells_per_block
 
-# Precompute block coordinates
 block_coords = []
-block_id = 1
-for i in range(rows):
-    for j in range(cols):
-        x0 = border_thickness + j * (block_width + gap_x)
-        y0 = border_thickness + i * (block_height + gap_y)
-        x1 = x0 + block_width
-        y1 = y0 + block_height
-        block_coords.append((f"B{block_id}", x0, y0, x1, y0, x0, y1, x1, y1))
-        block_id += 1
+for idx, (x0, y0) in enumerate(zip(block_x, block_y)):
+    x1 = x0 + block_width
+    y1 = y0 + block_height
+    block_coords.append((f"B{idx + 1}", x0, y0, x1, y0, x0, y1, x1, y1))
 
 # Draw the layout
 fig, ax = plt.subplots(figsize=(14, 12))
@@ -51,7 +43,7 @@ ax.text(1, field_height - 1, f"(0, {field_height})", ha='left', va='top', fontsi
 ax.text(field_width - 1, field_height - 1, f"({field_width}, {field_height})", ha='right', va='top', fontsize=8, rotation=90)
 
 # Draw blocks and internal 5x8 cells
-for block in block_coords:
+for idx, block in enumerate(block_coords):
     block_id, bl_x, bl_y, br_x, br_y, tl_x, tl_y, tr_x, tr_y = block
     width = br_x - bl_x
     height = tl_y - bl_y
@@ -61,12 +53,9 @@ for block in block_coords:
                                    edgecolor='black', facecolor='white', linewidth=1.5))
 
     # Draw internal grid cells
-    for r in range(cell_rows):
-        for c in range(cell_cols):
-            cell_x = bl_x + c * cell_width
-            cell_y = bl_y + r * cell_height
-            ax.add_patch(patches.Rectangle((cell_x, cell_y), cell_width, cell_height,
-                                           edgecolor='lightgray', facecolor='none', linewidth=0.8))
+    for k in range(idx * cells_per_block, (idx + 1) * cells_per_block):
+        ax.add_patch(patches.Rectangle((geom['X_start'][k], geom['Y_start'][k]), cell_width, cell_height,
+                                       edgecolor='lightgray', facecolor='none', linewidth=0.8))
 
     # Label corners
     ax.text(bl_x + 1, bl_y + 1, f"({int(bl_x)}, {int(bl_y)})", ha='left', va='bottom', fontsize=7, rotation=90, color='green')
@@ -0,0 +1,135 @@
+# Shared cell-geometry engine for the block/cell field layouts
+# Builds every block origin and cell extent as NumPy arrays in one broadcasted pass
+# instead of the nested rows x cols x cell_rows x cell_cols loops.
+
+import numpy as np
+
+
+# === Block / Cell Dimensions ===
+def block_dimensions(field_width, field_height, border_thickness, rows, cols, gap_x, gap_y,
+                     cell_rows, cell_cols):
+    usable_width = field_width - 2 * border_thickness
+    usable_height = field_height - 2 * border_thickness
+    block_width = (usable_width - (cols - 1) * gap_x) / cols
+    block_height = (usable_height - (rows - 1) * gap_y) / rows
+    cell_width = block_width / cell_cols
+    cell_height = block_height / cell_rows
+    return block_width, block_height, cell_width, cell_height
+
+
+# === Block Origins ===
+def block_origins(rows, cols, block_width, block_height, border_thickness, gap_x, gap_y, dtype=np.float64):
+    # Lower-left corner of every block, in block-id order (row-major, B1 at the bottom left)
+    bl_x = border_thickness + np.arange(cols, dtype=dtype) * (block_width + gap_x)
+    bl_y = border_thickness + np.arange(rows, dtype=dtype) * (block_height + gap_y)
+    return np.tile(bl_x, rows), np.repeat(bl_y, cols)
+
+
+# === Cell Geometry ===
+def cell_geometry(field_width, field_height, border_thickness, rows, cols, gap_x, gap_y,
+                  cell_rows, cell_cols, dtype=np.float64):
+    """Return a dict of column arrays (one entry per cell) for the whole field.
+
+    Cells are ordered exactly like the original loops: block row, block col,
+    cell row, cell col. Block ids are 1-based like the "B{block_id}" labels.
+    """
+    block_width, block_height, cell_width, cell_height = block_dimensions(
+        field_width, field_height, border_thickness, rows, cols, gap_x, gap_y, cell_rows, cell_cols)
+
+    # Axes: (block row i, block col j, cell row r, cell col c)
+    i = np.arange(rows, dtype=dtype).reshape(rows, 1, 1, 1)
+    j = np.arange(cols, dtype=dtype).reshape(1, cols, 1, 1)
+    r = np.arange(cell_rows, dtype=dtype).reshape(1, 1, cell_rows, 1)
+    c = np.arange(cell_cols, dtype=dtype).reshape(1, 1, 1, cell_cols)
+    shape = (rows, cols, cell_rows, cell_cols)
+
+    x_start = border_thickness + j * (block_width + gap_x) + c * cell_width
+    y_start = border_thickness + i * (block_height + gap_y) + r * cell_height
+    x_start = np.broadcast_to(x_start, shape).ravel()
+    y_start = np.broadcast_to(y_start, shape).ravel()
+
+    n_blocks = rows * cols
+    cells_per_block = cell_rows * cell_cols
+    block = np.repeat(np.arange(1, n_blocks + 1, dtype=np.int32), cells_per_block)
+    row = np.tile(np.repeat(np.arange(cell_rows, dtype=np.int32), cell_cols), n_blocks)
+    col = np.tile(np.arange(cell_cols, dtype=np.int32), n_blocks * cell_rows)
+
+    return {
+        "Block": block,
+        "Row": row,
+        "Col": col,
+        "X": x_start + dtype(cell_width / 2),
+        "Y": y_start + dtype(cell_height / 2),
+        "X_start": x_start,
+        "X_stop": x_start + dtype(cell_width),
+        "Y_start": y_start,
+        "Y_stop": y_start + dtype(cell_height),
+    }
+
+
+# === Point Lookup ===
+ALLEY = 0  # Block id of points between blocks
+BORDER = -1  # Block id of points in the border or outside the field
+
+
+LOCATE_CHUNK = 65536  # points per pass, so the temporaries stay in cache
+
+
+def _locate_axis(v, start, pitch, n, cell, n_cells):
+    # Block index along one axis (-1 in a gap or outside) and cell index within it. The floor
+    # estimates are nudged by one where v falls on the other side of an edge computed with
+    # cell_geometry's own expression, so X_start / X_stop land in the same cell as the arrays say.
+    k = np.floor((v - start) / pitch)
+    k -= v < start + k * pitch
+    k += v >= start + (k + 1) * pitch
+    origin = start + k * pitch
+    c = np.floor((v - origin) / cell)
+    c -= v < origin + c * cell
+    c += v >= origin + (c + 1) * cell
+    c -= (c == n_cells) & (v < origin + (n_cells - 1) * cell + cell)  # below the last cell's stop edge
+    outside = (k < 0) | (k >= n) | (c >= n_cells)
+    k[outside] = -1
+    c[outside] = -1
+    return k, c
+
+
+def locate_cells(x, y, field_width, field_height, border_thickness, rows, cols, gap_x, gap_y,
+                 cell_rows, cell_cols):
+    """Return (Block, Row, Col) int32 arrays of the cell holding each (x, y) point.
+
+    Inverts the cell_geometry formulas with a floor per axis, so any number of
+    points costs a few array passes and no search structure. Cells are half
+    open ([X_start, X_stop) x [Y_start, Y_stop)). Points in an alley get Block
+    ALLEY, in the border or outside the field BORDER; their Row and Col are -1.
+    """
+    block_width, block_height, cell_width, cell_height = block_dimensions(
+        field_width, field_height, border_thickness, rows, cols, gap_x, gap_y, cell_rows, cell_cols)
+    x, y = np.broadcast_arrays(np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64))
+    shape = x.shape
+    x, y = x.ravel(), y.ravel()
+    block, row, col = (np.empty(len(x), dtype=np.int32) for _ in range(3))
+    for s in range(0, len(x), LOCATE_CHUNK):
+        xs, ys = x[s:s + LOCATE_CHUNK], y[s:s + LOCATE_CHUNK]
+        j, c = _locate_axis(xs, border_thickness, block_width + gap_x, cols, cell_width, cell_cols)
+        i, r = _locate_axis(ys, border_thickness, block_height + gap_y, rows, cell_height, cell_rows)
+        outside = (i < 0) | (j < 0)
+        usable = ((xs >= border_thickness) & (xs < field_width - border_thickness)
+                  & (ys >= border_thickness) & (ys < field_height - border_thickness))
+        b = i * cols + j + 1
+        b[outside] = np.where(usable[outside], ALLEY, BORDER)
+        r[outside] = -1
+        c[outside] = -1
+        block[s:s + LOCATE_CHUNK], row[s:s + LOCATE_CHUNK], col[s:s + LOCATE_CHUNK] = b, r, c
+    return block.reshape(shape), row.reshape(shape), col.reshape(shape)
+
+
+def block_labels(block_ids):
+    # "B1", "B2", ... for an array of 1-based block ids
+    names = np.array([f"B{b}" for b in range(1, int(block_ids.max()) + 1)], dtype=object)
+    return names[block_ids - 1]
+
+
+def centre_spacing(x, y):
+    # Plot (width, height) of a layout that only stores centres: the typical (median) step between distinct X / Y
+    steps = [np.diff(np.unique(np.asarray(v, dtype=np.float64))) for v in (x, y)]
+    return tuple(float(np.median(s)) if len(s) else 1.0 for s in steps)
@@ -0,0 +1,203 @@
+# Constraint solver for subblock-type grids
+# Builds a valid grid cell by cell (backtracking + forward checking) instead of
+# drawing whole grids at random and rejecting them.
+
+import random
+from bisect import bisect_right
+
+
+# === Validation ===
+def is_valid_layout(grid, n_types=4, diagonal=False, balance_counts=False, balance_rows=False,
+                    balance_cols=False):
+    rows, cols = len(grid), len(grid[0])
+    for i in range(rows):
+        for j in range(cols):
+            for di, dj in _neighbour_offsets(diagonal):
+                ni, nj = i + di, j + dj
+                if 0 <= ni < rows and 0 <= nj < cols and grid[ni][nj] == grid[i][j]:
+                    return False
+
+    def balanced(values, n):
+        # Every type n // n_types or -(-n // n_types) times (+-1 of each other)
+        floor, cap = n // n_types, -(-n // n_types)
+        return all(floor <= values.count(t) <= cap for t in range(n_types))
+
+    if balance_counts and not balanced([v for row in grid for v in row], rows * cols):
+        return False
+    if balance_rows and not all(balanced(list(row), cols) for row in grid):
+        return False
+    if balance_cols and not all(balanced([grid[i][j] for i in range(rows)], rows) for j in range(cols)):
+        return False
+    return True
+
+
+def _neighbour_offsets(diagonal):
+    offsets = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+    if diagonal:
+        offsets += [(-1, -1), (-1, 1), (1, -1), (1, 1)]
+    return offsets
+
+
+# === Solver ===
+def solve_layout(rows, cols, n_types=4, diagonal=False, balance_counts=False, balance_rows=False,
+                 balance_cols=False, seed=None, max_backtracks=2000, max_restarts=20):
+    """Return a random rows x cols grid of type indices satisfying the constraints.
+
+    diagonal       -- no identical neighbours on the diagonals either (not only N/S/E/W)
+    balance_counts -- every type used equally often over the whole grid (+-1)
+    balance_rows   -- every type used equally often within each row (+-1)
+    balance_cols   -- every type used equally often within each column (+-1)
+
+    Cells are filled in row-major order with random value order. Each
+    assignment removes the value from the domains of the unfilled neighbours,
+    and any neighbour left with a single value propagates in turn, so dead
+    ends are found before the solver walks into them. When a balance
+    constraint is active, least-used types are tried first and the tail of
+    each row/column/grid is checked for enough room to meet every quota. A
+    search that exceeds max_backtracks restarts from scratch; ValueError is
+    raised after max_restarts, like the rejection sampler it replaces.
+    """
+    rng = random.Random(seed)
+    n = rows * cols
+    full = (1 << n_types) - 1
+
+    offsets = _neighbour_offsets(diagonal)
+    neighbours = [
+        [(i + di) * cols + (j + dj) for di, dj in offsets if 0 <= i + di < rows and 0 <= j + dj < cols]
+        for i in range(rows) for j in range(cols)
+    ]
+
+    # Capacity scopes: (cap, cells) per constraint, with a per-type counter each
+    scopes = []
+    if balance_counts:
+        scopes.append((-(-n // n_types), list(range(n))))
+    if balance_rows:
+        scopes += [(-(-cols // n_types), list(range(i * cols, (i + 1) * cols))) for i in range(rows)]
+    if balance_cols:
+        scopes += [(-(-rows // n_types), list(range(j, n, cols))) for j in range(cols)]
+    # Only look ahead over the tail of a scope, where quotas actually bind
+    quota_window = 2 * (cols + 1)
+    cell_scopes = [[] for _ in range(n)]
+    for s, (_, cells) in enumerate(scopes):
+        for p in cells:
+            cell_scopes[p].append(s)
+
+    for _ in range(max_restarts):
+        grid = _search(rng, n, n_types, full, neighbours, scopes, cell_scopes, max_backtracks, quota_window)
+        if grid is not None:
+            return [grid[i * cols:(i + 1) * cols] for i in range(rows)]
+    raise ValueError("Could not find a layout satisfying the constraints "
+                     f"after {max_restarts} restarts.")
+
+
+def _search(rng, n, n_types, full, neighbours, scopes, cell_scopes, limit, quota_window):
+    domains = [full] * n
+    values = [-1] * n
+    counts = [[0] * n_types for _ in scopes]
+    trail = []  # (cell, previous domain)
+
+    def remove(q, bit, pos, queue):
+        d = domains[q]
+        if not d & bit:
+            return True
+        trail.append((q, d))
+        d &= ~bit
+        domains[q] = d
+        if not d:
+            return False
+        if not d & (d - 1):
+            queue.append(q)
+        return True
+
+    def assign(pos, v):
+        values[pos] = v
+        bit = 1 << v
+        trail.append((pos, domains[pos]))
+        domains[pos] = bit
+        queue = []
+        for q in neighbours[pos]:
+            if q > pos and not remove(q, bit, pos, queue):
+                return False
+        for s in cell_scopes[pos]:
+            counts[s][v] += 1
+        for s in cell_scopes[pos]:
+            cap, cells = scopes[s]
+            if counts[s][v] == cap:
+                for q in cells:
+                    if q > pos and not remove(q, bit, pos, queue):
+                        return False
+        # Propagate cells left with a single candidate
+        while queue:
+            q = queue.pop()
+            qbit = domains[q]
+            for r in neighbours[q]:
+                if r > pos and r != q and not remove(r, qbit, pos, queue):
+                    return False
+        return all(quota_ok(s, pos) for s in cell_scopes[pos])
+
+    def quota_ok(s, pos):
+        # Pigeonhole check: the unfilled cells of a scope must still be able to
+        # absorb every type that is short of its quota, and bring every type up
+        # to its minimum share (len(cells) // n_types)
+        cap, cells = scopes[s]
+        start = bisect_right(cells, pos)
+        rest = len(cells) - start
+        if rest > quota_window:
+            return True
+        floor = len(cells) // n_types
+        short = [max(floor - c, 0) for c in counts[s]]
+        if sum(short) > rest:
+            return False
+        need = [cap - c for c in counts[s]]
+        slack = sum(need) - rest
+        for t in range(n_types):
+            least = max(need[t] - slack, short[t])
+            if least > 0:
+                bit = 1 << t
+                avail = sum(1 for q in cells[start:] if domains[q] & bit)
+                if avail < least:
+                    return False
+        return True
+
+    def unassign(pos, mark):
+        v = values[pos]
+        values[pos] = -1
+        for s in cell_scopes[pos]:
+            counts[s][v] -= 1
+        while len(trail) > mark:
+            q, d = trail.pop()
+            domains[q] = d
+
+    # Each frame: (position, untried values, trail mark)
+    stack = []
+    pos = 0
+    backtracks = 0
+    candidates = None
+    while pos < n:
+        if candidates is None:
+            candidates = [v for v in range(n_types) if domains[pos] >> v & 1]
+            rng.shuffle(candidates)
+            if cell_scopes[pos]:
+                # Least-used values first (popped from the end) so the counts stay level
+                candidates.sort(key=lambda v: -sum(counts[s][v] for s in cell_scopes[pos]))
+        mark = len(trail)
+        placed = False
+        while candidates:
+            v = candidates.pop()
+            if assign(pos, v):
+                placed = True
+                break
+            unassign(pos, mark)
+        if placed:
+            stack.append((pos, candidates, mark))
+            pos += 1
+            candidates = None
+            continue
+
+        # Dead end: step back to the previous cell and try its next value
+        backtracks += 1
+        if not stack or backtracks > limit:
+            return None
+        pos, candidates, mark = stack.pop()
+        unassign(pos, mark)
+    return values
@@ -0,0 +1,169 @@
+# Columnar binary layout files (.layout)
+# One file per layout: a JSON header followed by one little-endian array per column,
+# each 64-byte aligned, so readers memory-map the file and use the columns in place.
+# Text columns (Block, Label, ...) are dictionary-encoded as integer codes plus a
+# category list; rows are grouped by Block and the header records each block's row
+# range, so a single block is a slice of every column.
+# Usage: python layout_store.py input.csv output.layout   (or input.layout output.csv)
+
+import json
+import struct
+import sys
+import numpy as np
+import pandas as pd
+
+MAGIC = b"FLDLAYT\x00"
+FORMAT_VERSION = 1
+ALIGN = 64
+EXTENSION = ".layout"
+
+
+def _align(offset):
+    return -(-offset // ALIGN) * ALIGN
+
+
+def _code_dtype(n_categories):
+    # Smallest signed type for the codes; -1 marks a missing value
+    for dtype in (np.int8, np.int16, np.int32):
+        if n_categories < np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype(np.int64)
+
+
+# === Writing ===
+def write_layout(df, path, float_dtype=np.float64):
+    """Write a layout DataFrame to a .layout file.
+
+    Object and categorical columns are dictionary-encoded, integer columns are
+    stored as int32 when they fit, and float columns as float_dtype (float32
+    halves the size when millimetre precision is enough). Rows are regrouped by
+    Block (stable, in order of first appearance) if they are not already.
+    """
+    blocks = {}
+    if "Block" in df.columns:
+        codes, uniques = pd.factorize(df["Block"], use_na_sentinel=False)
+        order = np.argsort(codes, kind="stable")
+        if (np.diff(order) != 1).any():
+            df = df.iloc[order]
+        bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+        blocks = {str(name): [int(start), int(stop)] for name, start, stop in zip(uniques, bounds, bounds[1:])}
+
+    columns, arrays = [], []
+    for name in df.columns:
+        values = df[name]
+        meta = {"name": str(name)}
+        if pd.api.types.is_bool_dtype(values):
+            data = values.to_numpy(np.uint8)
+            meta["kind"] = "bool"
+        elif pd.api.types.is_integer_dtype(values):
+            data = values.to_numpy()
+            small = data.size == 0 or (data.min() >= np.iinfo(np.int32).min and data.max() <= np.iinfo(np.int32).max)
+            data = data.astype("<i4" if small else "<i8")
+        elif pd.api.types.is_float_dtype(values):
+            data = values.to_numpy(np.dtype(float_dtype).newbyteorder("<"))
+        else:
+            codes, categories = pd.factorize(values)
+            data = codes.astype(_code_dtype(len(categories)).newbyteorder("<"))
+            meta["categories"] = [str(c) for c in categories]
+        meta["dtype"] = data.dtype.str
+        columns.append(meta)
+        arrays.append(np.ascontiguousarray(data))
+
+    # Column offsets are relative to the start of the data section
+    offset = 0
+    for meta, data in zip(columns, arrays):
+        offset = _align(offset)
+        meta["offset"] = offset
+        offset += data.nbytes
+    header = json.dumps({"version": FORMAT_VERSION, "n_rows": len(df), "columns": columns,
+                         "blocks": blocks}).encode()
+    data_start = _align(len(MAGIC) + 4 + len(header))
+
+    with open(path, "wb") as f:
+        f.write(MAGIC + struct.pack("<I", len(header)) + header)
+        for meta, data in zip(columns, arrays):
+            f.write(b"\0" * (data_start + meta["offset"] - f.tell()))
+            f.write(data.tobytes())
+
+
+# === Reading ===
+class LayoutFile:
+    """Read-only view of a .layout file (a path, memory-mapped, or bytes in memory).
+
+    column() returns arrays backed by the file itself (codes for dictionary-encoded
+    columns); to_frame() builds a DataFrame with Categorical text columns.
+    """
+
+    def __init__(self, source):
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            self.buffer = np.frombuffer(source, dtype=np.uint8)
+        else:
+            self.buffer = np.memmap(source, dtype=np.uint8, mode="r")
+        if bytes(self.buffer[:len(MAGIC)]) != MAGIC:
+            raise ValueError("Not a .layout file")
+        header_len, = struct.unpack("<I", bytes(self.buffer[len(MAGIC):len(MAGIC) + 4]))
+        header = json.loads(bytes(self.buffer[len(MAGIC) + 4:len(MAGIC) + 4 + header_len]))
+        if header["version"] > FORMAT_VERSION:
+            raise ValueError(f"Layout format version {header['version']} is newer than this reader")
+        self.n_rows = header["n_rows"]
+        self.blocks = {name: tuple(rows) for name, rows in header["blocks"].items()}
+        self._data_start = _align(len(MAGIC) + 4 + header_len)
+        self._columns = {meta["name"]: meta for meta in header["columns"]}
+
+    @property
+    def columns(self):
+        return list(self._columns)
+
+    def _rows(self, block):
+        if block is None:
+            return 0, self.n_rows
+        if block not in self.blocks:
+            raise KeyError(f"No block {block!r} in layout")
+        return self.blocks[block]
+
+    def column(self, name, block=None):
+        # Zero-copy array of a column (all rows, or one block's rows)
+        meta = self._columns[name]
+        dtype = np.dtype(meta["dtype"])
+        start, stop = self._rows(block)
+        offset = self._data_start + meta["offset"] + start * dtype.itemsize
+        return self.buffer[offset:offset + (stop - start) * dtype.itemsize].view(dtype)
+
+    def categories(self, name):
+        # Category values of a dictionary-encoded column, None for numeric columns
+        return self._columns[name].get("categories")
+
+    def to_frame(self, block=None, columns=None):
+        data = {}
+        for name in columns or self.columns:
+            meta = self._columns[name]
+            values = self.column(name, block)
+            if "categories" in meta:
+                values = pd.Categorical.from_codes(values, meta["categories"])
+            elif meta.get("kind") == "bool":
+                values = values.astype(bool)
+            data[name] = values
+        return pd.DataFrame(data, copy=False)
+
+
+def read_layout(source, block=None, columns=None):
+    # Layout (or one block of it) as a DataFrame, from a .layout path or bytes
+    return LayoutFile(source).to_frame(block, columns)
+
+
+def read_any(source, name=None):
+    # DataFrame from a .layout or .csv path or uploaded file, chosen by its name
+    name = str(name or getattr(source, "name", source))
+    if name.endswith(EXTENSION):
+        return read_layout(source.getvalue() if hasattr(source, "getvalue") else source)
+    return pd.read_csv(source)
+
+
+if __name__ == "__main__":
+    src, dst = sys.argv[1], sys.argv[2]
+    df = read_any(src)
+    if dst.endswith(EXTENSION):
+        write_layout(df, dst)
+    else:
+        df.to_csv(dst, index=False)
+    print(f"✅ Saved: {dst} ({len(df)} rows)")
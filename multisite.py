@@ -0,0 +1,123 @@
+# Batch trial layout generation for many sites
+# Every site spec (dimensions, block grid, design assignment, GPS anchor) becomes one
+# .layout file, generated in a process pool. Each site's random stream is derived from
+# the master seed and the site name only, so the files are bit-for-bit identical for
+# any worker count or site order.
+# Usage: python multisite.py sites.json [--seed 123] [--workers N] [--out layouts] [--csv]
+
+import argparse
+import json
+import os
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from gps_convert import dms_to_feet
+from field_model import DESIGN_BLOCKS, DESIGNS as MODEL_DESIGNS, Field
+from layout_solver import solve_layout
+from layout_store import write_layout
+from randomization import assign_ab
+
+# Defaults are the Energy Farm 2025 trial (allField.py)
+SITE_DEFAULTS = {
+    "field_width": 160,
+    "field_height": 270,
+    "border_thickness": 10,
+    "rows": 3,
+    "cols": 4,
+    "gap_x": 3,
+    "gap_y": 3,
+    "cell_rows": 8,
+    "cell_cols": 5,
+    "design_blocks": {str(d): blocks for d, blocks in DESIGN_BLOCKS.items()},
+    "anchor": None,  # DMS latitude of the field's lower-left corner, e.g. "40-06-54"
+}
+DESIGNS = {str(d): {"A": design["A"], "B": design["B"]} for d, design in MODEL_DESIGNS.items()}
+SITE_COLUMNS = ["Block", "Row", "Col", "X", "Y", "Label", "X_start", "X_stop", "Y_start", "Y_stop"]
+
+
+def site_seed(master_seed, name):
+    # 64-bit seed for one site from the master seed and the site name
+    seq = np.random.SeedSequence(master_seed, spawn_key=(zlib.crc32(name.encode()),))
+    return int(seq.generate_state(1, np.uint64)[0])
+
+
+# === One Site ===
+def generate_site(spec, seed):
+    """Layout DataFrame for one site spec (missing keys taken from SITE_DEFAULTS).
+
+    design_blocks maps design ids to 1-based block ids; "solve" lets the layout
+    solver assign designs so that no two neighbouring blocks share one. Blocks
+    without a design get empty labels.
+    """
+    site = {**SITE_DEFAULTS, **spec}
+    designs = site.get("designs", DESIGNS)
+    rows, cols = site["rows"], site["cols"]
+
+    design_blocks = site["design_blocks"]
+    if design_blocks == "solve":
+        design_ids = list(designs)
+        grid = solve_layout(rows, cols, n_types=len(design_ids), seed=seed)
+        block_design = {r * cols + c + 1: design_ids[grid[r][c]] for r in range(rows) for c in range(cols)}
+    else:
+        block_design = {block: design for design, blocks in design_blocks.items() for block in blocks}
+
+    field = Field(site["field_width"], site["field_height"], site["border_thickness"], rows, cols,
+                  site["gap_x"], site["gap_y"], site["cell_rows"], site["cell_cols"])
+    geom = field.geometry()
+    labels, _ = assign_ab(geom['Row'], geom['Col'], geom['Block'],
+                          {block: designs[d] for block, d in block_design.items() if d in designs}, seed=seed)
+    df = field.plots(labels).to_frame(SITE_COLUMNS)
+    if site["anchor"] is not None:
+        # Shift Y so the lowest cell starts at the anchor, as the GPS aligner app does
+        offset = float(dms_to_feet(site["anchor"])) - df['Y_start'].min()
+        if np.isnan(offset):
+            raise ValueError(f"Site {spec['name']!r}: anchor {site['anchor']!r} is not in 'xx-yy-zz' format")
+        for col in ['Y', 'Y_start', 'Y_stop']:
+            df[col] = (df[col] + offset).round(2)
+    return df
+
+
+def _run_site(task):
+    # Worker: generate one site and write its files; returns (name, number of cells)
+    spec, seed, out_dir, csv = task
+    df = generate_site(spec, seed)
+    path = os.path.join(out_dir, spec["name"])
+    write_layout(df, f"{path}.layout")
+    if csv:
+        df.to_csv(f"{path}.csv", index=False)
+    return spec["name"], len(df)
+
+
+# === All Sites ===
+def generate_sites(specs, master_seed=0, out_dir="layouts", workers=None, csv=False):
+    # Write every site's layout to out_dir; returns [(name, cells)] in spec order
+    names = [spec["name"] for spec in specs]
+    if len(set(names)) != len(names):
+        raise ValueError("Site names must be unique (they name the output files and seed each site)")
+    os.makedirs(out_dir, exist_ok=True)
+    tasks = [(spec, site_seed(master_seed, spec["name"]), out_dir, csv) for spec in specs]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(tasks) < 2:
+        return list(map(_run_site, tasks))
+    with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+        return list(pool.map(_run_site, tasks, chunksize=max(1, len(tasks) // (4 * workers))))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate trial layouts for many sites in parallel.")
+    parser.add_argument("sites", help="JSON file with a list of site specs (each needs a unique 'name')")
+    parser.add_argument("--seed", type=int, default=123, help="master seed (default: 123)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: one per CPU)")
+    parser.add_argument("--out", default="layouts", help="output directory (default: layouts)")
+    parser.add_argument("--csv", action="store_true", help="also write a CSV per site")
+    args = parser.parse_args()
+
+    with open(args.sites) as f:
+        specs = json.load(f)
+    t0 = time.perf_counter()
+    results = generate_sites(specs, args.seed, args.out, args.workers, args.csv)
+    elapsed = time.perf_counter() - t0
+    cells = sum(n for _, n in results)
+    print(f"✅ {len(results)} sites ({cells} cells) written to {args.out}/ in {elapsed:.2f} s "
+          f"({len(results) / elapsed:.1f} sites/s)")
@@ -0,0 +1,237 @@
+# Monte Carlo neighbour-balance scoring of candidate layouts
+# Builds the plot-level variety grid of every candidate seed, measures how evenly varieties
+# meet each other (pair adjacency, repeated neighbours, same-variety contacts, edge
+# exposure) with array shifts and convolutions over a whole batch of grids at once, and
+# ranks the seeds. Batches are scored in a process pool.
+# Usage: python neighbour_balance.py [row_pattern|solver|checkerboard] [--seeds 1000] [--top 10]
+
+import argparse
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import permutations
+import numpy as np
+import pandas as pd
+from scipy.ndimage import convolve
+from field_model import SUBBLOCK_TYPES, SubBlock
+from layout_solver import solve_layout
+from multisite import SITE_DEFAULTS, generate_site
+
+# === Full-Field Designs (_full_field.py / _final_field_layout_script.py) ===
+ROWS, COLS = 3, 4
+NUM_TRACKS, NUM_PLOTS = 5, 12  # tracks per subblock, plots per track
+
+METRICS = ["same_neighbours", "repeated_neighbours", "max_pair", "exposure_spread"]
+DEFAULT_WEIGHTS = {"same_neighbours": 1.0, "repeated_neighbours": 1.0, "max_pair": 0.5, "exposure_spread": 0.5}
+
+
+@lru_cache(maxsize=None)
+def subblock_plots(subblock_type):
+    # NUM_PLOTS x NUM_TRACKS variety grid of one subblock type (row 0 at the bottom)
+    plots = SubBlock(0, 0, *SUBBLOCK_TYPES[subblock_type], num_tracks=NUM_TRACKS, num_plots=NUM_PLOTS).plots()
+    grid = np.empty((NUM_PLOTS, NUM_TRACKS), dtype=object)
+    grid[plots.data["row"], plots.data["col"]] = plots.column("Label")
+    return grid
+
+
+def row_pattern_layout(seed):
+    # Subblock-type grid of _full_field.py: one no-repeat permutation per row, middle row redrawn
+    valid = [p for p in permutations(range(4)) if all(p[i] != p[i + 1] for i in range(3))]
+    rng = random.Random(seed)
+    layout = [rng.choice(valid) for _ in range(ROWS)]
+    alt = [p for p in valid if p != layout[1]]
+    layout[1] = random.Random(seed + 1).choice(alt)
+    return layout
+
+
+def field_plots(layout, gap=0):
+    # Plot-level grid for a subblock-type grid; gap empty rows/cols between subblocks
+    # (0 treats plots facing each other across the 5 ft alleys as neighbours)
+    rows, cols = len(layout), len(layout[0])
+    grid = np.full((rows * (NUM_PLOTS + gap) - gap, cols * (NUM_TRACKS + gap) - gap), "", dtype=object)
+    for r in range(rows):
+        for c in range(cols):
+            y, x = r * (NUM_PLOTS + gap), c * (NUM_TRACKS + gap)
+            grid[y:y + NUM_PLOTS, x:x + NUM_TRACKS] = subblock_plots(layout[r][c])
+    return grid
+
+
+def checkerboard_plots(spec, seed, gap=1):
+    # Plot-level grid of a multisite spec (allField.py layout by default), gap cells between blocks
+    df = generate_site({"name": "candidate", **spec}, seed)
+    cell_rows, cell_cols = df["Row"].max() + 1, df["Col"].max() + 1
+    cols = {**SITE_DEFAULTS, **spec}["cols"]
+    block_row, block_col = np.divmod(df["Block"].str[1:].astype(int).to_numpy() - 1, cols)
+    y = block_row * (cell_rows + gap) + df["Row"].to_numpy()
+    x = block_col * (cell_cols + gap) + df["Col"].to_numpy()
+    grid = np.full((y.max() + 1, x.max() + 1), "", dtype=object)
+    grid[y, x] = df["Label"].to_numpy()
+    return grid
+
+
+def candidate_grid(design, seed, options):
+    if design == "row_pattern":
+        return field_plots(row_pattern_layout(seed), options.get("gap", 0))
+    if design == "solver":
+        constraints = options.get("constraints", {})
+        return field_plots(solve_layout(ROWS, COLS, n_types=len(SUBBLOCK_TYPES), seed=seed, **constraints),
+                           options.get("gap", 0))
+    if design == "checkerboard":
+        return checkerboard_plots(options.get("site", {}), seed, options.get("gap", 1))
+    raise ValueError(f"Unknown design {design!r}")
+
+
+# === Neighbour Statistics ===
+def _offsets(diagonal):
+    # Each neighbouring pair of cells is visited once
+    return [(0, 1), (1, 0)] + ([(1, 1), (1, -1)] if diagonal else [])
+
+
+def _shifted(codes, dy, dx):
+    # Views (a, b) of a batch of grids where b[..., i, j] is the (dy, dx) neighbour of a[..., i, j]
+    h, w = codes.shape[1:]
+    a = codes[:, :h - dy, max(-dx, 0):w - max(dx, 0)]
+    b = codes[:, dy:, max(dx, 0):w - max(-dx, 0)]
+    return a, b
+
+
+def pair_counts(codes, n_labels, diagonal=False):
+    """Symmetric (n_grids, n_labels, n_labels) counts of neighbouring label pairs.
+
+    codes is an (n_grids, height, width) integer batch, -1 for empty cells.
+    Off-diagonal entries count contacts between two labels, the diagonal counts
+    contacts of a label with itself.
+    """
+    n, k = len(codes), n_labels
+    base = (np.arange(n) * k * k).reshape(-1, 1, 1)
+    counts = np.zeros(n * k * k, dtype=np.int64)
+    for dy, dx in _offsets(diagonal):
+        a, b = _shifted(codes, dy, dx)
+        both = (a >= 0) & (b >= 0)
+        counts += np.bincount((base + a * k + b)[both], minlength=n * k * k)
+    counts = counts.reshape(n, k, k)
+    counts = counts + counts.transpose(0, 2, 1)
+    diag = np.arange(k)
+    counts[:, diag, diag] //= 2
+    return counts
+
+
+def edge_exposure(codes, n_labels, diagonal=False):
+    # (n_grids, n_labels) mean number of open sides (field edge, alley, empty cell) per plot; NaN if absent
+    kernel = np.ones((3, 3), dtype=np.int8) if diagonal else np.array([[0, 1, 0], [1, 0, 1], [0, 1, 0]], np.int8)
+    kernel[1, 1] = 0
+    occupied = codes >= 0
+    neighbours = convolve(occupied.astype(np.int8), kernel[None], mode="constant", cval=0)
+    open_sides = (kernel.sum() - neighbours)[occupied]
+    n, k = len(codes), n_labels
+    index = (np.arange(n).reshape(-1, 1, 1) * k + codes)[occupied]
+    totals = np.bincount(index, weights=open_sides, minlength=n * k)
+    plots = np.bincount(index, minlength=n * k)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return (totals / plots).reshape(n, k)
+
+
+def neighbour_stats(codes, n_labels, diagonal=False):
+    """Per-grid neighbour-balance metrics for a batch of coded grids (lower is better).
+
+    same_neighbours     -- contacts between plots of the same variety
+    repeated_neighbours -- contacts of a variety pair beyond its first one
+    max_pair            -- contacts of the most frequent variety pair
+    exposure_spread     -- max - min over varieties of the mean open sides per plot
+    """
+    counts = pair_counts(codes, n_labels, diagonal)
+    diag = np.arange(n_labels)
+    same = counts[:, diag, diag].sum(axis=1)
+    upper = np.triu(np.ones((n_labels, n_labels), dtype=bool), k=1)
+    between = counts[:, upper]
+    exposure = edge_exposure(codes, n_labels, diagonal)
+    return {
+        "same_neighbours": same,
+        "repeated_neighbours": np.clip(between - 1, 0, None).sum(axis=1),
+        "max_pair": between.max(axis=1, initial=0),
+        "exposure_spread": np.nanmax(exposure, axis=1) - np.nanmin(exposure, axis=1),
+    }
+
+
+def encode(grids):
+    # Stack label grids into one integer batch; returns (codes, labels), "" -> -1
+    stacked = np.stack(grids)
+    codes, labels = pd.factorize(stacked.ravel())
+    empty = np.flatnonzero(labels == "")
+    if len(empty):
+        codes = np.where(codes == empty[0], -1, codes - (codes > empty[0]))
+        labels = np.delete(labels, empty[0])
+    return codes.reshape(stacked.shape), labels
+
+
+# === Scoring Candidates ===
+def _score_chunk(task):
+    # Worker: metrics for one chunk of seeds
+    design, seeds, options = task
+    codes, labels = encode([candidate_grid(design, seed, options) for seed in seeds])
+    stats = neighbour_stats(codes, len(labels), options.get("diagonal", False))
+    return pd.DataFrame({"seed": seeds, **stats})
+
+
+def score_seeds(design, seeds, top=10, weights=None, workers=None, chunk_size=256, **options):
+    """Score every seed of a design; returns (best, summary, scores).
+
+    design is "row_pattern" (_full_field.py), "solver" (generate_full_field_layout,
+    options: constraints) or "checkerboard" (multisite spec, options: site). Other
+    options: gap (empty cells between subblocks/blocks), diagonal (diagonal
+    contacts count as neighbours).
+
+    Each metric is standardised over all candidates and the weighted sum is the
+    score (lower is better), so the ranking is relative to the seeds drawn.
+    best holds the top seeds, summary the distribution of every metric and the
+    score, and scores the full table.
+    """
+    seeds = list(seeds)
+    tasks = [(design, seeds[i:i + chunk_size], options) for i in range(0, len(seeds), chunk_size)]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(tasks) < 2:
+        parts = list(map(_score_chunk, tasks))
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+            parts = list(pool.map(_score_chunk, tasks))
+    scores = pd.concat(parts, ignore_index=True)
+
+    weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+    scores["score"] = 0.0
+    for metric in METRICS:
+        values = scores[metric].astype(float)
+        spread = values.std()
+        if spread > 0:
+            scores["score"] += weights[metric] * (values - values.mean()) / spread
+    best = scores.sort_values(["score", "seed"], kind="stable").head(top).reset_index(drop=True)
+    summary = scores[METRICS + ["score"]].describe(percentiles=[0.05, 0.25, 0.5, 0.75, 0.95])
+    return best, summary, scores
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rank layout seeds by neighbour balance.")
+    parser.add_argument("design", nargs="?", default="row_pattern", choices=["row_pattern", "solver", "checkerboard"])
+    parser.add_argument("--seeds", type=int, default=1000, help="number of seeds to score (default: 1000)")
+    parser.add_argument("--first", type=int, default=0, help="first seed (default: 0)")
+    parser.add_argument("--top", type=int, default=10, help="best seeds to list (default: 10)")
+    parser.add_argument("--gap", type=int, default=None, help="empty cells between subblocks/blocks")
+    parser.add_argument("--diagonal", action="store_true", help="count diagonal contacts as neighbours")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: one per CPU)")
+    parser.add_argument("--out", default=None, help="write every seed's scores to this CSV")
+    args = parser.parse_args()
+
+    options = {"diagonal": args.diagonal}
+    if args.gap is not None:
+        options["gap"] = args.gap
+    t0 = time.perf_counter()
+    best, summary, scores = score_seeds(args.design, range(args.first, args.first + args.seeds), args.top,
+                                        workers=args.workers, **options)
+    elapsed = time.perf_counter() - t0
+    print(summary.round(3).to_string())
+    print()
+    print(best.round(3).to_string(index=False))
+    if args.out:
+        scores.to_csv(args.out, index=False)
+    print(f"✅ {len(scores)} seeds scored in {elapsed:.2f} s ({len(scores) / elapsed:.0f} seeds/s)")
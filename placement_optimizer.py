@@ -0,0 +1,171 @@
+# Simulated-annealing placement of entries within checkerboard A/B blocks
+# Starts from the random assign_ab() labels and swaps entries between cells of the same
+# class (A with A, B with B) inside a block, so pools, counts and the checkerboard stay
+# as they are. A swap is scored from the contacts of the two cells only.
+#
+# Objective per block, over every pair of touching cells (N/S/E/W and diagonal):
+#   same_weight * (contacts between plots of the same entry)
+#   + sum over entry pairs of (contacts of that pair)^2
+# The squared term spreads contacts over as many different neighbours as possible.
+
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from randomization import block_rng
+
+NEIGHBOURS = [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]
+OPTIMIZER_STREAM = 1  # block_rng stream, independent of the assign_ab draw
+
+
+# === One Block ===
+def block_energy(codes, neighbours, same_weight=10.0):
+    # Objective and contact counts {a * n_codes + b (a <= b): contacts} for one block
+    n_codes = max(codes) + 1 if codes else 0
+    counts = {}
+    for p, nbrs in enumerate(neighbours):
+        for n in nbrs:
+            if n > p:
+                a, b = sorted((codes[p], codes[n]))
+                counts[a * n_codes + b] = counts.get(a * n_codes + b, 0) + 1
+    energy = sum(same_weight * c if key // n_codes == key % n_codes else c * c for key, c in counts.items())
+    return energy, counts
+
+
+def anneal_block(codes, neighbours, classes, rng, iterations, same_weight=10.0, t_end=0.05):
+    """Anneal one block's entry codes in place; returns (energy before, energy after).
+
+    codes      -- list of integer entry codes, one per cell
+    neighbours -- list of neighbouring cell indices for every cell
+    classes    -- lists of cell indices whose entries may be swapped among each other
+    rng        -- numpy Generator; all random numbers are drawn up front
+
+    A swap of cells p and q only changes the contacts of p and q with their other
+    neighbours, so its delta costs O(neighbours) instead of a full recompute. The
+    temperature falls geometrically from the mean uphill delta of the starting
+    layout to t_end; the result is never worse than the start.
+    """
+    classes = [members for members in classes if len(set(codes[i] for i in members)) > 1]
+    energy, counts = block_energy(codes, neighbours, same_weight)
+    start_energy, start_codes = energy, list(codes)
+    if not classes or iterations <= 0:
+        return start_energy, energy
+    n_codes = max(codes) + 1
+    sizes = np.array([len(members) for members in classes])
+    cls = rng.choice(len(classes), size=iterations, p=sizes / sizes.sum()).tolist()
+    u_p, u_q, u_accept = rng.random((3, iterations)).tolist()
+
+    def swap_delta(p, q):
+        # Swap codes at p and q and update the contact counts; returns the objective change.
+        # A count going c -> c - 1 changes c^2 by 1 - 2c, c -> c + 1 by 2c + 1.
+        x, y = codes[p], codes[q]
+        delta = 0.0
+        for cell, old, new, other in ((p, x, y, q), (q, y, x, p)):
+            for n in neighbours[cell]:
+                if n == other:
+                    continue
+                z = codes[n]
+                key = old * n_codes + z if old <= z else z * n_codes + old
+                c = counts[key]
+                counts[key] = c - 1
+                delta += -same_weight if old == z else 1 - 2 * c
+                key = new * n_codes + z if new <= z else z * n_codes + new
+                c = counts.get(key, 0)
+                counts[key] = c + 1
+                delta += same_weight if new == z else 2 * c + 1
+        codes[p], codes[q] = y, x
+        return delta
+
+    def pick(k):
+        members = classes[cls[k]]
+        p = members[int(u_p[k] * len(members))]
+        q = members[int(u_q[k] * len(members))]
+        return p, q
+
+    # Starting temperature from the uphill moves of a few trial swaps
+    uphill = []
+    for k in range(min(200, iterations)):
+        p, q = pick(k)
+        if codes[p] != codes[q]:
+            delta = swap_delta(p, q)
+            swap_delta(p, q)
+            if delta > 0:
+                uphill.append(delta)
+    t = float(np.mean(uphill)) if uphill else 1.0
+    cooling = (t_end / t) ** (1 / iterations) if t > t_end else 1.0
+
+    for k in range(iterations):
+        p, q = pick(k)
+        if codes[p] != codes[q]:
+            delta = swap_delta(p, q)
+            if delta <= 0 or u_accept[k] < math.exp(-delta / t):
+                energy += delta
+            else:
+                swap_delta(p, q)
+        t *= cooling
+
+    if energy > start_energy:
+        codes[:] = start_codes
+        energy = start_energy
+    return start_energy, energy
+
+
+def block_neighbours(row, col):
+    # Neighbour lists (NEIGHBOURS offsets) for the cells of one block
+    index = {(r, c): i for i, (r, c) in enumerate(zip(row, col))}
+    return [[index[(r + dr, c + dc)] for dr, dc in NEIGHBOURS if (r + dr, c + dc) in index]
+            for r, c in zip(row, col)]
+
+
+def _optimize_block(task):
+    # Worker: anneal one block; returns (block id, optimized codes, energy before, after)
+    block_id, row, col, codes, is_a, seed, iterations_per_cell, same_weight = task
+    neighbours = block_neighbours(row.tolist(), col.tolist())
+    classes = [np.flatnonzero(is_a).tolist(), np.flatnonzero(~is_a).tolist()]
+    codes = codes.tolist()
+    rng = block_rng(seed, block_id, stream=OPTIMIZER_STREAM)
+    before, after = anneal_block(codes, neighbours, classes, rng, iterations_per_cell * len(codes), same_weight)
+    return block_id, codes, before, after
+
+
+# === All Blocks ===
+def optimize_placement(row, col, block, labels, is_a, seed=None, iterations_per_cell=25, same_weight=10.0,
+                       workers=1):
+    """Spatially balanced copy of assign_ab() labels, every block annealed independently.
+
+    row, col and block are per-cell arrays (as from layout_engine.cell_geometry),
+    labels and is_a as returned by assign_ab. Cells labelled "" are left alone.
+    Each block uses its own block_rng stream, so results depend only on the seed
+    and the block, for any worker count.
+
+    Returns (labels, report): the new object array of labels and
+    {block id: (energy before, energy after)}.
+    """
+    row, col, block = np.asarray(row), np.asarray(col), np.asarray(block)
+    labels, is_a = np.asarray(labels, dtype=object), np.asarray(is_a, dtype=bool)
+    root = np.random.SeedSequence(seed)
+    entries, codes = np.unique(labels.astype(str), return_inverse=True)
+
+    order = np.argsort(block, kind="stable")
+    block_ids, starts = np.unique(block[order], return_index=True)
+    block_cells, tasks = [], []
+    for block_id, cells in zip(block_ids, np.split(order, starts[1:])):
+        cells = cells[labels[cells] != ""]
+        if len(cells) > 1:
+            block_cells.append(cells)
+            tasks.append((int(block_id), row[cells], col[cells], codes[cells], is_a[cells], root,
+                          iterations_per_cell, same_weight))
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(tasks) < 2:
+        results = list(map(_optimize_block, tasks))
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+            results = list(pool.map(_optimize_block, tasks, chunksize=max(1, len(tasks) // (4 * workers))))
+
+    out = labels.copy()
+    report = {}
+    for cells, (block_id, new_codes, before, after) in zip(block_cells, results):
+        out[cells] = entries[new_codes].astype(object)
+        report[block_id] = (before, after)
+    return out, report
@@ -0,0 +1,156 @@
+# Corner-anchored plot interpolation
+# Fits an affine or projective (homography) transform from four or more surveyed corners
+# and maps every plot at once: local field (X, Y) to latitude/longitude, or Row/Range
+# indices to positions, as one matrix multiply in homogeneous coordinates. From the four
+# corner plots of data/interpolated_plot_positions.geojson it regenerates that grid (Lat
+# exactly; the file's row longitudes are individually surveyed and agree to ~0.15 m).
+# Usage: python plot_interpolation.py [--rows 21] [--ranges 24] [--corners LAT,LON x4] [--kind affine] [--out grid.geojson]
+
+import argparse
+import numpy as np
+import pandas as pd
+from geojson_stream import write_points
+
+KINDS = ("affine", "homography")
+CRS84 = "urn:ogc:def:crs:OGC:1.3:CRS84"
+
+# Corner plots of data/interpolated_plot_positions.geojson (21 rows x 24 ranges), as (Lat, Lon):
+# Row 1/Range 1, last Row/Range 1, last Row/last Range, Row 1/last Range
+DATA_ROWS, DATA_RANGES = 21, 24
+DATA_CORNERS = [(48.6208766, 82.09675455), (48.6208766, 82.09850275),
+                (48.6231416, 82.09850275), (48.6231416, 82.09675455)]
+
+
+# === Fitting ===
+def _homogeneous(points):
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    return np.column_stack([points, np.ones(len(points))])
+
+
+def _normalizer(points):
+    # Similarity moving the points to their centroid at mean distance sqrt(2) (Hartley normalisation)
+    points = np.asarray(points, dtype=np.float64)
+    centroid = points.mean(axis=0)
+    spread = np.sqrt(((points - centroid) ** 2).sum(axis=1)).mean()
+    scale = np.sqrt(2) / spread if spread > 0 else 1.0
+    return np.array([[scale, 0, -scale * centroid[0]], [0, scale, -scale * centroid[1]], [0, 0, 1]])
+
+
+def fit_affine(src, dst):
+    # 3 x 3 affine matrix taking src (N >= 3) to dst points, least squares beyond three
+    src, dst = np.asarray(src, dtype=np.float64), np.asarray(dst, dtype=np.float64)
+    if len(src) < 3:
+        raise ValueError("An affine fit needs at least 3 corner points")
+    ts, td = _normalizer(src), _normalizer(dst)
+    a, *_ = np.linalg.lstsq(_homogeneous(src) @ ts.T, (_homogeneous(dst) @ td.T)[:, :2], rcond=None)
+    matrix = np.vstack([a.T, [0, 0, 1]])
+    return np.linalg.inv(td) @ matrix @ ts
+
+
+def fit_homography(src, dst):
+    # 3 x 3 projective matrix taking src (N >= 4) to dst points (normalised DLT, least squares beyond four)
+    src, dst = np.asarray(src, dtype=np.float64), np.asarray(dst, dtype=np.float64)
+    if len(src) < 4:
+        raise ValueError("A homography fit needs at least 4 corner points")
+    ts, td = _normalizer(src), _normalizer(dst)
+    s, d = _homogeneous(src) @ ts.T, _homogeneous(dst) @ td.T
+    rows = np.zeros((2 * len(s), 9))
+    rows[0::2, 0:3], rows[0::2, 6:9] = s, -d[:, [0]] * s
+    rows[1::2, 3:6], rows[1::2, 6:9] = s, -d[:, [1]] * s
+    matrix = np.linalg.svd(rows)[2][-1].reshape(3, 3)
+    matrix = np.linalg.inv(td) @ matrix @ ts
+    return matrix / matrix[2, 2]
+
+
+def fit_transform(src, dst, kind="affine"):
+    if kind not in KINDS:
+        raise ValueError(f"Unknown transform {kind!r}, expected one of {KINDS}")
+    return fit_affine(src, dst) if kind == "affine" else fit_homography(src, dst)
+
+
+def apply_transform(matrix, x, y):
+    # Map coordinate arrays through a 3 x 3 transform: one (N, 3) x (3, 3) product and the perspective divide
+    mapped = _homogeneous(np.column_stack([np.ravel(x), np.ravel(y)])) @ np.asarray(matrix).T
+    return mapped[:, 0] / mapped[:, 2], mapped[:, 1] / mapped[:, 2]
+
+
+def residuals(matrix, src, dst):
+    # Distance between each mapped corner and its surveyed position (in dst units)
+    u, v = apply_transform(matrix, *np.asarray(src, dtype=np.float64).T)
+    return np.hypot(u - np.asarray(dst)[:, 0], v - np.asarray(dst)[:, 1])
+
+
+# === Field Layouts ===
+def field_corners(df):
+    # Lower left, lower right, upper right, upper left corner of a layout's plot extents (local feet)
+    x0, x1 = df['X_start'].min(), df['X_stop'].max()
+    y0, y1 = df['Y_start'].min(), df['Y_stop'].max()
+    return [(x0, y0), (x1, y0), (x1, y1), (x0, y1)]
+
+
+def reanchor(df, corners, kind="affine", x="X", y="Y", columns=("Lat", "Lon")):
+    """Layout with columns (Lat, Lon) mapped from its local (x, y) through surveyed corners.
+
+    corners are four (lat, lon) pairs in field_corners order: lower left, lower
+    right, upper right, upper left. An affine fit of four corners is least squares.
+    """
+    matrix = fit_transform(field_corners(df), corners, kind)
+    lat, lon = apply_transform(matrix, df[x].to_numpy(), df[y].to_numpy())
+    return df.assign(**{columns[0]: lat, columns[1]: lon})
+
+
+# === Row/Range Grids ===
+def grid_corners(n_rows, n_ranges):
+    # Index-space corners in DATA_CORNERS order: Row 1/Range 1, last Row/Range 1, last Row/last Range, Row 1/last Range
+    return [(1, 1), (n_rows, 1), (n_rows, n_ranges), (1, n_ranges)]
+
+
+def plot_grid(n_rows, n_ranges, corners, kind="affine"):
+    # PlotID/Row/Range/Lat/Lon for every Row/Range position, as in interpolated_plot_positions.geojson
+    matrix = fit_transform(grid_corners(n_rows, n_ranges), corners, kind)
+    row, rng = np.divmod(np.arange(n_rows * n_ranges), n_ranges)
+    row, rng = row + 1, rng + 1
+    lat, lon = apply_transform(matrix, row, rng)
+    plot_ids = [f"Row{r:02d}_Range{g:02d}" for r, g in zip(row.tolist(), rng.tolist())]
+    return pd.DataFrame({"PlotID": plot_ids, "Row": row, "Range": rng, "Lat": lat, "Lon": lon})
+
+
+def locate_grid(lat, lon, n_rows, n_ranges, corners, kind="affine"):
+    """(Row, Range) of the plot centre nearest each point, -1 beyond half a step outside the grid.
+
+    The corner fit is inverted (one matrix multiply) and the fractional Row/Range
+    rounded, so no search structure is built; on a regular rectangular grid this is the
+    nearest centre that plot_join's KD-tree finds.
+    """
+    matrix = fit_transform(grid_corners(n_rows, n_ranges), corners, kind)
+    row, rng = apply_transform(np.linalg.inv(matrix), lat, lon)
+    row, rng = np.floor(row + 0.5).astype(np.int64), np.floor(rng + 0.5).astype(np.int64)
+    inside = (row >= 1) & (row <= n_rows) & (rng >= 1) & (rng <= n_ranges)
+    return np.where(inside, row, -1), np.where(inside, rng, -1)
+
+
+def write_grid_geojson(grid, path):
+    # Point per plot at (Lon, Lat), every column as a property
+    return write_points(path, grid["Lon"], grid["Lat"], {name: grid[name].to_numpy() for name in grid.columns},
+                        crs=CRS84)
+
+
+def _corner(text):
+    lat, lon = (float(v) for v in text.split(","))
+    return lat, lon
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Interpolate Row/Range plot positions from surveyed corners.")
+    parser.add_argument("--rows", type=int, default=DATA_ROWS)
+    parser.add_argument("--ranges", type=int, default=DATA_RANGES)
+    parser.add_argument("--corners", type=_corner, nargs=4, default=DATA_CORNERS, metavar="LAT,LON",
+                        help="Row 1/Range 1, last Row/Range 1, last Row/last Range, Row 1/last Range "
+                             "(default: the corners of data/interpolated_plot_positions.geojson)")
+    parser.add_argument("--kind", choices=KINDS, default="affine")
+    parser.add_argument("--out", default="interpolated_plot_positions.geojson")
+    args = parser.parse_args()
+
+    grid = plot_grid(args.rows, args.ranges, args.corners, args.kind)
+    write_grid_geojson(grid, args.out)
+    print(f"✅ {len(grid)} plot positions ({args.kind}) saved: {args.out}")
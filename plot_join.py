@@ -0,0 +1,130 @@
+# Nearest-plot join for soil samples
+# Loads the plot points once into a KD-tree and matches any number of samples
+# in one vectorized query (reproduces NearestPlotID / Distance_m in data/).
+# Usage: python plot_join.py [samples.csv] [plots.geojson] [out.csv]
+
+import hashlib
+import os
+import pickle
+import sys
+import numpy as np
+import pandas as pd
+from scipy.spatial import cKDTree
+from geojson_stream import read_frame
+
+EARTH_RADIUS_M = 6371008.8
+CACHE_DIR = ".plot_index_cache"
+METRICS = ("haversine", "projected")
+
+
+# === Plot Loading ===
+def load_plot_points(path):
+    # PlotID / Lat / Lon columns from a point FeatureCollection such as interpolated_plot_positions.geojson
+    plots = read_frame(path, properties=["PlotID"])
+    return pd.DataFrame({"PlotID": plots["PlotID"], "Lat": plots["Y"], "Lon": plots["X"]})
+
+
+# === Coordinate Transforms ===
+def _unit_vectors(lat, lon):
+    # Points on the unit sphere: straight-line (chord) distance orders exactly like haversine distance
+    lat, lon = np.radians(lat), np.radians(lon)
+    cos_lat = np.cos(lat)
+    return np.column_stack([cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)])
+
+
+def _projected(lat, lon, lat0):
+    # Equirectangular metres around the reference latitude lat0
+    return np.column_stack([np.radians(lon) * np.cos(np.radians(lat0)), np.radians(lat)]) * EARTH_RADIUS_M
+
+
+class PlotIndex:
+    """KD-tree over plot points, queried with arrays of sample coordinates.
+
+    metric="haversine" indexes unit-sphere vectors and converts chord lengths to
+    great-circle metres; metric="projected" indexes equirectangular metres around
+    the plots' mean latitude (faster, fine at field scale).
+    """
+
+    def __init__(self, plot_ids, lat, lon, metric="haversine", cache_dir=CACHE_DIR):
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric {metric!r}, expected one of {METRICS}")
+        self.plot_ids = np.asarray(plot_ids)
+        self.lat = np.asarray(lat, dtype=float)
+        self.lon = np.asarray(lon, dtype=float)
+        self.metric = metric
+        self.lat0 = float(self.lat.mean())
+        self.tree = self._load_or_build(cache_dir)
+
+    @classmethod
+    def from_geojson(cls, path, **kwargs):
+        plots = load_plot_points(path)
+        return cls(plots["PlotID"], plots["Lat"], plots["Lon"], **kwargs)
+
+    def _points(self, lat, lon):
+        if self.metric == "haversine":
+            return _unit_vectors(lat, lon)
+        return _projected(lat, lon, self.lat0)
+
+    def _load_or_build(self, cache_dir):
+        if cache_dir is None:
+            return cKDTree(self._points(self.lat, self.lon))
+
+        # Keyed by the plot coordinates and metric, so a changed layout never hits a stale tree
+        key = hashlib.sha1()
+        key.update(self.metric.encode())
+        key.update(np.ascontiguousarray(self.lat).tobytes())
+        key.update(np.ascontiguousarray(self.lon).tobytes())
+        path = os.path.join(cache_dir, f"{key.hexdigest()}.pkl")
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                return pickle.load(f)
+
+        tree = cKDTree(self._points(self.lat, self.lon))
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(tree, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        return tree
+
+    def query(self, lat, lon, k=1, workers=-1):
+        """Return (distances_m, plot indices) for the k nearest plots of every sample.
+
+        Shapes are (n,) for k=1 and (n, k) otherwise.
+        """
+        dist, idx = self.tree.query(self._points(lat, lon), k=k, workers=workers)
+        if self.metric == "haversine":
+            dist = 2 * EARTH_RADIUS_M * np.arcsin(np.minimum(dist / 2, 1.0))
+        return dist, idx
+
+    def nearest_plots(self, samples, k=1, lat_col="Lat", lon_col="Lon"):
+        # Sample table with NearestPlotID / NearestPlotLat / NearestPlotLon / Distance_m appended
+        # (suffixed _1.._k when k > 1)
+        dist, idx = self.query(samples[lat_col].to_numpy(), samples[lon_col].to_numpy(), k=k)
+        out = samples.copy()
+        if k == 1:
+            dist, idx = dist[:, None], idx[:, None]
+        for n in range(k):
+            suffix = "" if k == 1 else f"_{n + 1}"
+            out[f"NearestPlotID{suffix}"] = self.plot_ids[idx[:, n]]
+            out[f"NearestPlotLat{suffix}"] = self.lat[idx[:, n]]
+            out[f"NearestPlotLon{suffix}"] = self.lon[idx[:, n]]
+            out[f"Distance_m{suffix}"] = dist[:, n]
+        return out
+
+
+if __name__ == "__main__":
+    samples_path = sys.argv[1] if len(sys.argv) > 1 else "data/soil_samples_with_decimal_coords_and_plot_ids.csv"
+    plots_path = sys.argv[2] if len(sys.argv) > 2 else "data/interpolated_plot_positions.geojson"
+
+    samples = pd.read_csv(samples_path)
+    previous = samples.get("NearestPlotID")
+    samples = samples.drop(columns=[c for c in samples.columns if c.startswith(("NearestPlot", "Distance_m"))])
+
+    joined = PlotIndex.from_geojson(plots_path).nearest_plots(samples)
+    print(f"Matched {len(joined)} samples against {plots_path}")
+    if previous is not None:
+        print(f"Same NearestPlotID as {samples_path}: {(joined['NearestPlotID'] == previous).mean():.1%}")
+    if len(sys.argv) > 3:
+        joined.to_csv(sys.argv[3], index=False)
+        print(f"✅ Saved: {sys.argv[3]}")
@@ -0,0 +1,55 @@
+# Randomized entry assignment for checkerboard A/B blocks
+# Every block draws from its own counter-based Philox stream keyed by (seed, block id),
+# so a block's labels depend only on the seed and that block: blocks can be generated
+# alone, in any order or in parallel, and always come out the same.
+
+import numpy as np
+
+
+def block_rng(seed, block_id, stream=0):
+    # Independent Generator for one block; seed may be an int or a SeedSequence.
+    # stream > 0 gives further independent streams for the same block (e.g. the placement optimizer)
+    root = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+    key = (int(block_id),) if stream == 0 else (int(block_id), int(stream))
+    return np.random.Generator(np.random.Philox(np.random.SeedSequence(root.entropy, spawn_key=key)))
+
+
+def shuffled_cycle(n_entries, n_draws, rng):
+    """Indices of n_draws entries taken from back-to-back random permutations of n_entries.
+
+    Batched equivalent of drawing from an endless reshuffled pool (the old
+    recursive_sampler): every entry is used once before any is repeated.
+    """
+    passes = -(-n_draws // n_entries)
+    return rng.random((passes, n_entries)).argsort(axis=1).ravel()[:n_draws]
+
+
+def assign_ab(row, col, block, block_designs, seed=None):
+    """Labels for every cell of a checkerboard A/B layout, all blocks in one call.
+
+    row, col and block are per-cell arrays (as from layout_engine.cell_geometry);
+    block_designs maps a block id to a design dict with 'A' and 'B' entry lists.
+    Cells with (row + col) even are A cells. Each block's A and B cells, in cell
+    order, take entries from shuffled cycles of its pools drawn from block_rng(seed,
+    block). Cells of blocks without a design get "".
+
+    Returns (labels, is_a): an object array of labels and the boolean A-cell mask.
+    """
+    row, col, block = np.asarray(row), np.asarray(col), np.asarray(block)
+    root = np.random.SeedSequence(seed)
+    is_a = (row + col) % 2 == 0
+    labels = np.full(len(block), "", dtype=object)
+
+    # Cells grouped by block (stable, so cell order is kept within each block)
+    order = np.argsort(block, kind="stable")
+    block_ids, starts = np.unique(block[order], return_index=True)
+    for block_id, cells in zip(block_ids, np.split(order, starts[1:])):
+        design = block_designs.get(int(block_id))
+        if design is None:
+            continue
+        rng = block_rng(root, block_id)
+        for pool, cell_mask in ((design['A'], is_a[cells]), (design['B'], ~is_a[cells])):
+            targets = cells[cell_mask]
+            entries = np.asarray(pool, dtype=object)
+            labels[targets] = entries[shuffled_cycle(len(entries), len(targets), rng)]
+    return labels, is_a
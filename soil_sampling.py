@@ -0,0 +1,191 @@
+# Soil sample placement
+# Poisson-disk sampling (Bridson) on a background grid with cell size min_distance / sqrt(2),
+# so every point occupies at most one grid cell and a distance check only
+# needs the 5 x 5 cell window around a candidate.
+# Stratified sampling allocates samples to rectangular strata (blocks, subblock tracks) in
+# proportion to area and places them by jittered grid or Latin hypercube, all strata at once.
+
+import numpy as np
+
+# Cell offsets of the 5 x 5 neighbourhood window; the four corner cells are
+# always at least min_distance away and are left out
+_WINDOW_DY, _WINDOW_DX = [a.ravel() for a in np.mgrid[-2:3, -2:3]]
+_corner = (np.abs(_WINDOW_DY) == 2) & (np.abs(_WINDOW_DX) == 2)
+_WINDOW_DY, _WINDOW_DX = _WINDOW_DY[~_corner], _WINDOW_DX[~_corner]
+
+
+def poisson_disk_samples(width, height, min_distance, n_samples=None, seed=None, k=30, batch_size=256, chunk=5):
+    """Return an (N, 2) array of points in [0, width) x [0, height) at least min_distance apart.
+
+    Without n_samples the field is filled until every point has failed k tries
+    to place a neighbour, which leaves it saturated (no gaps much wider than
+    min_distance). With n_samples exactly that many points are returned, drawn
+    at random from the saturated set so they still cover the whole field;
+    ValueError is raised if the field cannot hold that many points at
+    min_distance, instead of silently returning fewer.
+
+    Up to batch_size active points are expanded at once: each tries k candidates
+    in the annulus [r, 2r] and keeps its first valid one, then candidates that
+    collide with each other within the batch are dropped greedily. An active
+    point retires once none of its k candidates fit, as in Bridson's algorithm.
+    """
+    rng = np.random.default_rng(seed)
+    r = float(min_distance)
+    r2 = r * r
+    cell = r / np.sqrt(2)
+    grid_w = int(np.ceil(width / cell))
+    grid_h = int(np.ceil(height / cell))
+    # Point coordinates stored per grid cell (inf where empty), padded by 2 cells
+    # on every side so the 5 x 5 window never leaves the array
+    grid_x = np.full((grid_h + 4, grid_w + 4), np.inf)
+    grid_y = np.full((grid_h + 4, grid_w + 4), np.inf)
+
+    # Disks of radius r/2 around the points cannot overlap, which bounds the count
+    capacity = int((width + r) * (height + r) / (np.pi * r2 / 4)) + 1
+    points = np.empty((capacity, 2))
+    points[0] = rng.uniform((0, 0), (width, height))
+    grid_x[int(points[0, 1] / cell) + 2, int(points[0, 0] / cell) + 2] = points[0, 0]
+    grid_y[int(points[0, 1] / cell) + 2, int(points[0, 0] / cell) + 2] = points[0, 1]
+    n_points = 1
+    active = np.array([0], dtype=np.int64)
+
+    while len(active):
+        pick = rng.choice(len(active), size=min(batch_size, len(active)), replace=False)
+        centres = points[active[pick]]
+
+        # Up to k candidates per active point, uniform over the annulus area. The first
+        # few are tried for every point; only points without a valid one try the rest.
+        found = np.zeros(len(pick), dtype=bool)
+        chosen = np.empty((len(pick), 2))
+        for n_try in (min(chunk, k), k - min(chunk, k)):
+            todo = np.flatnonzero(~found)
+            if not len(todo) or not n_try:
+                break
+            radius = r * np.sqrt(rng.uniform(1, 4, (len(todo), n_try)))
+            angle = rng.uniform(0, 2 * np.pi, (len(todo), n_try))
+            cand = np.stack([centres[todo, 0, None] + radius * np.cos(angle),
+                             centres[todo, 1, None] + radius * np.sin(angle)], axis=-1)
+            valid = _fits(cand, grid_x, grid_y, width, height, cell, r2)
+            hit = valid.any(axis=1)
+            chosen[todo[hit]] = cand[hit, valid[hit].argmax(axis=1)]
+            found[todo[hit]] = True
+        chosen = chosen[found]
+
+        # Resolve collisions between candidates chosen in the same batch
+        if len(chosen) > 1:
+            close = np.triu(((chosen[:, None, :] - chosen[None, :, :]) ** 2).sum(axis=-1) < r2, 1)
+            keep = np.ones(len(chosen), dtype=bool)
+            for i in np.flatnonzero(close.any(axis=1)):
+                if keep[i]:
+                    keep &= ~close[i]
+            chosen = chosen[keep]
+
+        new_ids = np.arange(n_points, n_points + len(chosen))
+        points[new_ids] = chosen
+        gy = (chosen[:, 1] // cell).astype(np.int64) + 2
+        gx = (chosen[:, 0] // cell).astype(np.int64) + 2
+        grid_x[gy, gx] = chosen[:, 0]
+        grid_y[gy, gx] = chosen[:, 1]
+        n_points += len(chosen)
+
+        # Retire active points with no room left around them
+        retired = np.zeros(len(active), dtype=bool)
+        retired[pick[~found]] = True
+        active = np.concatenate([active[~retired], new_ids])
+
+    points = points[:n_points]
+    if n_samples is None:
+        return points
+    if n_samples > n_points:
+        raise ValueError(f"A {width} x {height} field holds only about {n_points} samples "
+                         f"{min_distance} apart; reduce min_distance or n_samples.")
+    return points[np.sort(rng.choice(n_points, size=n_samples, replace=False))]
+
+
+def _fits(cand, grid_x, grid_y, width, height, cell, r2):
+    # True where a candidate lies in the field and is at least min_distance from every placed point
+    cx, cy = cand[..., 0].ravel(), cand[..., 1].ravel()
+    valid = (cx >= 0) & (cx < width) & (cy >= 0) & (cy < height)
+    idx = np.flatnonzero(valid)
+    cx, cy = cx[idx], cy[idx]
+
+    # Flat grid index of each candidate's cell and of its window cells
+    stride = grid_x.shape[1]
+    cells = (cy // cell).astype(np.int64) * stride + (cx // cell).astype(np.int64) + 2 * stride + 2
+    window = cells[:, None] + (_WINDOW_DY * stride + _WINDOW_DX)
+    d2 = (grid_x.ravel()[window] - cx[:, None]) ** 2 + (grid_y.ravel()[window] - cy[:, None]) ** 2
+    valid[idx] = ~(d2 < r2).any(axis=1)
+    return valid.reshape(cand.shape[:-1])
+
+
+# === Stratified Sampling ===
+STRATIFIED_METHODS = ("jitter", "lhs")
+
+
+def allocate(areas, n_samples, min_per_stratum=1):
+    """Samples per stratum: min_per_stratum each, the rest in proportion to area (largest remainder)."""
+    areas = np.asarray(areas, dtype=np.float64)
+    if not (np.isfinite(areas).all() and (areas >= 0).all() and areas.sum() > 0):
+        raise ValueError("Stratum areas must be finite and non-negative with a positive total; "
+                         "check the strata extents (x_stop > x_start, y_stop > y_start).")
+    spare = n_samples - min_per_stratum * len(areas)
+    if spare < 0:
+        raise ValueError(f"{n_samples} samples cannot give {len(areas)} strata {min_per_stratum} each; "
+                         f"raise n_samples or lower min_per_stratum.")
+    quota = spare * areas / areas.sum()
+    counts = np.floor(quota).astype(np.int64)
+    # Leftover samples go to the strata with the largest fractional parts
+    counts[np.argsort(counts - quota, kind="stable")[:spare - counts.sum()]] += 1
+    return counts + min_per_stratum
+
+
+def _ranks(counts, rng):
+    # Random permutation of 0..count-1 within each stratum, for consecutive runs of points
+    stratum = np.repeat(np.arange(len(counts)), counts)
+    order = np.lexsort((rng.random(len(stratum)), stratum))
+    ranks = np.empty(len(stratum), dtype=np.int64)
+    ranks[order] = np.arange(len(stratum)) - np.repeat(np.cumsum(counts) - counts, counts)
+    return stratum, ranks
+
+
+def stratified_samples(x_start, y_start, x_stop, y_stop, n_samples, method="jitter", seed=None,
+                       min_per_stratum=1):
+    """Return (points, stratum): an (N, 2) array and the stratum index of every point.
+
+    Strata are rectangles given as extent arrays; each gets min_per_stratum
+    samples and the rest are shared in proportion to area (allocate). "jitter"
+    splits a stratum with k samples into a near-square grid of at least k cells
+    and puts one point at a uniform spot in k of them picked at random; "lhs"
+    gives every point its own row of k bands in x and in y (Latin hypercube).
+    Every stratum is handled in the same array operations, so thousands of
+    strata cost about as much as one.
+    """
+    if method not in STRATIFIED_METHODS:
+        raise ValueError(f"Unknown method {method!r}, expected one of {STRATIFIED_METHODS}")
+    rng = np.random.default_rng(seed)
+    x0, y0, x1, y1 = (np.asarray(v, dtype=np.float64) for v in (x_start, y_start, x_stop, y_stop))
+    width, height = x1 - x0, y1 - y0
+    counts = allocate(width * height, n_samples, min_per_stratum)
+
+    if method == "lhs":
+        stratum, rank_x = _ranks(counts, rng)
+        _, rank_y = _ranks(counts, rng)
+        k = counts[stratum]
+        u = (rank_x + rng.random(len(stratum))) / k
+        v = (rank_y + rng.random(len(stratum))) / k
+    else:
+        # Grid of nx x ny >= k cells shaped like the stratum; k of them drawn without replacement
+        nx = np.clip(np.rint(np.sqrt(counts * width / np.maximum(height, 1e-12))), 1, np.maximum(counts, 1))
+        nx = nx.astype(np.int64)
+        ny = -(-counts // nx)
+        n_cells = nx * ny
+        cell_stratum, cell_rank = _ranks(n_cells, rng)
+        # Keep the cells whose random rank is below k; a cell's number is its position in its stratum
+        keep = cell_rank < counts[cell_stratum]
+        stratum = cell_stratum[keep]
+        cell = np.flatnonzero(keep) - np.repeat(np.cumsum(n_cells) - n_cells, counts)
+        row, col = np.divmod(cell, nx[stratum])
+        u = (col + rng.random(len(stratum))) / nx[stratum]
+        v = (row + rng.random(len(stratum))) / ny[stratum]
+    points = np.column_stack([x0[stratum] + u * width[stratum], y0[stratum] + v * height[stratum]])
+    return points, stratum
@@ -0,0 +1,382 @@
+# Tiled raster pyramid for very large field maps
+# Rasterizes plot rectangles straight into 256 x 256 NumPy tiles at every zoom level and
+# writes them as a z/x/y PNG pyramid with a small static viewer (index.html). Only one
+# tile per worker is ever in memory: plots are found through a bucketed spatial index
+# that the workers memory-map, and labels are drawn only once plots are large enough
+# on screen to read them.
+# Usage: python tile_pyramid.py combined_field_designs_1_to_4.layout tiles/ [--max-zoom N] [--workers N]
+
+import argparse
+import json
+import os
+import shutil
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from PIL import Image, ImageDraw, ImageFont
+from layout_engine import centre_spacing
+from layout_store import EXTENSION, LayoutFile
+
+TILE_SIZE = 256
+BACKGROUND = (255, 255, 255)
+EDGE_COLOR = (128, 128, 128)
+EMPTY_COLOR = (211, 211, 211)  # plots without a label
+EDGE_MIN_PX = 6  # plot outlines from this plot width on
+LABEL_MIN_FONT = 7  # labels from this font size (px) on
+LABEL_MAX_FONT = 14
+SLICE_MIN_AREA = 256  # plots from this many px are filled by slicing, smaller ones per pixel
+TARGET_PLOT_PX = 64  # default max zoom: the narrowest plots this wide
+INDEX_DIR = "_index"
+BUCKET_PERCENTILE = 99  # index buckets are sized from this percentile of plot size
+
+
+# === Plots ===
+def load_plots(source, cell_size=None):
+    """Plot rectangles and label codes of a .layout or CSV file.
+
+    Returns (columns, categories): x0, y0, x1, y1 and label codes (-1 for no
+    label). Without X_start/X_stop/Y_start/Y_stop columns the plots are
+    centred on X/Y with cell_size (width, height), by default the typical
+    (median) spacing between distinct X and Y centres.
+    """
+    if str(source).endswith(EXTENSION):
+        layout = LayoutFile(source)
+        names = layout.columns
+        get = layout.column
+        if layout.categories("Label") is not None:
+            codes, categories = layout.column("Label"), layout.categories("Label")
+        else:
+            codes, categories = pd.factorize(layout.column("Label"))
+    else:
+        df = pd.read_csv(source)
+        names = list(df.columns)
+        get = lambda name: df[name].to_numpy()
+        codes, categories = pd.factorize(df["Label"])
+    categories = [str(c) for c in categories]
+    if "" in categories:
+        empty = categories.index("")
+        codes = np.where(codes == empty, -1, codes)
+
+    if {"X_start", "X_stop", "Y_start", "Y_stop"} <= set(names):
+        x0, x1, y0, y1 = (np.asarray(get(n), dtype=np.float64) for n in ("X_start", "X_stop", "Y_start", "Y_stop"))
+    else:
+        x, y = np.asarray(get("X"), dtype=np.float64), np.asarray(get("Y"), dtype=np.float64)
+        if cell_size is None:
+            cell_size = centre_spacing(x, y)
+        x0, x1 = x - cell_size[0] / 2, x + cell_size[0] / 2
+        y0, y1 = y - cell_size[1] / 2, y + cell_size[1] / 2
+    return {"x0": x0, "y0": y0, "x1": x1, "y1": y1, "label": np.asarray(codes, dtype=np.int32)}, categories
+
+
+def label_colors(categories):
+    # Stable pastel colour per label (same label, same colour in every tile and run)
+    colors = np.empty((len(categories) + 1, 3), dtype=np.uint8)
+    for i, name in enumerate(categories):
+        h = zlib.crc32(name.encode())
+        colors[i] = [150 + (h & 0x3F) + (h >> 6 & 0x3F) % 42, 150 + (h >> 12 & 0x3F) + (h >> 18 & 0x3F) % 42,
+                     150 + (h >> 24 & 0x3F) + (h >> 3 & 0x3F) % 42]
+    colors[-1] = EMPTY_COLOR  # index -1
+    return colors
+
+
+# === Spatial Index ===
+def build_index(plots, categories, index_dir):
+    """Sort plots into square buckets and save the arrays for the workers to memory-map.
+
+    Buckets are twice the BUCKET_PERCENTILE-th percentile plot size (headroom for
+    rounding), so a plot that fits can only reach into the next bucket to its
+    right and above; plots are ordered by bucket key (row-major). The few larger
+    plots go after all the buckets and are checked by every query.
+    """
+    os.makedirs(index_dir, exist_ok=True)
+    x_min, y_min = float(plots["x0"].min()), float(plots["y0"].min())
+    x_max, y_max = float(plots["x1"].max()), float(plots["y1"].max())
+    extent = np.maximum(plots["x1"] - plots["x0"], plots["y1"] - plots["y0"])
+    bucket = 2 * float(np.percentile(extent, BUCKET_PERCENTILE))
+    if not bucket > 0 or not np.isfinite(bucket):
+        raise ValueError(f"Spatial index bucket size is {bucket}: plots need a positive, finite width or height")
+    n_bx = int((x_max - x_min) // bucket) + 1
+    n_by = int((y_max - y_min) // bucket) + 1
+    keys = (((plots["y0"] - y_min) // bucket).astype(np.int64) * n_bx
+            + ((plots["x0"] - x_min) // bucket).astype(np.int64))
+    large = extent > bucket
+    keys[large] = n_bx * n_by
+    order = np.argsort(keys, kind="stable")
+    np.save(os.path.join(index_dir, "keys.npy"), keys[order])
+    for name, values in plots.items():
+        np.save(os.path.join(index_dir, f"{name}.npy"), values[order])
+    meta = {"x_min": x_min, "y_min": y_min, "x_max": x_max, "y_max": y_max, "bucket": bucket,
+            "n_bx": n_bx, "n_by": n_by, "n_large": int(large.sum()), "size": max(x_max - x_min, y_max - y_min),
+            "categories": categories,
+            "min_plot": float(min((plots["x1"] - plots["x0"]).min(), (plots["y1"] - plots["y0"]).min()))}
+    with open(os.path.join(index_dir, "meta.json"), "w") as f:
+        json.dump(meta, f)
+    return meta
+
+
+_index = {}
+
+
+def _open_index(index_dir):
+    # Per-process: memory-map the index once
+    if _index.get("dir") != index_dir:
+        with open(os.path.join(index_dir, "meta.json")) as f:
+            meta = json.load(f)
+        arrays = {name: np.load(os.path.join(index_dir, f"{name}.npy"), mmap_mode="r")
+                  for name in ("keys", "x0", "y0", "x1", "y1", "label")}
+        _index.clear()
+        _index.update(dir=index_dir, meta=meta, colors=label_colors(meta["categories"]), labels={}, **arrays)
+    return _index
+
+
+def tile_bounds(meta, z, x, y):
+    # World extent (x0, y0, x1, y1) of tile z/x/y; y counts down from the top
+    side = meta["size"] / 2 ** z
+    x0 = meta["x_min"] + x * side
+    y1 = meta["y_min"] + meta["size"] - y * side
+    return x0, y1 - side, x0 + side, y1
+
+
+def query(index, bounds):
+    # Indices of the plots overlapping a world rectangle
+    meta, keys = index["meta"], index["keys"]
+    bx0, by0, bx1, by1 = ((np.array(bounds) - [meta["x_min"], meta["y_min"]] * 2) // meta["bucket"]).astype(int)
+    bx0, by0 = max(bx0 - 1, 0), max(by0 - 1, 0)
+    bx1, by1 = min(bx1, meta["n_bx"] - 1), min(by1, meta["n_by"] - 1)
+    if bx0 > bx1 or by0 > by1:
+        return np.empty(0, dtype=np.int64)
+    rows = np.arange(by0, by1 + 1) * meta["n_bx"]
+    lo = np.searchsorted(keys, rows + bx0, "left")
+    hi = np.searchsorted(keys, rows + bx1, "right")
+    counts = hi - lo
+    idx = np.repeat(lo - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+    idx = np.concatenate([np.arange(len(keys) - meta["n_large"], len(keys)), idx])  # large plots drawn first
+    x0, y0, x1, y1 = bounds
+    hit = (index["x0"][idx] < x1) & (index["x1"][idx] > x0) & (index["y0"][idx] < y1) & (index["y1"][idx] > y0)
+    return idx[hit]
+
+
+# === Rasterizing ===
+def _label_mask(cache, text, size, rotate):
+    # Glyph coverage of one label as a float array (rotated 90 degrees for tall plots); cached per worker
+    key = (text, size, rotate)
+    mask = cache.get(key)
+    if mask is None:
+        font = ImageFont.load_default(size=size)
+        left, top, right, bottom = font.getbbox(text)
+        image = Image.new("L", (max(right - left, 1), max(bottom - top, 1)))
+        ImageDraw.Draw(image).text((-left, -top), text, fill=255, font=font)
+        if rotate:
+            image = image.rotate(90, expand=True)
+        mask = np.asarray(image, dtype=np.float32) / 255
+        cache[key] = mask
+    return mask
+
+
+def _outline(image, x0, y0, x1, y1):
+    # 1 px border of pixel rectangle [x0, x1) x [y0, y1), clipped to the tile
+    sx, sy = slice(max(x0, 0), min(x1, TILE_SIZE)), slice(max(y0, 0), min(y1, TILE_SIZE))
+    for row in (y0, y1 - 1):
+        if 0 <= row < TILE_SIZE:
+            image[row, sx] = EDGE_COLOR
+    for col in (x0, x1 - 1):
+        if 0 <= col < TILE_SIZE:
+            image[sy, col] = EDGE_COLOR
+
+
+def render_tile(index, z, x, y):
+    """RGB array of tile z/x/y, or None when no plot touches it."""
+    meta = index["meta"]
+    bounds = tile_bounds(meta, z, x, y)
+    idx = query(index, bounds)
+    if len(idx) == 0:
+        return None
+    scale = TILE_SIZE / (bounds[2] - bounds[0])
+    left, top = bounds[0], bounds[3]
+
+    # Pixel rectangles (unclipped for outlines, clipped for filling); every plot covers >= 1 px
+    px0 = np.rint((index["x0"][idx] - left) * scale).astype(np.int64)
+    px1 = np.maximum(np.rint((index["x1"][idx] - left) * scale).astype(np.int64), px0 + 1)
+    py0 = np.rint((top - index["y1"][idx]) * scale).astype(np.int64)
+    py1 = np.maximum(np.rint((top - index["y0"][idx]) * scale).astype(np.int64), py0 + 1)
+    cx0, cx1 = np.clip(px0, 0, TILE_SIZE), np.clip(px1, 0, TILE_SIZE)
+    cy0, cy1 = np.clip(py0, 0, TILE_SIZE), np.clip(py1, 0, TILE_SIZE)
+    w, h = cx1 - cx0, cy1 - cy0
+    keep = (w > 0) & (h > 0)
+    idx, px0, px1, py0, py1, cx0, cy0, w, h = (a[keep] for a in (idx, px0, px1, py0, py1, cx0, cy0, w, h))
+
+    image = np.empty((TILE_SIZE, TILE_SIZE, 3), dtype=np.uint8)
+    image[:] = BACKGROUND
+    labels = np.asarray(index["label"][idx])
+    fill = index["colors"][labels]
+    outlined = px1 - px0 >= EDGE_MIN_PX
+
+    # Large plots (deep zooms, few per tile): slice assignment per plot
+    area = w * h
+    for i in np.flatnonzero(area >= SLICE_MIN_AREA):
+        image[cy0[i]:cy0[i] + h[i], cx0[i]:cx0[i] + w[i]] = fill[i]
+        if outlined[i]:
+            _outline(image, px0[i], py0[i], px1[i], py1[i])
+
+    # Small plots (overviews, up to one per pixel): every covered pixel of every plot at once
+    small = np.flatnonzero(area < SLICE_MIN_AREA)
+    area = area[small]
+    rect = np.repeat(small, area)
+    local = np.arange(area.sum()) - np.repeat(np.cumsum(area) - area, area)
+    px = cx0[rect] + local % w[rect]
+    py = cy0[rect] + local // w[rect]
+    image[py, px] = fill[rect]
+    edge = outlined[rect] & ((px == px0[rect]) | (px == px1[rect] - 1) | (py == py0[rect]) | (py == py1[rect] - 1))
+    image[py[edge], px[edge]] = EDGE_COLOR
+
+    # Labels, centred on the plot and along its long side, once they are legible
+    pw, ph = px1 - px0, py1 - py0
+    rotate = ph > pw
+    along, across = np.where(rotate, ph, pw), np.where(rotate, pw, ph)
+    categories = meta["categories"]
+    for i in np.flatnonzero((labels >= 0) & (np.minimum(along, across) * 0.6 >= LABEL_MIN_FONT)):
+        text = categories[labels[i]]
+        size = int(min(across[i] * 0.6, along[i] * 0.9 / (0.6 * len(text)), LABEL_MAX_FONT))
+        if size < LABEL_MIN_FONT:
+            continue
+        mask = _label_mask(index["labels"], text, size, bool(rotate[i]))
+        mh, mw = mask.shape
+        y0 = (py0[i] + py1[i] - mh) // 2
+        x0 = (px0[i] + px1[i] - mw) // 2
+        sy, sx = slice(max(y0, 0), min(y0 + mh, TILE_SIZE)), slice(max(x0, 0), min(x0 + mw, TILE_SIZE))
+        if sy.start >= sy.stop or sx.start >= sx.stop:
+            continue
+        alpha = mask[sy.start - y0:sy.stop - y0, sx.start - x0:sx.stop - x0, None]
+        image[sy, sx] = (image[sy, sx] * (1 - alpha)).astype(np.uint8)
+    return image
+
+
+def _render_tiles(task):
+    # Worker: render and save a batch of tiles of one zoom level; returns the number written
+    index_dir, out_dir, z, tiles = task
+    index = _open_index(index_dir)
+    written = 0
+    for x, y in tiles:
+        image = render_tile(index, z, x, y)
+        if image is None:
+            continue
+        path = os.path.join(out_dir, str(z), str(x))
+        os.makedirs(path, exist_ok=True)
+        Image.fromarray(image).save(os.path.join(path, f"{y}.png"), compress_level=1)
+        written += 1
+    return written
+
+
+# === Pyramid ===
+def default_max_zoom(meta):
+    return max(0, int(np.ceil(np.log2(TARGET_PLOT_PX * meta["size"] / (TILE_SIZE * meta["min_plot"])))))
+
+
+def build_pyramid(source, out_dir, max_zoom=None, workers=None, cell_size=None, batch=64):
+    """Write the z/x/y PNG pyramid and index.html for a layout file; returns (max_zoom, tiles written).
+
+    Tiles with no plots are skipped (the viewer leaves them blank).
+    """
+    plots, categories = load_plots(source, cell_size)
+    index_dir = os.path.join(out_dir, INDEX_DIR)
+    meta = build_index(plots, categories, index_dir)
+    del plots
+    if max_zoom is None:
+        max_zoom = default_max_zoom(meta)
+
+    tasks = []
+    for z in range(max_zoom + 1):
+        n = 2 ** z
+        side = meta["size"] / n
+        x_tiles = range(min(n, int(np.ceil((meta["x_max"] - meta["x_min"]) / side))))
+        y_tiles = range(n - min(n, int(np.ceil((meta["y_max"] - meta["y_min"]) / side))), n)
+        tiles = [(x, y) for x in x_tiles for y in y_tiles]
+        tasks += [(index_dir, out_dir, z, tiles[i:i + batch]) for i in range(0, len(tiles), batch)]
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        written = sum(map(_render_tiles, tasks))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            written = sum(pool.map(_render_tiles, tasks))
+    write_viewer(out_dir, max_zoom, meta)
+    shutil.rmtree(index_dir)
+    return max_zoom, written
+
+
+VIEWER = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Field map</title>
+<style>html,body{margin:0;height:100%;overflow:hidden;background:#eee;font:13px sans-serif}
+#map{position:absolute;inset:0;cursor:grab}#map img{position:absolute;image-rendering:pixelated}
+#info{position:absolute;left:8px;top:8px;background:#fffc;padding:4px 8px;border-radius:4px}</style></head>
+<body><div id="map"></div><div id="info"></div>
+<script>
+const MAX_ZOOM = __MAX_ZOOM__, TILE = __TILE__, SIZE = __SIZE__, X_MIN = __X_MIN__, Y_MIN = __Y_MIN__;
+const map = document.getElementById("map"), info = document.getElementById("info");
+// View: world units per screen pixel and the world point at the top-left corner
+let scale = SIZE / Math.min(innerWidth, innerHeight), left = X_MIN, top = Y_MIN + SIZE;
+const cache = {};
+function draw() {
+  const z = Math.max(0, Math.min(MAX_ZOOM, Math.round(Math.log2(SIZE / (TILE * scale)))));
+  const side = SIZE / 2 ** z, px = side / scale, wanted = {};
+  const x0 = Math.floor((left - X_MIN) / side), x1 = Math.floor((left + innerWidth * scale - X_MIN) / side);
+  const y0 = Math.floor((Y_MIN + SIZE - top) / side), y1 = Math.floor((Y_MIN + SIZE - top + innerHeight * scale) / side);
+  for (let x = Math.max(x0, 0); x <= Math.min(x1, 2 ** z - 1); x++)
+    for (let y = Math.max(y0, 0); y <= Math.min(y1, 2 ** z - 1); y++) {
+      const key = z + "/" + x + "/" + y;
+      let img = cache[key];
+      if (!img) { img = cache[key] = new Image(); img.key = key; img.onerror = () => { img.missing = true; img.remove(); }; img.src = key + ".png"; }
+      img.style.left = ((X_MIN + x * side - left) / scale) + "px";
+      img.style.top = ((top - (Y_MIN + SIZE - y * side)) / scale) + "px";
+      img.style.width = img.style.height = (px + 0.5) + "px";
+      if (!img.parentNode && !img.missing) map.appendChild(img);  // empty tiles were not written
+      wanted[key] = true;
+    }
+  for (const img of [...map.children]) if (!wanted[img.key]) img.remove();
+  info.textContent = "zoom " + z + " / " + MAX_ZOOM + " — drag to pan, wheel to zoom";
+}
+map.addEventListener("wheel", e => {
+  e.preventDefault();
+  const f = e.deltaY > 0 ? 1.25 : 0.8, wx = left + e.clientX * scale, wy = top - e.clientY * scale;
+  scale *= f; left = wx - e.clientX * scale; top = wy + e.clientY * scale; draw();
+}, {passive: false});
+let drag = null;
+map.addEventListener("mousedown", e => { drag = [e.clientX, e.clientY]; map.style.cursor = "grabbing"; });
+addEventListener("mouseup", () => { drag = null; map.style.cursor = "grab"; });
+addEventListener("mousemove", e => {
+  if (!drag) return;
+  left -= (e.clientX - drag[0]) * scale; top += (e.clientY - drag[1]) * scale; drag = [e.clientX, e.clientY]; draw();
+});
+addEventListener("resize", draw);
+draw();
+</script></body></html>
+"""
+
+
+def write_viewer(out_dir, max_zoom, meta):
+    # index.html that pans/zooms the pyramid from the local files, no server or libraries needed
+    html = (VIEWER.replace("__MAX_ZOOM__", str(max_zoom)).replace("__TILE__", str(TILE_SIZE))
+            .replace("__SIZE__", repr(meta["size"])).replace("__X_MIN__", repr(meta["x_min"]))
+            .replace("__Y_MIN__", repr(meta["y_min"])))
+    with open(os.path.join(out_dir, "index.html"), "w") as f:
+        f.write(html)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render a layout as a z/x/y PNG tile pyramid with a viewer.")
+    parser.add_argument("layout", help=".layout or CSV file with X/Y (or X_start/X_stop/Y_start/Y_stop) and Label")
+    parser.add_argument("out", help="output directory")
+    parser.add_argument("--max-zoom", type=int, default=None,
+                        help=f"deepest zoom level (default: narrowest plots ~{TARGET_PLOT_PX} px wide)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: one per CPU)")
+    parser.add_argument("--cell-size", type=float, nargs=2, default=None, metavar=("W", "H"),
+                        help="plot size when the file only has centres (default: median centre spacing)")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    max_zoom, written = build_pyramid(args.layout, args.out, args.max_zoom, args.workers, args.cell_size)
+    elapsed = time.perf_counter() - t0
+    print(f"✅ {written} tiles (zoom 0-{max_zoom}) written to {args.out}/ in {elapsed:.2f} s "
+          f"— open {os.path.join(args.out, 'index.html')}")